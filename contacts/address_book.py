@@ -1,28 +1,19 @@
-"""AddressBook abstract base class."""
+"""AddressBook abstract base class, and the changes it makes to contacts."""
 
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Iterator, Optional, Protocol
+from itertools import islice
+from typing import TYPE_CHECKING, Generator, Iterator, Optional, Protocol
 
 if TYPE_CHECKING:
     from contacts.contact import Contact
 
+BATCH_SIZE = 10
 
-class AddressBook(ABC):
-    """An address book that fetches and updates contacts."""
-
-    @abstractmethod
-    def count(self, keywords: list[str]) -> int:
-        """Return number of contacts matching given keywords."""
-
-    @abstractmethod
-    def find(self, keywords: list[str]) -> Iterator[Contact]:
-        """Return list of contact ids matching given keywords."""
 
-    @abstractmethod
-    def get(self, contact_id: str) -> Contact:
-        """Fetch a contact with its id."""
+class ContactEditor(ABC):
+    """Something that contacts are changed through, field by field."""
 
     @abstractmethod
     def _update_field(self, contact_id: str, field: str, value: str) -> None:
@@ -46,6 +37,11 @@ class AddressBook(ABC):
     def _delete_info(self, contact_id: str, field: str, info_id: str) -> None:
         """Delete a contact info."""
 
+    def _delete_infos(self, contact_id: str, field: str, info_ids: list[str]) -> None:
+        """Delete multiple contact infos of the same field at once."""
+        for info_id in info_ids:
+            self._delete_info(contact_id, field, info_id)
+
     def update_prefix(self, contact_id: str, value: str) -> None:
         """Add or update a contact prefix."""
         self._update_field(contact_id, "prefix", value)
@@ -174,6 +170,10 @@ class AddressBook(ABC):
         """Delete a contact phone."""
         self._delete_info(contact_id, "phones", info_id)
 
+    def delete_phones(self, contact_id: str, info_ids: list[str]) -> None:
+        """Delete multiple contact phones."""
+        self._delete_infos(contact_id, "phones", info_ids)
+
     def update_email(
         self,
         contact_id: str,
@@ -203,6 +203,10 @@ class AddressBook(ABC):
         """Delete a contact e-mail."""
         self._delete_info(contact_id, "emails", info_id)
 
+    def delete_emails(self, contact_id: str, info_ids: list[str]) -> None:
+        """Delete multiple contact e-mails."""
+        self._delete_infos(contact_id, "emails", info_ids)
+
     def update_home_page(self, contact_id: str, value: str) -> None:
         """Add or update a contact home_page."""
         self._update_field(contact_id, "home_page", value)
@@ -235,6 +239,10 @@ class AddressBook(ABC):
         """Delete a contact URL."""
         self._delete_info(contact_id, "urls", info_id)
 
+    def delete_urls(self, contact_id: str, info_ids: list[str]) -> None:
+        """Delete multiple contact URLs."""
+        self._delete_infos(contact_id, "urls", info_ids)
+
     def update_address(
         self,
         contact_id: str,
@@ -295,6 +303,10 @@ class AddressBook(ABC):
         """Delete a contact address."""
         self._delete_info(contact_id, "addresses", info_id)
 
+    def delete_addresses(self, contact_id: str, info_ids: list[str]) -> None:
+        """Delete multiple contact addresses."""
+        self._delete_infos(contact_id, "addresses", info_ids)
+
     def update_birth_date(self, contact_id: str, value: str) -> None:
         """Add or update a contact birth date."""
         self._update_field(contact_id, "birth_date", value)
@@ -327,6 +339,10 @@ class AddressBook(ABC):
         """Delete a contact custom date."""
         self._delete_info(contact_id, "custom_dates", info_id)
 
+    def delete_custom_dates(self, contact_id: str, info_ids: list[str]) -> None:
+        """Delete multiple contact custom dates."""
+        self._delete_infos(contact_id, "custom_dates", info_ids)
+
     def update_related_name(
         self,
         contact_id: str,
@@ -351,6 +367,10 @@ class AddressBook(ABC):
         """Delete a contact related name."""
         self._delete_info(contact_id, "related_names", info_id)
 
+    def delete_related_names(self, contact_id: str, info_ids: list[str]) -> None:
+        """Delete multiple contact related names."""
+        self._delete_infos(contact_id, "related_names", info_ids)
+
     def update_social_profile(
         self,
         contact_id: str,
@@ -393,6 +413,10 @@ class AddressBook(ABC):
         """Delete a contact social profile."""
         self._delete_info(contact_id, "social_profiles", info_id)
 
+    def delete_social_profiles(self, contact_id: str, info_ids: list[str]) -> None:
+        """Delete multiple contact social profiles."""
+        self._delete_infos(contact_id, "social_profiles", info_ids)
+
     def update_instant_message(
         self,
         contact_id: str,
@@ -422,6 +446,10 @@ class AddressBook(ABC):
         """Delete a contact instant message."""
         self._delete_info(contact_id, "instant_messages", info_id)
 
+    def delete_instant_messages(self, contact_id: str, info_ids: list[str]) -> None:
+        """Delete multiple contact instant messages."""
+        self._delete_infos(contact_id, "instant_messages", info_ids)
+
     def update_note(self, contact_id: str, value: str) -> None:
         """Add or update a contact note."""
         self._update_field(contact_id, "note", value)
@@ -438,7 +466,7 @@ class AddressBook(ABC):
 
         def __call__(  # noqa: D102
             self,
-            __address_book: AddressBook,
+            __editor: ContactEditor,
             contact_id: str,
             value: str,
         ) -> None: ...
@@ -448,7 +476,7 @@ class AddressBook(ABC):
 
         def __call__(  # noqa: D102
             self,
-            __address_book: AddressBook,
+            __editor: ContactEditor,
             contact_id: str,
         ) -> None: ...
 
@@ -457,7 +485,7 @@ class AddressBook(ABC):
 
         def __call__(  # noqa: D102
             self,
-            __address_book: AddressBook,
+            __editor: ContactEditor,
             contact_id: str,
             info_id: str,
             *,
@@ -469,7 +497,54 @@ class AddressBook(ABC):
 
         def __call__(  # noqa: D102
             self,
-            __address_book: AddressBook,
+            __editor: ContactEditor,
             contact_id: str,
             info_id: str,
         ) -> None: ...
+
+    class DeleteInfosFunction(Protocol):
+        """Type hint for batched delete info calls."""
+
+        def __call__(  # noqa: D102
+            self,
+            __editor: ContactEditor,
+            contact_id: str,
+            info_ids: list[str],
+        ) -> None: ...
+
+
+class AddressBook(ContactEditor):
+    """An address book that fetches and updates contacts."""
+
+    def identity(self) -> str:
+        """Return what tells apart the results of this address book from others."""
+        return type(self).__name__
+
+    @abstractmethod
+    def count(self, keywords: list[str]) -> int:
+        """Return number of contacts matching given keywords."""
+
+    @abstractmethod
+    def find(self, keywords: list[str]) -> Iterator[Contact]:
+        """Return list of contact ids matching given keywords."""
+
+    def find_batches(
+        self, keywords: list[str], *, offset: int = 0, limit: Optional[int] = None
+    ) -> Generator[list[Contact], None, None]:
+        """Return contacts matching given keywords in batches as they are fetched.
+
+        :param offset: number of matching contacts to skip
+        :param limit: maximum number of contacts to return
+        """
+        stop = None if limit is None else offset + limit
+        contacts = islice(self.find(keywords), offset, stop)
+        while batch := list(islice(contacts, BATCH_SIZE)):
+            yield batch
+
+    @abstractmethod
+    def get(self, contact_id: str) -> Contact:
+        """Fetch a contact with its id."""
+
+    def get_many(self, contact_ids: list[str]) -> list[Contact]:
+        """Fetch contacts with their ids."""
+        return [self.get(x) for x in contact_ids]
@@ -4,10 +4,12 @@ from __future__ import annotations
 
 import json
 import subprocess  # nosec B404
-from itertools import chain, zip_longest
+import threading
+from itertools import chain, islice, zip_longest
 from pathlib import Path
-from typing import Iterator
+from typing import AbstractSet, Generator, Iterable, Iterator, Optional
 
+from contacts import timing
 from contacts.address_book import AddressBook
 from contacts.contact import Contact
 
@@ -15,10 +17,36 @@ from contacts.contact import Contact
 class AppleScriptBasedAddressBook(AddressBook):
     """Address book implementation using AppleScript."""
 
-    def __init__(self, brief: bool, batch: int):
-        """Initialize with configuration."""
+    def __init__(
+        self, brief: bool, batch: int, fields: Optional[AbstractSet[str]] = None
+    ):
+        """Initialize with configuration.
+
+        :param fields: fetch only these contact fields besides id and name
+        """
         self.brief = brief
         self.batch = batch
+        self.fields = fields
+        # bytes of script output read by each thread, for instrumentation
+        self._reads = threading.local()
+
+    @property
+    def bytes_read(self) -> int:
+        """Return the bytes of script output read so far by the calling thread.
+
+        Counts are kept per thread, so that calls made at the same time from
+        other threads are neither lost nor counted in.
+        """
+        return int(getattr(self._reads, "count", 0))
+
+    def _count_read(self, text: str) -> None:
+        """Count script output read by the calling thread."""
+        self._reads.count = self.bytes_read + len(text.encode())
+
+    def identity(self) -> str:
+        """Return the identity of this address book, given what it fetches."""
+        fields = "brief" if self.brief else ",".join(sorted(self.fields or ["all"]))
+        return f"{type(self).__name__}:{fields}"
 
     def _run_and_read_output(self, script: str, *args: str) -> str:
         """Run a named script with arguments and return the stdout."""
@@ -27,19 +55,24 @@ class AppleScriptBasedAddressBook(AddressBook):
         )
         result = None
         try:
-            result = subprocess.run(
-                ["/usr/bin/osascript", script_path, *args],
-                encoding="utf-8",
-                check=True,
-                capture_output=True,
-            )  # nosec B603
+            with timing.timed("osascript"):
+                result = subprocess.run(
+                    ["/usr/bin/osascript", script_path, *args],
+                    encoding="utf-8",
+                    check=True,
+                    capture_output=True,
+                )  # nosec B603
+            self._count_read(result.stdout)
             return result.stdout
         except subprocess.CalledProcessError as e:
             print(e.stderr)
             raise e
 
-    def _run_and_read_log(self, script: str, *args: str) -> Iterator[str]:
-        """Run a named script with arguments and return the stdout."""
+    def _run_and_read_log(self, script: str, *args: str) -> Generator[str, None, None]:
+        """Run a named script with arguments and return the log lines.
+
+        The script is terminated if the log is closed before it ends.
+        """
         script_path = (
             Path(__file__).parent / "applescript" / "{}.applescript".format(script)
         )
@@ -51,8 +84,13 @@ class AppleScriptBasedAddressBook(AddressBook):
                 stderr=subprocess.PIPE,
                 universal_newlines=True,
             ) as process:  # nosec B603
-                if process.stderr:
-                    yield from (x.strip() for x in process.stderr)
+                try:
+                    for line in process.stderr or []:
+                        self._count_read(line)
+                        yield line.strip()
+                except GeneratorExit:
+                    process.terminate()
+                    raise
         except subprocess.CalledProcessError as e:
             print(e.stderr)
             raise e
@@ -63,10 +101,29 @@ class AppleScriptBasedAddressBook(AddressBook):
 
     def find(self, keywords: list[str]) -> Iterator[Contact]:
         """Return list of contact ids matching given keywords."""
+        for batch in self.find_batches(keywords):
+            yield from batch
+
+    def find_batches(
+        self, keywords: list[str], *, offset: int = 0, limit: Optional[int] = None
+    ) -> Generator[list[Contact], None, None]:
+        """Return contacts matching given keywords, one batch per script run.
+
+        The search is stopped once the ids of enough contacts are found, and
+        when fewer batches than found are asked for.
+        """
         contact_ids = self._run_and_read_log("find", *keywords)
-        chunks = zip_longest(*([iter(contact_ids)] * self.batch))
-        for chunk in list(chunks):
-            yield from self._by_id([x for x in chunk if x], brief=self.brief)
+        stop = None if limit is None else offset + limit
+        window: Iterable[str] = islice(contact_ids, offset, stop)
+        if limit is not None:
+            window = list(window)
+            contact_ids.close()
+        chunks = zip_longest(*([iter(window)] * self.batch))
+        try:
+            for chunk in chunks:
+                yield list(self._by_id([x for x in chunk if x], brief=self.brief))
+        finally:
+            contact_ids.close()
 
     def get(self, contact_id: str) -> Contact:
         """Fetch a contact with its id."""
@@ -75,6 +132,12 @@ class AppleScriptBasedAddressBook(AddressBook):
             raise RuntimeError("Contact not found {contact.id}")
         return result[0]
 
+    def get_many(self, contact_ids: list[str]) -> list[Contact]:
+        """Fetch contacts with their ids in a single script run."""
+        if not contact_ids:
+            return []
+        return list(self._by_id(contact_ids))
+
     def _by_id(
         self, contact_ids: list[str], *, brief: bool = False
     ) -> Iterator[Contact]:
@@ -82,9 +145,18 @@ class AppleScriptBasedAddressBook(AddressBook):
 
         :param brief: omit most contact details in favor of performance
         """
-        output = self._run_and_read_output("brief" if brief else "detail", *contact_ids)
-        for data in json.loads(output)["data"]:
-            yield Contact(**data)
+        if brief:
+            output = self._run_and_read_output("brief", *contact_ids)
+        elif self.fields is not None:
+            fields = "fields={}".format(",".join(sorted(self.fields)))
+            output = self._run_and_read_output("detail", fields, *contact_ids)
+        else:
+            output = self._run_and_read_output("detail", *contact_ids)
+        with timing.timed("json"):
+            items = json.loads(output)["data"]
+        with timing.timed("validate"):
+            contacts = [Contact(**x) for x in items]
+        yield from contacts
 
     def _update_field(self, contact_id: str, field: str, value: str) -> None:
         """Add or update contact field with given value."""
@@ -109,3 +181,8 @@ class AppleScriptBasedAddressBook(AddressBook):
     def _delete_info(self, contact_id: str, field: str, info_id: str) -> None:
         """Delete a contact info."""
         self._run_and_read_output("delete", contact_id, field, info_id)
+
+    def _delete_infos(self, contact_id: str, field: str, info_ids: list[str]) -> None:
+        """Delete multiple contact infos with a single script run."""
+        if info_ids:
+            self._run_and_read_output("delete", contact_id, field, *info_ids)
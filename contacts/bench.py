@@ -0,0 +1,453 @@
+"""Benchmarks on synthetic address books.
+
+Run with `contacts bench [NAME]... [--size N]... [--output FILE]`, and compare
+the results written by different versions.
+"""
+
+from __future__ import annotations
+
+import difflib
+import importlib.metadata
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import re
+import resource
+import subprocess  # nosec B404
+import sys
+import tempfile
+import time
+import warnings
+from contextlib import ExitStack, redirect_stdout
+from functools import partial
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Annotated, Callable, Optional
+from unittest.mock import patch
+
+import email_validator
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from contacts import cli, client, normalize, query, synthetic
+from contacts.checks import Checks, url_check
+from contacts.contact import Contact
+from contacts.duplicates import DuplicateFinder
+from contacts.index import PhoneticIndex, TrigramIndex
+from contacts.output import PlainWriter, RenderWriter, Writer, with_icon
+from contacts.plan import FixPlan
+from contacts.replay import Recording, Step
+
+Benchmark = Callable[[int], dict[str, float]]
+
+# milliseconds each command may spend importing modules when started
+STARTUP_BUDGETS = {"help": 350.0, "config": 250.0, "list": 400.0, "json": 350.0}
+IMPORT_TIME = re.compile(r"^import time:\s+(\d+) \|", re.MULTILINE)
+
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+def benchmark(func: Benchmark) -> Benchmark:
+    """Register a benchmark under its function name."""
+    BENCHMARKS[func.__name__] = func
+    return func
+
+
+@benchmark
+def duplicates(size: int) -> dict[str, float]:
+    """Find duplicate people across the address book."""
+    people = list(synthetic.generate(size))
+    finder = DuplicateFinder()
+    start = time.perf_counter()
+    for person in people:
+        finder.add(person)
+    clusters = finder.clusters()
+    seconds = time.perf_counter() - start
+    return {
+        "seconds": seconds,
+        "per_second": size / seconds,
+        "pairs": finder.pairs,
+        "clusters": len(clusters),
+    }
+
+
+@benchmark
+def parse(size: int) -> dict[str, float]:
+    """Parse contacts from script output, as JSON and then as models."""
+    people = synthetic.generate(size, mess=synthetic.MESSY)
+    batches = []
+    while batch := [
+        x.model_dump(exclude_defaults=True) for _, x in zip(range(10), people)
+    ]:
+        batches.append(json.dumps({"data": batch}))
+
+    start = time.perf_counter()
+    loaded = [json.loads(x)["data"] for x in batches]
+    decoded = time.perf_counter() - start
+    start = time.perf_counter()
+    for batch in loaded:
+        for data in batch:
+            Contact(**data)
+    validated = time.perf_counter() - start
+    return {
+        "seconds": decoded + validated,
+        "per_second": size / (decoded + validated),
+        "json_seconds": decoded,
+        "validate_seconds": validated,
+        "mb": sum(len(x) for x in batches) / 2**20,
+    }
+
+
+@benchmark
+def checks(size: int) -> dict[str, float]:
+    """Run each check on messy contacts, with network checks answered locally."""
+    people = list(synthetic.generate(size, mess=synthetic.MESSY))
+    result = {}
+    with _test_environment():
+        for check in Checks:
+            start = time.perf_counter()
+            found = check.value.check_many(people)
+            seconds = time.perf_counter() - start
+            name = check.name.lower()
+            result[f"{name}_per_second"] = size / seconds
+            result[f"{name}_problems"] = sum(len(x) for x in found)
+    return result
+
+
+@benchmark
+def plan(size: int) -> dict[str, float]:
+    """Plan fixes of messy contacts, coalescing their changes."""
+    people = list(synthetic.generate(size, mess=synthetic.MESSY))
+    Contact.check_all(people, [x.value for x in Checks if not x.value.network])
+    start = time.perf_counter()
+    fixes = FixPlan()
+    fixes.add_contacts(people)
+    mutations = fixes.mutations()
+    changes = len(fixes.export().changes)
+    seconds = time.perf_counter() - start
+    return {
+        "seconds": seconds,
+        "per_second": size / seconds,
+        "mutations": len(mutations),
+        "changes": changes,
+        "proposed_calls": fixes.proposed_calls,
+    }
+
+
+@benchmark
+def recheck(size: int) -> dict[str, float]:
+    """Re-check contacts after a fix to their e-mails, reusing other results."""
+    checks = [x.value for x in Checks if not x.value.network]
+    people = list(synthetic.generate(size))
+    Contact.check_all(people, checks)
+
+    fetched = [Contact.model_validate(x.model_dump()) for x in people]
+    start = time.perf_counter()
+    Contact.check_all(fetched, checks)
+    full = time.perf_counter() - start
+
+    fetched = [Contact.model_validate(x.model_dump()) for x in people]
+    start = time.perf_counter()
+    for before, after in zip(people, fetched):
+        after.reuse_problems(before, {"emails"})
+    Contact.check_all(fetched, checks)
+    incremental = time.perf_counter() - start
+    return {
+        "seconds": incremental,
+        "full_seconds": full,
+        "speedup": full / incremental,
+    }
+
+
+@benchmark
+def keywords(size: int) -> dict[str, float]:
+    """Fold long keywords and make their romanized variants."""
+    letters = {"i": ["ı"], "o": ["ø"], "l": ["ł"]}
+    people = list(synthetic.generate(size))
+    names = [" ".join(x.name for x in people[i : i + 4]) for i in range(size)]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        start = time.perf_counter()
+        found = [query.variants(normalize.fold(x).capitalize(), letters) for x in names]
+        seconds = time.perf_counter() - start
+        with patch.object(query, "variant_letters", lambda: letters):
+            start = time.perf_counter()
+            for name in names:
+                query.prepare_keywords(name.split()[:2])
+            prepared = time.perf_counter() - start
+    return {
+        "seconds": seconds,
+        "per_second": size / seconds,
+        "length": sum(len(x) for x in names) / size,
+        "variants": sum(len(x) for x in found) / size,
+        "prepare_per_second": size / prepared,
+    }
+
+
+@benchmark
+def fuzzy(size: int) -> dict[str, float]:
+    """Search names with typos in a trigram index and with difflib."""
+    rand = random.Random(0)  # nosec B311
+    people = list(synthetic.generate(size))
+    sample = rand.sample(people, min(size, 20))
+    queries = [(x.id, synthetic.typo(rand, x.name)) for x in sample]
+
+    start = time.perf_counter()
+    index = TrigramIndex(people)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found = [(x, [y.contact_id for y in index.search(q)]) for x, q in queries]
+    indexed = (time.perf_counter() - start) / len(queries)
+
+    names = [normalize.text(x.name) for x in people]
+    start = time.perf_counter()
+    for _, text in queries[:5]:
+        difflib.get_close_matches(normalize.text(text), names, n=10)
+    scanned = (time.perf_counter() - start) / len(queries[:5])
+    return {
+        "build_seconds": build,
+        "ms": indexed * 1000,
+        "difflib_ms": scanned * 1000,
+        "speedup": scanned / indexed,
+        "hits": sum(x in y for x, y in found) / len(found),
+    }
+
+
+@benchmark
+def sounds_like(size: int) -> dict[str, float]:
+    """Look up names with typos by their phonetic keys."""
+    rand = random.Random(0)  # nosec B311
+    people = list(synthetic.generate(size))
+    queries = [
+        synthetic.typo(rand, x.name) for x in rand.sample(people, min(size, 100))
+    ]
+
+    start = time.perf_counter()
+    index = PhoneticIndex(people)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found = [len(index.search(x)) for x in queries]
+    searched = (time.perf_counter() - start) / len(queries)
+    return {
+        "build_seconds": build,
+        "ms": searched * 1000,
+        "found": sum(found) / len(found),
+    }
+
+
+@benchmark
+def render(size: int) -> dict[str, float]:
+    """Write contacts as listings and details, with rich and as plain text."""
+    people = list(synthetic.generate(size))
+    Contact.check_all(people, [x.value for x in Checks if not x.value.network])
+    detailed = people[:1000]
+
+    def rows_per_second(writer: Writer, contacts: list[Contact]) -> float:
+        start = time.perf_counter()
+        for person in contacts:
+            writer.write(person)
+        writer.close()
+        return len(contacts) / (time.perf_counter() - start)
+
+    console = Console(file=io.StringIO(), width=100)
+    rich = rows_per_second(RenderWriter(console, with_icon), people)
+    plain = rows_per_second(PlainWriter(file=io.StringIO()), people)
+    rich_detail = rows_per_second(
+        RenderWriter(console, partial(cli.table, width=100)), detailed
+    )
+    plain_detail = rows_per_second(
+        PlainWriter(detail=True, file=io.StringIO()), detailed
+    )
+    return {
+        "rich_per_second": rich,
+        "plain_per_second": plain,
+        "speedup": plain / rich,
+        "rich_detail_per_second": rich_detail,
+        "plain_detail_per_second": plain_detail,
+        "detail_speedup": plain_detail / rich_detail,
+    }
+
+
+@benchmark
+def stream(size: int) -> dict[str, float]:
+    """List and check every contact of a book, in a process of its own."""
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_check_book, args=(size, sender))
+    process.start()
+    seconds, baseline, peak = receiver.recv()
+    process.join()
+    return {
+        "seconds": seconds,
+        "per_second": size / seconds,
+        "baseline_rss_mb": baseline / 2**20,
+        "peak_rss_mb": peak / 2**20,
+    }
+
+
+@benchmark
+def startup(size: int) -> dict[str, float]:
+    """Start commands in new processes, checking their imports against budgets."""
+    people = list(synthetic.generate(min(size, 100)))
+    result: dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as home:
+        recording = Path(home) / "recording"
+        _record_listings(recording, people)
+        replayed = ["--replay", str(recording), "--replay-latency", "0"]
+        commands = {
+            "help": ["--help"],
+            "config": ["config", "--show"],
+            "list": ["--plain", *replayed],
+            "json": ["--json", *replayed],
+        }
+        env = {
+            **os.environ,
+            "HOME": home,
+            "XDG_CONFIG_HOME": home,
+            client.NO_DAEMON: "1",
+        }
+        for name, args in commands.items():
+            runs = [_start(args, env) for _ in range(3)]
+            imports = min(x for x, _ in runs) * 1000
+            result[f"{name}_import_ms"] = imports
+            result[f"{name}_ms"] = min(x for _, x in runs) * 1000
+            result[f"{name}_budget_ms"] = STARTUP_BUDGETS[name]
+        result["over_budget"] = sum(
+            result[f"{x}_import_ms"] > y for x, y in STARTUP_BUDGETS.items()
+        )
+    return result
+
+
+def _record_listings(path: Path, people: list[Contact]) -> None:
+    """Write a recording of listing all contacts, briefly and in full."""
+    recording = Recording(path)
+    for fields, include in [("brief", {"id", "name", "is_company"}), ("all", None)]:
+        identity = f"AppleScriptBasedAddressBook:{fields}"
+        data = [
+            x.model_dump(mode="json", include=include, exclude_defaults=True)
+            for x in people
+        ]
+        count = Step(
+            call=recording.next_call(),
+            identity=identity,
+            method="count",
+            args=[[]],
+            seconds=0.0,
+            result=len(data),
+        )
+        recording.append(count)
+        find = partial(
+            Step,
+            call=recording.next_call(),
+            identity=identity,
+            method="find_batches",
+            args=[[], 0, None],
+            seconds=0.0,
+        )
+        for i in range(0, len(data), 10):
+            recording.append(find(result=data[i : i + 10]))
+        recording.append(find(end=True))
+
+
+def _start(args: list[str], env: dict[str, str]) -> tuple[float, float]:
+    """Run the app in a new process, returning seconds spent importing and in all."""
+    start = time.perf_counter()
+    process = subprocess.run(  # nosec B603
+        [sys.executable, "-X", "importtime", "-m", "contacts.client", *args],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    seconds = time.perf_counter() - start
+    imports = sum(int(x) for x in IMPORT_TIME.findall(process.stderr))
+    return imports / 1e6, seconds
+
+
+def _max_rss() -> int:
+    """Return the peak resident memory of this process in bytes."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def _test_environment() -> ExitStack:
+    """Return a context answering network checks without the network."""
+    stack = ExitStack()
+    stack.enter_context(patch.object(email_validator, "TEST_ENVIRONMENT", True))
+    stack.enter_context(patch.object(url_check, "TEST_ENVIRONMENT", True))
+    return stack
+
+
+def _check_book(size: int, sender: Connection) -> None:
+    """Run 'contacts --check' on a generated book and send back its cost."""
+    email_validator.TEST_ENVIRONMENT = True
+    url_check.TEST_ENVIRONMENT = True
+    book = synthetic.SyntheticAddressBook(size)
+    command = typer.main.get_command(cli.app)
+    baseline = _max_rss()
+    start = time.perf_counter()
+    with (
+        open(os.devnull, "w", encoding="utf-8") as devnull,
+        redirect_stdout(devnull),
+        patch.object(cli, "get_address_book", lambda **_: book),
+    ):
+        command.main(["main", "--check"], standalone_mode=False)
+    sender.send((time.perf_counter() - start, baseline, _max_rss()))
+
+
+def run(names: list[str], sizes: list[int]) -> dict[str, dict[int, dict[str, float]]]:
+    """Run named benchmarks against each address book size."""
+    return {name: {size: BENCHMARKS[name](size) for size in sizes} for name in names}
+
+
+def version() -> str:
+    """Return the installed version of the app."""
+    try:
+        return importlib.metadata.version("contacts")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def main(
+    names: Annotated[
+        Optional[list[str]], typer.Argument(help="Benchmarks to run, all by default")
+    ] = None,
+    size: Annotated[
+        Optional[list[int]], typer.Option(help="Address book sizes to run against")
+    ] = None,
+    output: Annotated[
+        Optional[Path], typer.Option(help="Write results as JSON to compare later")
+    ] = None,
+) -> None:
+    """Run benchmarks and print their results."""
+    unknown = [x for x in names or [] if x not in BENCHMARKS]
+    if unknown:
+        raise typer.BadParameter(
+            f"Unknown {', '.join(unknown)}, expected some of {', '.join(BENCHMARKS)}.",
+            param_hint="NAMES",
+        )
+    results = run(names or list(BENCHMARKS), size or [1000, 10000])
+    table = Table("Benchmark", "Size", "Result")
+    for name, by_size in results.items():
+        for count, result in by_size.items():
+            values = ", ".join(f"{k}={v:.6g}" for k, v in result.items())
+            table.add_row(name, str(count), values)
+    Console().print(table)
+    if output is not None:
+        data = {
+            "version": version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }
+        output.write_text(json.dumps(data, indent=4), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,290 @@
+"""Cache of query results shared by runs of the app.
+
+Each query result is a file named by the hash of the query, so that a lookup
+reads only its own result. Files are touched on each hit, and the least
+recently used are evicted when there are too many of them. Any change made
+through a cached address book drops every result.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+from typing import Any, Generator, Iterator, Optional
+
+import typer
+from pydantic import BaseModel
+
+from contacts.address_book import BATCH_SIZE, AddressBook
+from contacts.contact import Contact
+
+CACHE_PATH = Path(typer.get_app_dir("contacts")) / "cache"
+
+# larger find results are not cached, so that they are not held in memory
+MAX_CONTACTS = 1000
+
+
+class CachedResult(BaseModel):
+    """Result of a query, with when it was made."""
+
+    created: float
+    count: int
+    contacts: Optional[list[Contact]] = None
+
+
+class QueryCache:
+    """Query results kept on disk for a while, least recently used evicted first."""
+
+    def __init__(self, ttl: float, size: int):
+        """Initialize cache.
+
+        :param ttl: seconds a result is used for, caching nothing if zero
+        :param size: maximum number of results kept
+        """
+        self.ttl = ttl
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self.clears = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether results are cached at all."""
+        return self.ttl > 0
+
+    def get(self, key: str) -> Optional[CachedResult]:
+        """Return a fresh result for a key, if there is one."""
+        if not self.enabled:
+            return None
+        path = CACHE_PATH / key
+        try:
+            result = CachedResult.model_validate_json(path.read_bytes())
+            if time.time() - result.created <= self.ttl:
+                _touch(path)
+                self.hits += 1
+                return result
+        except (OSError, ValueError):
+            pass
+        self.misses += 1
+        return None
+
+    def put(
+        self, key: str, count: int, contacts: Optional[list[Contact]] = None
+    ) -> None:
+        """Store the result for a key, evicting least recently used results."""
+        if not self.enabled:
+            return
+        result = CachedResult(created=time.time(), count=count, contacts=contacts)
+        CACHE_PATH.mkdir(mode=0o700, parents=True, exist_ok=True)
+        CACHE_PATH.chmod(0o700)
+        path = CACHE_PATH / key
+        temporary = path.with_name(f"{key}.{os.getpid()}.tmp")
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+        with open(os.open(temporary, flags, 0o600), "w", encoding="utf-8") as file:
+            file.write(result.model_dump_json(exclude_defaults=True))
+        os.replace(temporary, path)
+        _touch(path)
+        results = sorted(
+            (x for x in CACHE_PATH.iterdir() if x.suffix != ".tmp"),
+            key=lambda x: x.stat().st_mtime_ns,
+        )
+        for stale in results[: max(len(results) - self.size, 0)]:
+            stale.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Drop all results."""
+        self.clears += 1
+        if CACHE_PATH.is_dir():
+            for path in CACHE_PATH.iterdir():
+                path.unlink(missing_ok=True)
+
+
+class MemoryQueryCache(QueryCache):
+    """Query results kept in memory by a long running process.
+
+    Contacts are kept as copies without the problems found on them, so that runs
+    selecting other checks, or timing out on fewer, check them again.
+    """
+
+    def __init__(self, ttl: float, size: int):
+        """Initialize cache.
+
+        :param ttl: seconds a result is used for, caching nothing if zero
+        :param size: maximum number of results kept
+        """
+        super().__init__(ttl, size)
+        self._results: OrderedDict[str, CachedResult] = OrderedDict()
+
+    def get(self, key: str) -> Optional[CachedResult]:
+        """Return a fresh result for a key, if there is one."""
+        if not self.enabled:
+            return None
+        result = self._results.get(key)
+        if result is not None and time.time() - result.created <= self.ttl:
+            self._results.move_to_end(key)
+            self.hits += 1
+            return _unchecked(result)
+        self.misses += 1
+        return None
+
+    def put(
+        self, key: str, count: int, contacts: Optional[list[Contact]] = None
+    ) -> None:
+        """Store the result for a key, evicting least recently used results."""
+        if not self.enabled:
+            return
+        self._results[key] = _unchecked(
+            CachedResult(created=time.time(), count=count, contacts=contacts)
+        )
+        self._results.move_to_end(key)
+        while len(self._results) > self.size:
+            self._results.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all results."""
+        self.clears += 1
+        self._results.clear()
+
+
+def _unchecked(result: CachedResult) -> CachedResult:
+    """Return a result with copies of its contacts, without their problems."""
+    if result.contacts is None:
+        return result
+    contacts = [x.unchecked() for x in result.contacts]
+    return result.model_copy(update={"contacts": contacts})
+
+
+def _touch(path: Path) -> None:
+    """Mark a result as used, with a finer time than file systems set."""
+    now = time.time_ns()
+    os.utime(path, ns=(now, now))
+
+
+class CachedAddressBook(AddressBook):
+    """Address book that reuses recent count and find results of another."""
+
+    def __init__(
+        self, address_book: AddressBook, cache: QueryCache, *, fresh: bool = False
+    ):
+        """Initialize with the address book to cache the results of.
+
+        :param address_book: address book to cache the results of
+        :param cache: cache to keep the results in
+        :param fresh: whether to always fetch results, only dropping cached ones
+            on changes, for runs that change contacts
+        """
+        self.address_book = address_book
+        self.cache = cache
+        self.fresh = fresh
+
+    def identity(self) -> str:
+        """Return the identity of the cached address book."""
+        return self.address_book.identity()
+
+    def key(self, operation: str, *args: Any) -> str:
+        """Return the cache key of a query."""
+        query = json.dumps([operation, self.identity(), *args])
+        return hashlib.sha256(query.encode()).hexdigest()
+
+    def count(self, keywords: list[str]) -> int:
+        """Return number of contacts matching given keywords."""
+        if self.fresh:
+            return self.address_book.count(keywords)
+        key = self.key("count", keywords)
+        result = self.cache.get(key)
+        if result is not None:
+            return result.count
+        count = self.address_book.count(keywords)
+        self.cache.put(key, count)
+        return count
+
+    def find(self, keywords: list[str]) -> Iterator[Contact]:
+        """Return list of contact ids matching given keywords."""
+        for batch in self.find_batches(keywords):
+            yield from batch
+
+    def find_batches(
+        self, keywords: list[str], *, offset: int = 0, limit: Optional[int] = None
+    ) -> Generator[list[Contact], None, None]:
+        """Return contacts matching given keywords in batches as they are fetched.
+
+        Results are cached only when they are fetched to the end with no
+        changes made in between, and when they are not too large.
+        """
+        if self.fresh:
+            yield from self.address_book.find_batches(
+                keywords, offset=offset, limit=limit
+            )
+            return
+        key = self.key("find", keywords, offset, limit)
+        result = self.cache.get(key)
+        if result is not None and result.contacts is not None:
+            cached = iter(result.contacts)
+            while batch := list(islice(cached, BATCH_SIZE)):
+                yield batch
+            return
+        clears = self.cache.clears
+        contacts: Optional[list[Contact]] = [] if self.cache.enabled else None
+        for batch in self.address_book.find_batches(
+            keywords, offset=offset, limit=limit
+        ):
+            if contacts is not None:
+                contacts.extend(batch)
+                if len(contacts) > MAX_CONTACTS:
+                    contacts = None
+            yield batch
+        if contacts is not None and clears == self.cache.clears:
+            self.cache.put(key, len(contacts), contacts)
+
+    def get(self, contact_id: str) -> Contact:
+        """Fetch a contact with its id."""
+        return self.address_book.get(contact_id)
+
+    def get_many(self, contact_ids: list[str]) -> list[Contact]:
+        """Fetch contacts with their ids."""
+        return self.address_book.get_many(contact_ids)
+
+    def _update_field(self, contact_id: str, field: str, value: str) -> None:
+        """Add or update a contact field with given value."""
+        with self._changing():
+            self.address_book._update_field(contact_id, field, value)
+
+    def _delete_field(self, contact_id: str, field: str) -> None:
+        """Delete a contact field."""
+        with self._changing():
+            self.address_book._delete_field(contact_id, field)
+
+    def _update_info(
+        self, contact_id: str, field: str, info_id: str, **values: str
+    ) -> None:
+        """Update a contact info with given label and value."""
+        with self._changing():
+            self.address_book._update_info(contact_id, field, info_id, **values)
+
+    def _add_info(self, contact_id: str, field: str, **values: str) -> None:
+        """Add a contact info."""
+        with self._changing():
+            self.address_book._add_info(contact_id, field, **values)
+
+    def _delete_info(self, contact_id: str, field: str, info_id: str) -> None:
+        """Delete a contact info."""
+        with self._changing():
+            self.address_book._delete_info(contact_id, field, info_id)
+
+    def _delete_infos(self, contact_id: str, field: str, info_ids: list[str]) -> None:
+        """Delete multiple contact infos of the same field at once."""
+        with self._changing():
+            self.address_book._delete_infos(contact_id, field, info_ids)
+
+    @contextmanager
+    def _changing(self) -> Iterator[None]:
+        try:
+            yield
+        finally:
+            self.cache.clear()
@@ -31,6 +31,7 @@ class Category(Enum):
     OTHER = ("🗂️", {"_$!<Other>!$_"})
     WARNING = "⚠️ "
     ERROR = "⛔"
+    UNKNOWN = "❔"
 
     def __init__(self, icon: str, labels: AbstractSet[str] = frozenset()):
         """Initialize category."""
@@ -4,15 +4,16 @@ from __future__ import annotations
 
 from enum import Enum
 
+from contacts import normalize
 from contacts.checks.casing_check import CasingCheck
 from contacts.checks.custom_date_check import CustomDateCheck
 from contacts.checks.dupe_check import DupeCheck
-from contacts.checks.email_check import EmailCheck
+from contacts.checks.email_check import EmailCheck, EmailDeliverabilityCheck
 from contacts.checks.home_page_check import HomePageCheck
 from contacts.checks.label_check import LabelCheck
 from contacts.checks.nickname_check import NicknameCheck
 from contacts.checks.phone_check import PhoneCheck
-from contacts.checks.url_check import UrlCheck
+from contacts.checks.url_check import UrlCheck, UrlReachabilityCheck
 from contacts.field import ContactFields
 
 
@@ -30,17 +31,41 @@ class Checks(Enum):
     DEPARTMENT_CASING_CHECK = CasingCheck(ContactFields.DEPARTMENT.value)
     PHONE_LABEL_CHECK = LabelCheck(ContactFields.PHONE.value)
     PHONE_CHECK = PhoneCheck()
-    PHONE_DUPE_CHECK = DupeCheck(ContactFields.PHONE.value, False)
+    PHONE_DUPE_CHECK = DupeCheck(ContactFields.PHONE.value, False, normalize.phone)
     EMAIL_LABEL_CHECK = LabelCheck(ContactFields.EMAIL.value)
     EMAIL_CHECK = EmailCheck()
-    EMAIL_DUPE_CHECK = DupeCheck(ContactFields.EMAIL.value, False)
+    EMAIL_DELIVERABILITY_CHECK = EmailDeliverabilityCheck()
+    EMAIL_DUPE_CHECK = DupeCheck(ContactFields.EMAIL.value, False, normalize.email)
     HOME_PAGE_CHECK = HomePageCheck()
     URL_LABEL_CHECK = LabelCheck(ContactFields.URL.value)
-    URL_DUPE_CHECK = DupeCheck(ContactFields.URL.value, False)
+    URL_DUPE_CHECK = DupeCheck(ContactFields.URL.value, False, normalize.url)
     URL_CHECK = UrlCheck()
+    URL_REACHABILITY_CHECK = UrlReachabilityCheck()
     ADDRESS_LABEL_CHECK = LabelCheck(ContactFields.ADDRESS.value)
-    ADDRESS_DUPE_CHECK = DupeCheck(ContactFields.ADDRESS.value, False)
+    ADDRESS_DUPE_CHECK = DupeCheck(
+        ContactFields.ADDRESS.value, False, normalize.address
+    )
     CUSTOM_DATE_CHECK = CustomDateCheck()
     CUSTOM_DATE_DUPE_CHECK = DupeCheck(ContactFields.CUSTOM_DATE.value, True)
     SOCIAL_PROFILE_DUPE_CHECK = DupeCheck(ContactFields.SOCIAL_PROFILE.value, True)
     INSTANT_MESSAGE_DUPE_CHECK = DupeCheck(ContactFields.INSTANT_MESSAGE.value, True)
+
+
+def select_checks(names: list[str]) -> list[Checks]:
+    """Return checks matching given check or field names.
+
+    A field name like `phone` selects every check reading that field, while a
+    check name like `phone_dupe_check` selects only that check.
+    """
+    selected: list[Checks] = []
+    for name in names:
+        key = name.strip().upper()
+        matches = [
+            x
+            for x in Checks
+            if key == x.name or key in (y.name for y in x.value.fields)
+        ]
+        if not matches:
+            raise ValueError(f"Unknown check '{name}'.")
+        selected.extend(x for x in matches if x not in selected)
+    return sorted(selected, key=list(Checks).index)
@@ -5,7 +5,7 @@ from __future__ import annotations
 from functools import partial
 
 from contacts.contact import Contact
-from contacts.field import ContactFieldMetadata
+from contacts.field import ContactFieldMetadata, ContactFields
 from contacts.problem import Check, Problem
 
 
@@ -15,6 +15,7 @@ class CasingCheck(Check):
     def __init__(self, field: ContactFieldMetadata):
         """Initialize checker for a name field."""
         self.field = field
+        self.fields = frozenset([ContactFields(field)])
 
     def check(self, contact: Contact) -> list[Problem]:
         """Check contact."""
@@ -8,12 +8,15 @@ from typing import Optional
 from contacts.address_book import AddressBook
 from contacts.category import Category
 from contacts.contact import Contact, ContactInfo
+from contacts.field import ContactFields
 from contacts.problem import Check, Problem
 
 
 class CustomDateCheck(Check):
     """Checker for custom dates."""
 
+    fields = frozenset([ContactFields.CUSTOM_DATE])
+
     def check(self, contact: Contact) -> list[Problem]:
         """Check contact."""
 
@@ -2,49 +2,70 @@
 
 from __future__ import annotations
 
-from itertools import groupby
-from typing import Iterator, Optional
+from typing import Callable, Optional
 
-from contacts.address_book import AddressBook
+from contacts.address_book import ContactEditor
+from contacts.category import Category
 from contacts.contact import Contact, ContactInfo
-from contacts.field import ContactInfoMetadata
+from contacts.field import ContactFields, ContactInfoMetadata
 from contacts.problem import Check, Problem
 
 
+def label_rank(info: ContactInfo) -> int:
+    """Rank info labels, lower being a better label to keep."""
+    category = Category.from_label(info.label)
+    if category is not None and category != Category.OTHER:
+        return 0
+    if category == Category.OTHER:
+        return 1
+    if info.label:
+        return 2
+    return 3
+
+
 class DupeCheck(Check):
     """Checker for duplicate contact info."""
 
-    def __init__(self, field: ContactInfoMetadata, with_label: bool):
-        """Initialize checker for an info field."""
+    def __init__(
+        self,
+        field: ContactInfoMetadata,
+        with_label: bool,
+        normalize: Optional[Callable[[str], str]] = None,
+    ):
+        """Initialize checker for an info field.
+
+        :param normalize: maps values to the key they are compared with
+        """
         self.field = field
+        self.fields = frozenset([ContactFields(field)])
         self.with_label = with_label
+        self.normalize = normalize
 
     def check(self, contact: Contact) -> list[Problem]:
         """Check contact."""
 
         def key(info: ContactInfo) -> tuple[str, ...]:
-            return (info.value, info.label) if self.with_label else (info.value,)
+            value = self.normalize(info.value) if self.normalize else info.value
+            return (value, info.label) if self.with_label else (value,)
 
-        def check_group(
-            group: Iterator[ContactInfo],
-        ) -> Optional[Problem]:
-            duplicates = list(group)
+        def check_group(duplicates: list[ContactInfo]) -> Optional[Problem]:
             if len(duplicates) == 1:
                 return None
 
-            def fix(address_book: AddressBook) -> None:
-                for duplicate in duplicates[1:]:
-                    self.field.delete(address_book, contact.id, duplicate.id)
+            kept = min(duplicates, key=label_rank)
+            deleted = [x.id for x in duplicates if x is not kept]
+
+            def fix(address_book: ContactEditor) -> None:
+                self.field.delete_many(address_book, contact.id, deleted)
 
             return Problem(
-                f"{self.field.singular} '{duplicates[0]}' has duplicate(s).",
+                f"{self.field.singular} '{kept}' has duplicate(s).",
                 fix=fix,
             )
 
-        problems = []
-        infos = sorted(self.field.get(contact), key=key)
-        for _, group in groupby(infos, key=key):
-            problem = check_group(group)
-            if problem:
-                problems.append(problem)
-        return problems
+        groups: dict[tuple[str, ...], list[ContactInfo]] = {}
+        for info in self.field.get(contact):
+            groups.setdefault(key(info), []).append(info)
+
+        problems = [check_group(group) for group in groups.values()]
+        return [x for x in problems if x]
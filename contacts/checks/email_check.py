@@ -2,29 +2,62 @@
 
 from __future__ import annotations
 
-from functools import partial
-from typing import Optional
+from functools import lru_cache, partial
+from typing import Optional, Sequence
 
-from email_validator import EmailNotValidError, validate_email
+import email_validator
+from email_validator import EmailNotValidError, ValidatedEmail, validate_email
 
 from contacts.address_book import AddressBook
 from contacts.contact import Contact, ContactInfo
+from contacts.executor import DaemonExecutor
+from contacts.field import ContactFields
 from contacts.problem import Check, Problem
 
+MAX_WORKERS = 16
+DNS_TIMEOUT = 5
+
+
+# values rarely repeat across contacts, so only a batch worth is kept
+@lru_cache(maxsize=1 << 12)
+def validate_syntax(value: str) -> Optional[ValidatedEmail]:
+    """Return the validated e-mail address, or None if it is not valid."""
+    try:
+        return validate_email(value.strip(), check_deliverability=False)
+    except EmailNotValidError:
+        return None
+
+
+def is_deliverable(domain: tuple[str, str]) -> bool:
+    """Return whether the ASCII and international domain accepts e-mail."""
+    from email_validator.deliverability import validate_email_deliverability
+
+    try:
+        validate_email_deliverability(*domain, timeout=DNS_TIMEOUT)
+    except EmailNotValidError:
+        return False
+    return True
+
 
 class EmailCheck(Check):
-    """Checker for e-mail addresses."""
+    """Checker for e-mail address syntax."""
+
+    fields = frozenset([ContactFields.EMAIL])
 
     def check(self, contact: Contact) -> list[Problem]:
         """Check contact."""
+        return self.check_many([contact])[0]
 
-        def check_value(email: ContactInfo) -> Optional[Problem]:
-            try:
-                formatted = validate_email(
-                    email.value.strip(), check_deliverability=True
-                ).normalized
-            except EmailNotValidError:
+    def check_many(self, contacts: Sequence[Contact]) -> list[list[Problem]]:
+        """Check contacts, validating each address only once."""
+        values = {email.value for contact in contacts for email in contact.emails}
+        validated = {value: validate_syntax(value) for value in values}
+
+        def check_value(contact: Contact, email: ContactInfo) -> Optional[Problem]:
+            result = validated[email.value]
+            if result is None:
                 return Problem(f"E-mail '{email.value}' is not valid.")
+            formatted = result.normalized
             if email.value == formatted:
                 return None
 
@@ -38,5 +71,50 @@ class EmailCheck(Check):
                 ),
             )
 
-        problems = [check_value(email) for email in contact.emails]
-        return [x for x in problems if x]
+        problems = [
+            [check_value(contact, email) for email in contact.emails]
+            for contact in contacts
+        ]
+        return [[x for x in found if x] for found in problems]
+
+
+class EmailDeliverabilityCheck(Check):
+    """Checker for e-mail domains accepting mail."""
+
+    fields = frozenset([ContactFields.EMAIL])
+    network = True
+
+    def check(self, contact: Contact) -> list[Problem]:
+        """Check contact."""
+        return self.check_many([contact])[0]
+
+    def check_many(self, contacts: Sequence[Contact]) -> list[list[Problem]]:
+        """Check contacts, resolving each domain only once."""
+        values = {email.value for contact in contacts for email in contact.emails}
+        validated = {value: validate_syntax(value) for value in values}
+
+        domains = sorted(
+            {
+                (x.ascii_domain, x.domain)
+                for x in validated.values()
+                if x is not None and getattr(x, "domain_address", None) is None
+            }
+        )
+        undeliverable: set[str] = set()
+        if domains and not email_validator.TEST_ENVIRONMENT:
+            with DaemonExecutor(min(len(domains), MAX_WORKERS)) as executor:
+                results = executor.map(is_deliverable, domains)
+                undeliverable = {
+                    domain for (domain, _), ok in zip(domains, results) if not ok
+                }
+
+        def check_value(email: ContactInfo) -> Optional[Problem]:
+            result = validated[email.value]
+            if result is None or result.ascii_domain not in undeliverable:
+                return None
+            return Problem(f"E-mail '{email.value}' is not deliverable.")
+
+        problems = [
+            [check_value(email) for email in contact.emails] for contact in contacts
+        ]
+        return [[x for x in found if x] for found in problems]
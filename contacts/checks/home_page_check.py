@@ -2,18 +2,21 @@
 
 from __future__ import annotations
 
-from contacts.address_book import AddressBook
+from contacts.address_book import ContactEditor
 from contacts.contact import Contact
+from contacts.field import ContactFields
 from contacts.problem import Check, Problem
 
 
 class HomePageCheck(Check):
     """Checker for home page, which should be a URL instead."""
 
+    fields = frozenset([ContactFields.HOME_PAGE])
+
     def check(self, contact: Contact) -> list[Problem]:
         """Check contact."""
 
-        def fix(address_book: AddressBook) -> None:
+        def fix(address_book: ContactEditor) -> None:
             """Replace home page with a URL."""
             if contact.home_page:
                 address_book.add_url(
@@ -31,6 +31,7 @@ class LabelCheck(Check):
     def __init__(self, field: ContactInfoMetadata):
         """Initialize checker for an info field."""
         self.field = field
+        self.fields = frozenset([ContactFields(field)])
 
     def check(self, contact: Contact) -> list[Problem]:
         """Check contact."""
@@ -3,12 +3,15 @@
 from __future__ import annotations
 
 from contacts.contact import Contact
+from contacts.field import ContactFields
 from contacts.problem import Check, Problem
 
 
 class NicknameCheck(Check):
     """Checker for nicknames."""
 
+    fields = frozenset([ContactFields.NICKNAME])
+
     def check(self, contact: Contact) -> list[Problem]:
         """Check contact."""
         if contact.nickname is None:
@@ -3,41 +3,48 @@
 from __future__ import annotations
 
 from functools import partial
-from typing import Optional
-
-import phonenumbers
+from typing import Optional, Sequence
 
+from contacts import normalize
 from contacts.address_book import AddressBook
 from contacts.contact import Contact, ContactInfo
+from contacts.field import ContactFields
 from contacts.problem import Check, Problem
 
 
 class PhoneCheck(Check):
     """Checker for phone numbers."""
 
+    fields = frozenset([ContactFields.PHONE])
+
     def check(self, contact: Contact) -> list[Problem]:
         """Check contact."""
+        return self.check_many([contact])[0]
+
+    def check_many(self, contacts: Sequence[Contact]) -> list[list[Problem]]:
+        """Check contacts, parsing each distinct phone number once."""
+        values = {phone.value for contact in contacts for phone in contact.phones}
+        formatted = {value: normalize.e164(value) for value in values}
 
-        def check_value(phone: ContactInfo) -> Optional[Problem]:
-            try:
-                formatted = phonenumbers.format_number(
-                    phonenumbers.parse(phone.value),
-                    phonenumbers.PhoneNumberFormat.E164,
-                )
-            except phonenumbers.NumberParseException:
+        def check_value(contact: Contact, phone: ContactInfo) -> Optional[Problem]:
+            value = formatted[phone.value]
+            if value is None:
                 return Problem(f"Phone number '{phone.value}' is not valid.")
-            if phone.value == formatted:
+            if phone.value == value:
                 return None
 
             return Problem(
-                f"Phone number '{phone.value}' should be '{formatted}'.",
+                f"Phone number '{phone.value}' should be '{value}'.",
                 fix=partial(
                     AddressBook.update_phone,
                     contact_id=contact.id,
                     info_id=phone.id,
-                    value=formatted,
+                    value=value,
                 ),
             )
 
-        problems = [check_value(phone) for phone in contact.phones]
-        return [x for x in problems if x]
+        problems = [
+            [check_value(contact, phone) for phone in contact.phones]
+            for contact in contacts
+        ]
+        return [[x for x in found if x] for found in problems]
@@ -3,20 +3,44 @@
 from __future__ import annotations
 
 import socket
-from functools import partial
+from functools import lru_cache, partial
 from itertools import chain
-from typing import Optional
-from urllib.parse import unwrap, urlparse
+from typing import Optional, Sequence
+from urllib.parse import ParseResult, unwrap, urlparse
 
 from contacts.address_book import AddressBook
 from contacts.contact import Contact, ContactInfo
+from contacts.executor import DaemonExecutor
+from contacts.field import ContactFields
 from contacts.problem import Check, Problem
 
 TEST_ENVIRONMENT = False
 
+MAX_WORKERS = 16
+
+
+# values rarely repeat across contacts, so only a batch worth is kept
+@lru_cache(maxsize=1 << 12)
+def parse_url(value: str) -> ParseResult:
+    """Parse a URL, tolerating enclosing whitespace and brackets."""
+    return urlparse(unwrap(value.strip()))
+
+
+def is_reachable(address: tuple[str, Optional[int]]) -> bool:
+    """Return whether the host and port of a URL resolve."""
+    if TEST_ENVIRONMENT:
+        return True
+    try:
+        socket.getaddrinfo(*address)
+    except socket.gaierror:
+        return False
+    return True
+
 
 class UrlCheck(Check):
-    """Checker for URLs."""
+    """Checker for URL labels and syntax."""
+
+    fields = frozenset([ContactFields.URL])
 
     def check(self, contact: Contact) -> list[Problem]:
         """Check contact."""
@@ -36,16 +60,11 @@ class UrlCheck(Check):
             )
 
         def check_value(url: ContactInfo) -> Optional[Problem]:
-            parsed = urlparse(unwrap(url.value.strip()))
+            parsed = parse_url(url.value)
             formatted = parsed.geturl()
 
             if not (parsed.scheme and parsed.hostname):
                 return Problem(f"URL '{url.value}' is not valid.")
-            try:
-                if not TEST_ENVIRONMENT:
-                    socket.getaddrinfo(parsed.hostname, parsed.port)
-            except socket.gaierror:
-                return Problem(f"URL '{url.value}' is not reachable.")
 
             if url.value == formatted:
                 return None
@@ -65,3 +84,38 @@ class UrlCheck(Check):
             [check_value(url) for url in contact.urls],
         )
         return [x for x in problems if x]
+
+
+class UrlReachabilityCheck(Check):
+    """Checker for URL hosts resolving."""
+
+    fields = frozenset([ContactFields.URL])
+    network = True
+
+    def check(self, contact: Contact) -> list[Problem]:
+        """Check contact."""
+        return self.check_many([contact])[0]
+
+    def check_many(self, contacts: Sequence[Contact]) -> list[list[Problem]]:
+        """Check contacts, resolving all distinct hosts together."""
+        parsed = {url.value: parse_url(url.value) for x in contacts for url in x.urls}
+
+        addresses = sorted(
+            {(x.hostname, x.port) for x in parsed.values() if x.scheme and x.hostname},
+            key=str,
+        )
+        reachable: dict[tuple[str, Optional[int]], bool] = {}
+        if addresses:
+            with DaemonExecutor(min(len(addresses), MAX_WORKERS)) as executor:
+                reachable = dict(zip(addresses, executor.map(is_reachable, addresses)))
+
+        def check_value(url: ContactInfo) -> Optional[Problem]:
+            result = parsed[url.value]
+            if not (result.scheme and result.hostname):
+                return None
+            if reachable[(result.hostname, result.port)]:
+                return None
+            return Problem(f"URL '{url.value}' is not reachable.")
+
+        problems = [[check_value(url) for url in contact.urls] for contact in contacts]
+        return [[x for x in found if x] for found in problems]
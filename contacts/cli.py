@@ -1,20 +1,64 @@
 """A CLI tool to manage contacts."""
 
+from __future__ import annotations
+
 import sys
-from typing import Annotated, Any, Optional
+from collections import deque
+from contextlib import closing
+from functools import partial
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    AbstractSet,
+    Annotated,
+    Any,
+    Callable,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
 
 import typer
 from rich import box, print_json
 from rich.console import Console
-from rich.progress import Progress
-from rich.table import Table
 
-from contacts import contact, query
+from contacts import complete, timing
 from contacts.address_book import AddressBook
-from contacts.applescript_address_book import AppleScriptBasedAddressBook
 from contacts.category import Category
 from contacts.config import get_config
-from contacts.field import ContactFieldMetadata, ContactFields, ContactInfoMetadata
+from contacts.defaults import (
+    APPLY_BATCH_SIZE,
+    CHECK_TIMEOUT,
+    DEFAULT_LIMIT,
+    DEFAULT_THRESHOLD,
+    RUN_TIMEOUT,
+    SLOW_CALL,
+)
+
+if TYPE_CHECKING:
+    from rich.table import Table
+
+    from contacts.cache import QueryCache
+    from contacts.contact import Contact
+    from contacts.instrument import CallLog
+    from contacts.problem import Check, Problem
+    from contacts.replay import Step
+
+# the backend, contacts, checks, queries, output and rich widgets are imported
+# where they are used, so that commands that do not need them start faster
+
+# stages that may run on multiple threads, with their default worker counts
+WORKERS = {"details": 2, "check": 2, "fix": 1}
+
+
+COMMANDS = ["apply", "bench", "config", "dupes", "index", "serve"]
+
+
+def route(args: list[str]) -> list[str]:
+    """Return args with 'main' first, unless they start with a known command."""
+    if args[:1] and args[0] in COMMANDS:
+        return args
+    return ["main", *args]
 
 
 class App(typer.Typer):
@@ -22,8 +66,7 @@ class App(typer.Typer):
 
     def __call__(self, *args: Any, **kwargs: Any) -> Any:
         """Make the first arg 'main', unless it is a known command."""
-        if sys.argv[1] not in ["config"]:
-            sys.argv = [sys.argv[0], "main", *sys.argv[1:]]
+        sys.argv = [sys.argv[0], *route(sys.argv[1:])]
         return super().__call__(*args, **kwargs)
 
 
@@ -31,109 +74,715 @@ app = App(help=__doc__)
 
 
 @app.command()
-def config(show: bool = False, romanize: Optional[str] = None) -> None:
+def config(
+    show: bool = False,
+    romanize: Optional[str] = None,
+    cache_ttl: Annotated[
+        Optional[float],
+        typer.Option(help="Seconds to reuse query results for, 0 to disable"),
+    ] = None,
+    cache_size: Annotated[
+        Optional[int], typer.Option(help="Number of query results to keep")
+    ] = None,
+) -> None:
     """Manage configuration."""
     config = get_config()
     if romanize is not None:
         config.romanize = romanize
+    if cache_ttl is not None:
+        config.cache_ttl = cache_ttl
+    if cache_size is not None:
+        config.cache_size = cache_size
     config.dump()
     if show:
         print_json(config.model_dump_json(), indent=4)
 
 
-def with_icon(person: contact.Contact) -> str:
-    """Contact with display icon."""
-    return f"{person.category.icon} {person.name}"
+def table(person: Contact, width: Optional[int]) -> Table:
+    """Create a table view for contact."""
+    from rich.table import Table
 
+    from contacts.output import rows
 
-def table(person: contact.Contact, width: Optional[int]) -> Table:
-    """Create a table view for contact."""
     table = Table(highlight=True, box=box.ROUNDED, width=width)
     table.add_column(ratio=1, justify="right", style="magenta")
     table.add_column(person.category.icon)
     table.add_column(person.name, ratio=2)
+    for row in rows(person):
+        table.add_row(*row)
+    return table
 
-    for field in ContactFields:
-        value = field.value.get(person)
-        if isinstance(field.value, ContactFieldMetadata):
-            value = field.value.get(person)
-            if not value:
-                continue
-            table.add_row(field.value.singular, field.value.category.icon, value)
-        elif isinstance(field.value, ContactInfoMetadata):
-            for index, info in enumerate(field.value.get(person)):
-                if isinstance(info, contact.ContactInfo):
-                    category = Category.from_label(info.label, field.value.category)
-                    if category is None or category == Category.OTHER:
-                        category = field.value.category
-                    table.add_row(
-                        field.value.plural if index == 0 else None,
-                        category.icon,
-                        str(info),
-                    )
-
-    for index, problem in enumerate(person.problems):
-        table.add_row(
-            "Problems" if index == 0 else None,
-            problem.category.icon,
-            problem.message,
-        )
 
+def profile_table(summaries: list[timing.Summary]) -> Table:
+    """Create a table of stage durations in milliseconds."""
+    from rich.table import Table
+
+    table = Table(box=box.ROUNDED, title="Profile (ms)")
+    table.add_column("Stage", style="magenta")
+    for column in ["Count", "Total", "Mean", "p50", "p95", "p99"]:
+        table.add_column(column, justify="right")
+    for name, calls, *durations in summaries:
+        table.add_row(name, str(calls), *(f"{x * 1000:.2f}" for x in durations))
     return table
 
 
-def get_address_book(brief: bool, batch: int) -> AddressBook:
+def print_problems(
+    echo: Callable[[str], Any], settled: list[tuple[Contact, list[Problem]]]
+) -> None:
+    """Print problems that were found after their contacts were printed."""
+    for person, problems in settled:
+        for problem in problems:
+            echo(f"{problem.category.icon} {person.name}: {problem.message}")
+
+
+class HeldProblems:
+    """Problems settled by network checks, held until their contacts are written.
+
+    Checks run ahead of writing, so problems of contacts that are not written
+    yet are printed only once they are, and those of contacts that are never
+    written are dropped.
+    """
+
+    def __init__(self, written: AbstractSet[str]):
+        """Initialize with the ids of the contacts written so far."""
+        self.written = written
+        self.held: list[tuple[Contact, list[Problem]]] = []
+
+    def settle(
+        self, settled: list[tuple[Contact, list[Problem]]]
+    ) -> list[tuple[Contact, list[Problem]]]:
+        """Return problems of written contacts, holding back the others."""
+        pending = self.held + settled
+        self.held = [x for x in pending if x[0].id not in self.written]
+        return [x for x in pending if x[0].id in self.written]
+
+
+def complete_keywords(incomplete: str) -> list[str]:
+    """Complete keywords with names in the prefix index made by 'index'."""
+    return complete.complete(incomplete)
+
+
+# query cache shared by runs in the same process, set when serving them
+shared_cache: Optional[QueryCache] = None
+
+
+def query_cache() -> QueryCache:
+    """Return the query cache given the configuration."""
+    if shared_cache is not None:
+        return shared_cache
+    config = get_config()
+    from contacts.cache import QueryCache
+
+    return QueryCache(ttl=config.cache_ttl, size=config.cache_size)
+
+
+def parse_workers(text: Optional[str]) -> dict[str, int]:
+    """Return worker counts of stages, given like 'check=4,fix=2'."""
+    workers = dict(WORKERS)
+    for item in (text or "").split(","):
+        if not item:
+            continue
+        name, _, value = item.partition("=")
+        if name not in WORKERS or not value.isdigit() or int(value) < 1:
+            raise typer.BadParameter(
+                f"Invalid '{item}', expected counts of {', '.join(WORKERS)}.",
+                param_hint="--workers",
+            )
+        workers[name] = int(value)
+    return workers
+
+
+class Batch(NamedTuple):
+    """Contacts of a fetched batch, as they pass through the stages."""
+
+    scanned: int
+    contacts: list[Contact]
+    refetched: Sequence[Contact] = ()
+    calls: int = 0
+    proposed_calls: int = 0
+    conflicts: int = 0
+
+
+def instrumented(address_book: AddressBook, calls: Optional[CallLog]) -> AddressBook:
+    """Return an address book recording its calls, if calls are logged."""
+    if calls is None:
+        return address_book
+
+    from contacts.instrument import InstrumentedAddressBook
+
+    return InstrumentedAddressBook(address_book, calls)
+
+
+def get_address_book(
+    brief: bool, batch: int, fields: Optional[AbstractSet[str]] = None
+) -> AddressBook:
     """Return an address book implementation given the configuration."""
-    return AppleScriptBasedAddressBook(brief=brief, batch=batch)
+    from contacts.applescript_address_book import AppleScriptBasedAddressBook
 
+    return AppleScriptBasedAddressBook(brief=brief, batch=batch, fields=fields)
 
-@app.command()
+
+@app.command(context_settings={"ignore_unknown_options": True})
 def main(
     ctx: typer.Context,
-    keywords: Annotated[Optional[list[str]], typer.Argument()] = None,
+    keywords: Annotated[
+        Optional[list[str]],
+        typer.Argument(
+            help="Keywords or terms like org:acme city:berlin has:phone -has:email "
+            "label:work problem:error",
+            show_default=False,
+            autocompletion=complete_keywords,
+        ),
+    ] = None,
     *,
     detail: bool = False,
     json: bool = False,
+    ndjson: Annotated[
+        bool, typer.Option(help="Output a JSON document per line as contacts arrive")
+    ] = False,
     check: bool = False,
+    checks: Annotated[
+        Optional[str],
+        typer.Option(help="Comma separated fields or checks to run, e.g. phone,email"),
+    ] = None,
     fix: bool = False,
+    plan: Annotated[
+        Optional[Path],
+        typer.Option(help="Write proposed fixes to a plan file for 'apply'"),
+    ] = None,
+    fuzzy: Annotated[
+        bool,
+        typer.Option(help="Find keywords with typos in a snapshot made by 'index'"),
+    ] = False,
+    sounds_like: Annotated[
+        bool,
+        typer.Option(help="Find names sounding like keywords in the snapshot"),
+    ] = False,
+    threshold: Annotated[
+        float, typer.Option(help="Minimum score of --fuzzy or --sounds-like matches")
+    ] = DEFAULT_THRESHOLD,
+    top: Annotated[
+        int, typer.Option(help="Number of --fuzzy or --sounds-like matches")
+    ] = DEFAULT_LIMIT,
+    check_timeout: Annotated[
+        float, typer.Option(help="Seconds a network check may take for a batch")
+    ] = CHECK_TIMEOUT,
+    run_timeout: Annotated[
+        float, typer.Option(help="Seconds all network checks may take in total")
+    ] = RUN_TIMEOUT,
+    limit: Annotated[
+        Optional[int], typer.Option(min=0, help="Maximum number of contacts to show")
+    ] = None,
+    offset: Annotated[
+        int, typer.Option(min=0, help="Number of matching contacts to skip")
+    ] = 0,
+    cache_stats: Annotated[
+        bool, typer.Option(help="Print hits and misses of the query cache")
+    ] = False,
+    workers: Annotated[
+        Optional[str],
+        typer.Option(help="Threads of the details, check and fix stages, e.g. check=4"),
+    ] = None,
+    pipeline_stats: Annotated[
+        bool, typer.Option(help="Print throughput and queue occupancy of stages")
+    ] = False,
+    profile: Annotated[
+        bool, typer.Option(help="Print how long each stage of the run took")
+    ] = False,
+    profile_dump: Annotated[
+        Optional[Path],
+        typer.Option(help="Write a cProfile profile of the run to read with pstats"),
+    ] = None,
+    backend_stats: Annotated[
+        bool, typer.Option(help="Print calls, latencies and reads of the backend")
+    ] = False,
+    trace: Annotated[
+        Optional[Path],
+        typer.Option(help="Write backend calls as a Chrome trace, for Perfetto"),
+    ] = None,
+    slow_call: Annotated[
+        Optional[float],
+        typer.Option(help=f"Log backend calls slower than seconds [{SLOW_CALL}]"),
+    ] = None,
+    record: Annotated[
+        Optional[Path], typer.Option(help="Record backend calls to replay later")
+    ] = None,
+    replay: Annotated[
+        Optional[Path], typer.Option(help="Serve backend calls from a recording")
+    ] = None,
+    replay_latency: Annotated[
+        float,
+        typer.Option(help="Ratio of recorded latencies to wait for, 0 for none"),
+    ] = 1.0,
     batch: Optional[int] = None,
     width: Optional[int] = None,
     safe_box: bool = True,
+    plain: Annotated[
+        Optional[bool],
+        typer.Option(
+            "--plain/--rich",
+            help="Write plain text, by default for listings not on a terminal",
+            show_default=False,
+        ),
+    ] = None,
 ) -> None:
     """Manage contacts matching given keyword."""
     if ctx.invoked_subcommand is not None:
         return
 
+    from rich.progress import Progress
+
+    from contacts import query
+    from contacts.cache import CachedAddressBook
+    from contacts.executor import CheckExecutor
+    from contacts.instrument import CallLog
+    from contacts.output import (
+        JsonWriter,
+        NdjsonWriter,
+        PlainWriter,
+        RenderWriter,
+        Writer,
+        with_icon,
+    )
+    from contacts.pipeline import Pipeline
+    from contacts.plan import FixPlan
+    from contacts.replay import (
+        RecorderAddressBook,
+        Recording,
+        ReplayAddressBook,
+        load_recording,
+    )
+
+    if json and ndjson:
+        raise typer.BadParameter("Use only one of --json and --ndjson.")
+    streamed = json or ndjson
+    stage_workers = parse_workers(workers)
+    profile = profile or profile_dump is not None
+    if profile:
+        timing.start(profile=profile_dump is not None)
+
+    try:
+        search = query.parse(keywords or [])
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="KEYWORDS") from e
+
+    selected: Optional[list[Check]] = None
+    fields: Optional[set[str]] = None
+    if checks is not None:
+        from contacts.checks import select_checks
+
+        try:
+            selected = [x.value for x in select_checks(checks.split(","))]
+        except ValueError as e:
+            raise typer.BadParameter(str(e), param_hint="--checks") from e
+        check = True
+        if not (detail or streamed):
+            fields = {y.value.key for x in selected for y in x.fields}
+    if plan is not None:
+        check = True
+
+    # contacts are scanned with only the fields filters need when possible, and
+    # problem filters need the fields of all checks unless some are selected
+    residual = False
+    if search.terms and fields is not None:
+        fields |= search.fields
+    elif search.terms and (detail or streamed or check or fix):
+        residual = True
+    elif search.terms and not search.problem_filters:
+        fields = set(search.fields)
+
+    if record is not None and replay is not None:
+        raise typer.BadParameter("Use only one of --record and --replay.")
+    recording = None if record is None else Recording(record)
+    requests: Optional[dict[str, deque[list[Step]]]] = None
+    if replay is not None:
+        try:
+            requests = load_recording(replay)
+        except (OSError, ValueError) as e:
+            raise typer.BadParameter(str(e), param_hint="--replay") from e
+
+    call_log = None
+    if backend_stats or trace is not None or slow_call is not None:
+        call_log = CallLog(
+            trace=trace is not None,
+            slow=SLOW_CALL if slow_call is None else slow_call,
+            log=Console(stderr=True).print,
+        )
+
     console = Console(width=width, safe_box=safe_box)
+    with Progress(transient=True, console=console) as progress:
+        task = progress.add_task("Counting contacts")
+        keywords = query.prepare_keywords(search.search)
+
+        cache = query_cache()
+
+        def open_book(brief: bool, fields: Optional[AbstractSet[str]]) -> AddressBook:
+            book = get_address_book(
+                brief=brief, batch=batch or (1 if keywords else 10), fields=fields
+            )
+            if requests is not None:
+                book = ReplayAddressBook(
+                    requests, book.identity(), latency=replay_latency
+                )
+            elif recording is not None:
+                book = RecorderAddressBook(book, recording)
+            return CachedAddressBook(instrumented(book, call_log), cache, fresh=fix)
+
+        address_book = open_book(
+            not (detail or streamed or check or fix or search.terms), fields
+        )
+        scan_book = address_book
+        if residual:
+            scan_book = open_book(False, search.fields)
+        # the window is pushed down to the search unless filters drop contacts
+        page = query.Page(offset, limit)
+        pushed = not search.terms
+        if pushed:
+            page = query.Page(limit=limit)
+        if fuzzy or sounds_like:
+            ids = indexed_search(
+                search.keywords, sounds_like=sounds_like, threshold=threshold, top=top
+            )
+            if pushed:
+                ids = ids[offset:][:limit]
+            count: Optional[int] = len(ids)
+            batches = (x for x in [scan_book.get_many(ids)] if x)
+        else:
+            # counting takes a search of its own, not needed to show a few
+            count = None if limit is not None else scan_book.count(keywords)
+            batches = scan_book.find_batches(
+                keywords,
+                offset=offset if pushed else 0,
+                limit=limit if pushed else None,
+            )
+        progress.update(task, total=count, description="Fetching contacts")
+
+        executor = CheckExecutor(
+            selected, check_timeout=check_timeout, run_timeout=run_timeout
+        )
+        # contacts are written as they are checked, and only a plan keeps them
+        if plain is None:
+            plain = not (detail or console.is_terminal)
+        writer: Writer = RenderWriter(console, with_icon)
+        echo: Callable[[str], Any] = console.print
+        if detail and not plain:
+            writer = RenderWriter(console, partial(table, width=width))
+        elif json and not detail:
+            writer = JsonWriter(console, problems=check)
+        elif ndjson and not detail:
+            writer = NdjsonWriter(console, problems=check)
+        elif plain:
+            writer = PlainWriter(detail=detail)
+            echo = writer.line
+        planned = FixPlan()
+        # fetching, checking, fixing and writing overlap on their own threads
+        pipeline = Pipeline(batches)
+
+        def filter_stage(chunk: list[Contact]) -> Batch:
+            scanned = len(chunk)
+            chunk = search.matching(chunk)
+            if not search.problem_filters:
+                chunk = page.take(chunk)
+                # a pushed down window ends the search by itself, and is cached
+                if page.full and not pushed:
+                    pipeline.stop()
+            return Batch(scanned, chunk)
+
+        def details_stage(item: Batch) -> Batch:
+            if not item.contacts:
+                return item
+            contacts = address_book.get_many([x.id for x in item.contacts])
+            return item._replace(contacts=contacts)
+
+        def check_stage(item: Batch) -> Batch:
+            if fix or detail or streamed:
+                executor.run(item.contacts)
+            else:
+                executor.submit(item.contacts)
+            return item
+
+        def window_stage(item: Batch) -> Batch:
+            chunk = search.matching_problems(item.contacts)
+            if search.problem_filters:
+                chunk = page.take(chunk)
+                if page.full and not pushed:
+                    pipeline.stop()
+            if plan is not None:
+                planned.add_contacts(chunk)
+            return item._replace(contacts=chunk)
+
+        def fix_stage(item: Batch) -> Batch:
+            chunk = list(item.contacts)
+            fixes = FixPlan()
+            fixes.add_contacts(chunk)
+            changed: dict[str, set[str]] = {}
+            for mutation in fixes.mutations():
+                changed.setdefault(mutation.contact_id, set()).add(mutation.field)
+            with timing.timed("fix"):
+                calls = fixes.apply(address_book)
+            refetched = []
+            for i, person in enumerate(chunk):
+                if person.id in changed:
+                    chunk[i] = address_book.get(person.id)
+                    chunk[i].reuse_problems(person, changed[person.id])
+                    refetched.append(chunk[i])
+            executor.run(refetched)
+            return item._replace(
+                contacts=chunk,
+                refetched=refetched,
+                calls=calls,
+                proposed_calls=fixes.proposed_calls,
+                conflicts=len(fixes.conflicts()),
+            )
+
+        pipeline.add("filter", filter_stage)
+        if residual:
+            pipeline.add("details", details_stage, stage_workers["details"])
+        if check or not streamed:
+            pipeline.add("check", check_stage, stage_workers["check"])
+        pipeline.add("window", window_stage)
+        if fix:
+            pipeline.add("fix", fix_stage, stage_workers["fix"])
+
+        calls = proposed_calls = conflicts = 0
+        refetched: list[Contact] = []
+        written: set[str] = set()
+        held = HeldProblems(written)
+        with closing(pipeline.run()) as results:
+            for item in results:
+                progress.update(task, advance=item.scanned - len(item.contacts))
+                refetched += item.refetched
+                calls += item.calls
+                proposed_calls += item.proposed_calls
+                conflicts += item.conflicts
+
+                for person in item.contacts:
+                    with timing.timed("render"):
+                        writer.write(person)
+                    written.add(person.id)
+                    progress.update(task, advance=1)
+
+                if not (streamed or fix or detail):
+                    settled = held.settle(executor.settle())
+                    if check:
+                        print_problems(echo, settled)
+
+        # the completion index is rewritten once for all fixed contacts
+        if refetched:
+            complete.update(refetched)
+
+        if check and not (streamed or fix or detail):
+            progress.update(task, description="Waiting for network checks")
+            print_problems(echo, held.settle(executor.settle(wait=True)))
+        executor.shutdown()
+
+        if plan is not None:
+            exported = planned.export()
+            exported.dump(plan)
+            Console(stderr=True).print(
+                f"Wrote {len(exported.changes)} changes to '{plan}'."
+            )
+            conflicts = len(planned.conflicts())
+
+        if fix and proposed_calls:
+            Console(stderr=True).print(
+                f"Made {calls} backend calls instead of {proposed_calls}, "
+                f"saving {proposed_calls - calls}."
+            )
+
+        if conflicts:
+            Console(stderr=True).print(
+                f"Dropped {conflicts} fixes conflicting with earlier ones."
+            )
+
+        if cache_stats:
+            Console(stderr=True).print(
+                f"Query cache: {cache.hits} hits, {cache.misses} misses."
+            )
+
+        if pipeline_stats:
+            for stats in pipeline.stats:
+                Console(stderr=True).print(str(stats), highlight=False, soft_wrap=True)
+
+        if call_log is not None and backend_stats:
+            for called in call_log.stats.values():
+                Console(stderr=True).print(str(called), highlight=False, soft_wrap=True)
+                Console(stderr=True).print(
+                    f"  {called.histogram}", highlight=False, soft_wrap=True
+                )
+        if call_log is not None and trace is not None:
+            call_log.dump_trace(trace)
+
+        writer.close()
+
+        if profile:
+            Console(stderr=True, width=width).print(profile_table(timing.stop()))
+            if profile_dump is not None:
+                timing.dump(profile_dump)
+
+
+def indexed_search(
+    keywords: list[str], *, sounds_like: bool, threshold: float, top: int
+) -> list[str]:
+    """Return ids of contacts best matching keywords in the snapshot."""
+    from contacts.index import load_index
+
+    index = load_index(sounds_like)
+    if index is None:
+        raise typer.BadParameter(
+            "No snapshot to search, run 'contacts index' first.",
+            param_hint="--sounds-like" if sounds_like else "--fuzzy",
+        )
+    found = index.search(" ".join(keywords), limit=top, threshold=threshold)
+    return [x.contact_id for x in found]
+
+
+@app.command()
+def index(batch: int = 10) -> None:
+    """Snapshot names of all contacts for --fuzzy and --sounds-like searches."""
+    from rich.progress import Progress
+
+    from contacts.index import INDEXED_FIELDS, dump_snapshot
+
+    console = Console()
+    with Progress(transient=True, console=console) as progress:
+        task = progress.add_task("Counting contacts")
+        address_book = get_address_book(brief=False, batch=batch, fields=INDEXED_FIELDS)
+        progress.update(task, total=address_book.count([]))
+        contacts = []
+        for chunk in address_book.find_batches([]):
+            contacts.extend(chunk)
+            progress.update(task, advance=len(chunk))
+        count = dump_snapshot(contacts)
+        complete.update(contacts, replace=True)
+        console.print(f"Indexed {count} contacts.")
+
+
+@app.command()
+def apply(
+    plan: Annotated[
+        Path,
+        typer.Argument(
+            help="Plan file written with --plan",
+            exists=True,
+            dir_okay=False,
+            readable=True,
+        ),
+    ],
+    *,
+    batch: int = APPLY_BATCH_SIZE,
+    width: Optional[int] = None,
+) -> None:
+    """Apply a fix plan, resuming where an interrupted apply stopped."""
+    from rich.progress import Progress
+
+    from contacts.cache import CachedAddressBook
+    from contacts.plan import apply_plan
+
+    console = Console(width=width)
+    with Progress(transient=True, console=console) as progress:
+        task = progress.add_task("Applying changes")
+        address_book = CachedAddressBook(
+            get_address_book(brief=True, batch=1), query_cache(), fresh=True
+        )
+        try:
+            for done, total in apply_plan(plan, address_book, batch):
+                progress.update(task, completed=done, total=total)
+        except (OSError, ValueError) as e:
+            raise typer.BadParameter(str(e), param_hint="PLAN") from e
+        console.print(f"Applied {done} of {total} changes.")
+
+
+@app.command()
+def bench(
+    names: Annotated[
+        Optional[list[str]], typer.Argument(help="Benchmarks to run, all by default")
+    ] = None,
+    *,
+    size: Annotated[
+        Optional[list[int]], typer.Option(help="Address book sizes to run against")
+    ] = None,
+    output: Annotated[
+        Optional[Path], typer.Option(help="Write results as JSON to compare later")
+    ] = None,
+) -> None:
+    """Run benchmarks on synthetic address books."""
+    # benchmarks import this module, so they are imported when run only
+    from contacts.bench import main as run_benchmarks
+
+    run_benchmarks(names, size, output)
+
+
+@app.command()
+def serve(
+    *,
+    ttl: Annotated[
+        Optional[float],
+        typer.Option(
+            help="Seconds to reuse fetched contacts for, cache_ttl by default",
+            show_default=False,
+        ),
+    ] = None,
+    size: Annotated[
+        Optional[int],
+        typer.Option(
+            help="Number of query results to keep, cache_size by default",
+            show_default=False,
+        ),
+    ] = None,
+) -> None:
+    """Keep contacts and indexes warm for other runs, serving them on a socket."""
+    from contacts.daemon import Daemon
+
+    config = get_config()
+    try:
+        daemon = Daemon(
+            ttl=config.cache_ttl if ttl is None else ttl,
+            size=config.cache_size if size is None else size,
+        )
+    except RuntimeError as e:
+        Console(stderr=True).print(str(e))
+        raise typer.Exit(1) from e
+    with daemon:
+        Console(stderr=True).print(f"Serving on '{daemon.path}'.")
+        daemon.serve_forever()
+
+
+@app.command()
+def dupes(
+    keywords: Annotated[Optional[list[str]], typer.Argument()] = None,
+    *,
+    threshold: float = 0.7,
+    batch: Optional[int] = None,
+    width: Optional[int] = None,
+) -> None:
+    """Find contacts that are likely the same person."""
+    from rich.progress import Progress
+
+    from contacts import query
+    from contacts.cache import CachedAddressBook
+    from contacts.duplicates import DuplicateFinder
+
+    console = Console(width=width)
     with Progress(transient=True, console=console) as progress:
         task = progress.add_task("Counting contacts")
         keywords = query.prepare_keywords(keywords or [])
 
-        address_book = get_address_book(
-            brief=not (detail or json or check or fix),
-            batch=batch or (1 if keywords else 10),
+        address_book = CachedAddressBook(
+            get_address_book(brief=False, batch=batch or (1 if keywords else 10)),
+            query_cache(),
         )
         count = address_book.count(keywords)
-        progress.update(task, total=count, description="Fetching contacts")
+        progress.update(task, total=count, description="Comparing contacts")
 
-        people = contact.Contacts()
+        finder = DuplicateFinder(threshold)
         for person in address_book.find(keywords):
-            if fix:
-                for problem in person.problems:
-                    progress.update(task, description=f"Fixing {with_icon(person)}")
-                    problem.try_fix(address_book)
-                person = address_book.get(person.id)
-
-            if detail:
-                console.print(table(person, width))
-            elif not json:
-                console.print(f"{with_icon(person)}")
-
-            people.contacts.append(person)
-            progress.update(task, advance=1, description="Fetching contacts")
-
-        if json:
-            console.print_json(people.model_dump_json(exclude_defaults=True), indent=4)
+            finder.add(person)
+            progress.update(task, advance=1)
+
+        for cluster in finder.clusters():
+            names = ", ".join(name for _, name in cluster.contacts)
+            console.print(f"{Category.RELATED.icon} {cluster.score:.2f} {names}")
 
 
 if __name__ == "__main__":
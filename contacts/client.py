@@ -0,0 +1,96 @@
+"""Entry point that hands runs to 'contacts serve' when it is running.
+
+Only the standard library is imported here, so that runs served by the
+daemon do not pay for importing the rest of the app. Runs fall back to this
+process when there is no daemon to connect to, and runs that change contacts
+or stream their output are always run here.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Any, Optional
+
+# commands, and options of listings, that are always run in this process,
+# because they change contacts or write output as it comes
+IN_PROCESS = ["apply", "bench", "serve"]
+IN_PROCESS_OPTIONS = ["--fix", "--json", "--ndjson"]
+NO_DAEMON = "CONTACTS_NO_DAEMON"
+COMPLETE = "_CONTACTS_COMPLETE"
+
+
+def app_dir() -> Path:
+    """Return the app directory, as typer.get_app_dir returns it."""
+    if sys.platform == "darwin":
+        return Path(os.path.expanduser("~/Library/Application Support")) / "contacts"
+    config = os.environ.get("XDG_CONFIG_HOME", os.path.expanduser("~/.config"))
+    return Path(config) / "contacts"
+
+
+SOCKET_PATH = app_dir() / "serve.sock"
+
+
+def columns() -> Optional[int]:
+    """Return the width of the terminal, if writing to one."""
+    try:
+        return os.get_terminal_size(sys.stdout.fileno()).columns
+    except (OSError, ValueError):
+        return None
+
+
+def request(
+    args: list[str], *, path: Optional[Path] = None
+) -> Optional[dict[str, Any]]:
+    """Return the response of the daemon running args, if it is running."""
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(str(path or SOCKET_PATH))
+    except OSError:
+        connection.close()
+        return None
+    with connection:
+        message = {"args": args, "cwd": os.getcwd(), "columns": columns()}
+        connection.sendall(json.dumps(message).encode() + b"\n")
+        connection.shutdown(socket.SHUT_WR)
+        data = b"".join(iter(lambda: connection.recv(1 << 16), b""))
+    response: dict[str, Any] = json.loads(data)
+    return response
+
+
+def served(args: list[str]) -> bool:
+    """Return whether args may be run by the daemon.
+
+    Only runs that look contacts up are served, since served output is sent
+    back when the run ends, and stopping the client does not stop the run.
+    """
+    if os.environ.get(NO_DAEMON) or COMPLETE in os.environ:
+        return False
+    if args[:1] and args[0] in IN_PROCESS:
+        return False
+    options = args[: args.index("--")] if "--" in args else args
+    return not any(x in IN_PROCESS_OPTIONS for x in options)
+
+
+def main() -> None:
+    """Run the app in the daemon if it is running, or else in this process."""
+    args = sys.argv[1:]
+    if served(args):
+        response = request(args)
+        if response is not None:
+            sys.stdout.write(response["stdout"])
+            sys.stderr.write(response["stderr"])
+            sys.exit(response["exit"])
+
+    from contacts.cli import app
+
+    app()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Prefix index of contact names for shell completion.
+
+The index is a sorted text file of folded names and the names they complete
+to, searched in place with a binary search. Only what is needed for lookups is
+imported here, so that completions do not pay for the rest of the app.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable
+
+import typer
+
+from contacts.normalize import fold
+
+if TYPE_CHECKING:
+    from contacts.contact import Contact
+
+ENTRIES_PATH = Path(typer.get_app_dir("contacts")) / "completion.json"
+PREFIX_PATH = Path(typer.get_app_dir("contacts")) / "completion.txt"
+
+LIMIT = 50
+
+
+def completed_texts(contact: Contact) -> list[str]:
+    """Return the texts a contact is completed with."""
+    texts = [contact.name, contact.nickname, contact.organization]
+    return [x for x in texts if x]
+
+
+def update(contacts: Iterable[Contact], *, replace: bool = False) -> int:
+    """Update the entries of changed contacts and rewrite the index.
+
+    Without an index, nothing is updated unless it is replaced, and the index is
+    not rewritten when no entry changes.
+
+    :param replace: drop entries of all other contacts
+    :return: number of contacts in the index
+    """
+    entries: dict[str, list[str]] = {}
+    if not replace:
+        if not ENTRIES_PATH.is_file():
+            return 0
+        entries = json.loads(ENTRIES_PATH.read_text(encoding="utf-8"))
+    changed = replace
+    for contact in contacts:
+        texts = completed_texts(contact)
+        changed = changed or entries.get(contact.id) != texts
+        entries[contact.id] = texts
+    if not changed:
+        return len(entries)
+
+    lines = {
+        f"{key}\t{text}"
+        for texts in entries.values()
+        for text in texts
+        for key in prefix_keys(text)
+    }
+    ENTRIES_PATH.parent.mkdir(parents=True, exist_ok=True)
+    _write(ENTRIES_PATH, json.dumps(entries, ensure_ascii=False))
+    _write(PREFIX_PATH, "".join(f"{x}\n" for x in sorted(lines, key=str.encode)))
+    return len(entries)
+
+
+def prefix_keys(text: str) -> list[str]:
+    """Return folded keys a text is found with, one starting at each word."""
+    words = fold(text).replace("\t", " ").split()
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+def complete(prefix: str, limit: int = LIMIT) -> list[str]:
+    """Return texts with a word starting with a prefix, in key order."""
+    if not PREFIX_PATH.is_file():
+        return []
+    data = PREFIX_PATH.read_bytes()
+    key = " ".join(fold(prefix).split()).encode()
+    found: dict[str, None] = {}
+    start = _first_at_least(data, key)
+    while start < len(data) and len(found) < limit:
+        end = data.find(b"\n", start)
+        line = data[start:end]
+        if not line.startswith(key):
+            break
+        found[line.partition(b"\t")[2].decode()] = None
+        start = end + 1
+    return list(found)
+
+
+def _first_at_least(data: bytes, key: bytes) -> int:
+    """Return the offset of the first line not ordered before a key."""
+    low, high = 0, len(data)
+    while low < high:
+        middle = (low + high) // 2
+        start = data.rfind(b"\n", 0, middle) + 1
+        end = data.find(b"\n", start)
+        if data[start:end] < key:
+            low = end + 1
+        else:
+            high = start
+    return low
+
+
+def _write(path: Path, content: str) -> None:
+    """Replace a file at once, so that readers never see it half written."""
+    temporary = path.with_name(path.name + ".tmp")
+    temporary.write_text(content, encoding="utf-8")
+    os.replace(temporary, path)
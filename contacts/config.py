@@ -14,6 +14,9 @@ class Config(BaseModel, extra="allow"):
     """App configuration."""
 
     romanize: str = ""
+    # seconds to reuse query results for, and how many of them to keep
+    cache_ttl: float = 0.0
+    cache_size: int = 32
 
     def dump(self) -> None:
         """Write config to config file."""
@@ -4,14 +4,42 @@ from __future__ import annotations
 
 import json
 from copy import deepcopy
-from functools import cached_property
+from functools import cache, cached_property
 from pathlib import Path
-from typing import Optional
+from typing import AbstractSet, Optional, Sequence
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
+from contacts import timing
 from contacts.category import Category
-from contacts.problem import Problem
+from contacts.problem import Check, Problem
+
+
+@cache
+def check_order() -> dict[Check, int]:
+    """Return the position of each known check, to order their problems."""
+    from contacts.checks import Checks
+
+    return {x.value: i for i, x in enumerate(Checks)}
+
+
+@cache
+def check_names() -> dict[Check, str]:
+    """Return the name of each known check, as it is selected with --checks."""
+    from contacts.checks import Checks
+
+    return {x.value: x.name for x in Checks}
+
+
+def check_name(check: Check) -> str:
+    """Return the name a check is known and timed by."""
+    return check_names().get(check, type(check).__name__)
+
+
+@cache
+def field_keys(check: Check) -> frozenset[str]:
+    """Return the keys of the fields a check reads."""
+    return frozenset(x.value.key for x in check.fields)
 
 
 class ContactInfo(BaseModel):
@@ -79,6 +107,8 @@ class Contact(BaseModel):
     instant_messages: list[ContactInfo] = []
     note: Optional[str] = None
 
+    _results: dict[Check, list[Problem]] = PrivateAttr(default_factory=dict)
+
     def __post_init__(self) -> None:
         """Keep a copy of the originating data to keep track of changes."""
         self._source = deepcopy(self)
@@ -90,6 +120,8 @@ class Contact(BaseModel):
             return Category.ERROR
         if [x for x in self.problems if x.category == Category.WARNING]:
             return Category.WARNING
+        if [x for x in self.problems if x.category == Category.UNKNOWN]:
+            return Category.UNKNOWN
         if self.is_company:
             return Category.COMPANY
         return Category.PERSON
@@ -99,10 +131,69 @@ class Contact(BaseModel):
         """Return all problems for this contact."""
         from contacts.checks import Checks
 
-        problems = []
         for check in Checks:
-            problems.extend(check.value.check(self))
-        return problems
+            if check.value not in self._results:
+                self._results[check.value] = check.value.check(self)
+        return self._ordered_problems()
+
+    def record_problems(self, check: Check, problems: list[Problem]) -> None:
+        """Cache problems found by a check, keeping all problems in check order."""
+        self._results[check] = problems
+        self.__dict__["problems"] = self._ordered_problems()
+
+    def is_checked(self, check: Check) -> bool:
+        """Return whether problems of a check are cached on this contact."""
+        return check in self._results
+
+    def reuse_problems(self, previous: Contact, changed: AbstractSet[str]) -> None:
+        """Reuse problems cached on an earlier copy of this contact.
+
+        Only results of checks reading none of the changed fields are kept.
+
+        :param changed: keys of the fields changed since the earlier copy
+        """
+        self._results = {
+            check: problems
+            for check, problems in previous._results.items()
+            if changed.isdisjoint(field_keys(check))
+        }
+        self.__dict__.pop("problems", None)
+
+    def unchecked(self) -> Contact:
+        """Return a copy of this contact without the problems found on it."""
+        copy = self.model_copy()
+        copy._results = {}
+        copy.__dict__.pop("problems", None)
+        return copy
+
+    def _ordered_problems(self) -> list[Problem]:
+        order = check_order()
+        results = self._results
+        checks = sorted(results, key=lambda x: order.get(x, len(order)))
+        return [problem for check in checks for problem in results[check]]
+
+    @staticmethod
+    def check_all(
+        contacts: Sequence[Contact], checks: Optional[Sequence[Check]] = None
+    ) -> None:
+        """Find problems for a batch of contacts at once.
+
+        Results are cached on each contact as its problems, and checks already
+        cached on a contact are not run again.
+
+        :param checks: checks to run instead of all of them
+        """
+        from contacts.checks import Checks
+
+        results = [x._results for x in contacts]
+        for check in checks if checks is not None else [x.value for x in Checks]:
+            pending = [i for i, x in enumerate(results) if check not in x]
+            with timing.timed(check_name(check)):
+                found = check.check_many([contacts[i] for i in pending])
+            for i, problems in zip(pending, found):
+                results[i][check] = problems
+        for contact in contacts:
+            contact.__dict__["problems"] = contact._ordered_problems()
 
     @staticmethod
     def load(path: Path) -> Contact:
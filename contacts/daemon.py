@@ -0,0 +1,111 @@
+"""Daemon that runs the app for clients, from a process kept warm.
+
+Runs are served one at a time on a Unix socket that only the user can use,
+and clients send only runs that look contacts up, see client.served.
+Fetched contacts are kept in memory without their check results, and
+indexes of the snapshot are kept until the snapshot changes.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import socket
+import socketserver
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+
+import typer
+
+from contacts import cli, client, query
+from contacts.cache import MemoryQueryCache
+
+# Unix sockets are missing on some platforms, like Windows
+if TYPE_CHECKING or hasattr(socket, "AF_UNIX"):
+    _Server = socketserver.UnixStreamServer
+else:
+    _Server = socketserver.BaseServer
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Reads a run from a client and writes back its output."""
+
+    server: Daemon
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+        message = json.loads(line)
+        self.wfile.write(json.dumps(self.server.run(message)).encode())
+
+
+class Daemon(_Server):
+    """Server running the app for clients on a Unix socket."""
+
+    def __init__(self, *, ttl: float, size: int, path: Optional[Path] = None):
+        """Start listening.
+
+        :param ttl: seconds to reuse fetched contacts for
+        :param size: number of query results to keep
+        :param path: socket to listen on instead of the one clients look for
+        """
+        if not hasattr(socket, "AF_UNIX"):
+            raise RuntimeError("Serving is not supported on this platform.")
+        self.path = path or client.SOCKET_PATH
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            if probe.connect_ex(str(self.path)) == 0:
+                raise RuntimeError(f"Already serving on '{self.path}'.")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.unlink(missing_ok=True)
+        umask = os.umask(0o177)
+        try:
+            super().__init__(str(self.path), _Handler)
+        finally:
+            os.umask(umask)
+        self.cache = MemoryQueryCache(ttl=ttl, size=size)
+        cli.shared_cache = self.cache
+
+    def server_close(self) -> None:
+        """Stop listening."""
+        super().server_close()
+        cli.shared_cache = None
+        self.path.unlink(missing_ok=True)
+
+    def run(self, message: dict[str, Any]) -> dict[str, Any]:
+        """Run the app with the args, directory and width of a client."""
+        # configuration may have changed since the last run
+        query.romanization.cache_clear()
+        query.variant_letters.cache_clear()
+        query.needles.cache_clear()
+        stdout, stderr = io.StringIO(), io.StringIO()
+        cwd = os.getcwd()
+        environ = dict(os.environ)
+        try:
+            os.chdir(message["cwd"])
+            os.environ.pop("COLUMNS", None)
+            if message.get("columns"):
+                os.environ["COLUMNS"] = str(message["columns"])
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                code = _invoke(cli.route(message["args"]))
+        finally:
+            os.chdir(cwd)
+            os.environ.clear()
+            os.environ.update(environ)
+        return {"stdout": stdout.getvalue(), "stderr": stderr.getvalue(), "exit": code}
+
+
+def _invoke(args: list[str]) -> int:
+    """Run the app with args and return its exit code."""
+    command = typer.main.get_command(cli.app)
+    try:
+        command.main(args, prog_name="contacts", standalone_mode=True)
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else int(e.code is not None)
+    except Exception:
+        traceback.print_exc()
+        return 1
+    return 0
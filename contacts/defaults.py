@@ -0,0 +1,19 @@
+"""Defaults of command options.
+
+Kept apart from the modules using them, so that the CLI can show them without
+importing those modules.
+"""
+
+# seconds a network check may take for a batch, and all of them in total
+CHECK_TIMEOUT = 5.0
+RUN_TIMEOUT = 60.0
+
+# minimum score and number of --fuzzy and --sounds-like matches
+DEFAULT_THRESHOLD = 0.2
+DEFAULT_LIMIT = 10
+
+# seconds after which backend calls are logged as slow
+SLOW_CALL = 1.0
+
+# changes of a plan applied at a time
+APPLY_BATCH_SIZE = 100
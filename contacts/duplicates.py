@@ -0,0 +1,190 @@
+"""Duplicate people detection across the address book."""
+
+from __future__ import annotations
+
+import random
+import zlib
+from typing import Iterable, NamedTuple, Optional
+
+from contacts import normalize
+from contacts.contact import Contact
+
+SHINGLE_SIZE = 3
+PERMUTATIONS = 32
+BANDS = 8
+PRIME = (1 << 61) - 1
+MAX_BLOCK = 64
+
+_rand = random.Random(0)  # nosec B311
+HASHES = [
+    (_rand.randrange(1, PRIME), _rand.randrange(0, PRIME)) for _ in range(PERMUTATIONS)
+]
+
+
+def shingles(tokens: Iterable[str]) -> frozenset[str]:
+    """Return character shingles of name tokens, regardless of their order."""
+    result: set[str] = set()
+    for token in tokens:
+        padded = f" {token} "
+        result.update(
+            padded[i : i + SHINGLE_SIZE]
+            for i in range(max(len(padded) - SHINGLE_SIZE + 1, 1))
+        )
+    return frozenset(result)
+
+
+def minhash(values: frozenset[str]) -> tuple[int, ...]:
+    """Return the MinHash signature of a set of strings."""
+    hashes = [zlib.crc32(x.encode("utf-8")) for x in values] or [0]
+    return tuple(min((a * h + b) % PRIME for h in hashes) for a, b in HASHES)
+
+
+def jaccard(a: frozenset[str], b: frozenset[str]) -> float:
+    """Return Jaccard similarity of two sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class Signature(NamedTuple):
+    """Compact comparable summary of a contact."""
+
+    id: str  # noqa: A003
+    name: str
+    is_company: bool
+    tokens: tuple[str, ...]
+    shingles: frozenset[str]
+    phones: frozenset[str]
+    emails: frozenset[str]
+    organization: Optional[str]
+
+    @staticmethod
+    def of(contact: Contact) -> Signature:
+        """Summarize a contact for comparison."""
+        parts = [contact.first_name, contact.middle_name, contact.last_name]
+        full_name = " ".join(x for x in parts if x) or contact.name
+        if contact.is_company:
+            full_name = contact.organization or contact.name
+        tokens = tuple(sorted(normalize.text(full_name).split()))
+        return Signature(
+            id=contact.id,
+            name=contact.name,
+            is_company=contact.is_company,
+            tokens=tokens,
+            shingles=shingles(tokens),
+            phones=frozenset(normalize.phone(x.value) for x in contact.phones),
+            emails=frozenset(normalize.email(x.value) for x in contact.emails),
+            organization=(
+                normalize.text(contact.organization) if contact.organization else None
+            ),
+        )
+
+    def blocking_keys(self) -> list[str]:
+        """Return keys of blocks that hold candidates for this contact."""
+        keys = [f"name:{' '.join(self.tokens)}"]
+        keys.extend(f"phone:{x}" for x in self.phones)
+        keys.extend(f"email:{x}" for x in self.emails)
+        if self.organization:
+            keys.append(f"org:{self.organization}")
+        signature = minhash(self.shingles)
+        rows = PERMUTATIONS // BANDS
+        keys.extend(
+            f"lsh:{band}:{hash(signature[band * rows : (band + 1) * rows])}"
+            for band in range(BANDS)
+        )
+        return keys
+
+    def similarity(self, other: Signature) -> float:
+        """Return how likely two contacts are the same person, between 0 and 1."""
+        if self.is_company != other.is_company:
+            return 0.0
+        score = jaccard(self.shingles, other.shingles)
+        if self.phones & other.phones or self.emails & other.emails:
+            score = (score + 1) / 2
+        if self.organization and self.organization == other.organization:
+            return min(score + 0.1, 1.0)
+        return score
+
+
+class DuplicateCluster(NamedTuple):
+    """A group of contacts that are likely the same person."""
+
+    score: float
+    contacts: list[tuple[str, str]]
+
+
+class DuplicateFinder:
+    """Streaming duplicate finder comparing only contacts that share a block."""
+
+    def __init__(self, threshold: float = 0.7, max_block: int = MAX_BLOCK):
+        """Initialize finder.
+
+        :param threshold: minimum similarity for two contacts to be duplicates
+        :param max_block: block size after which a key is considered too common
+        """
+        self.threshold = threshold
+        self.max_block = max_block
+        self.pairs = 0
+        self._signatures: list[Signature] = []
+        self._blocks: dict[str, list[int]] = {}
+        self._parents: dict[int, int] = {}
+        self._scores: dict[int, float] = {}
+
+    def add(self, contact: Contact) -> None:
+        """Compare a contact against the candidates seen so far."""
+        signature = Signature.of(contact)
+        index = len(self._signatures)
+        self._signatures.append(signature)
+
+        candidates: set[int] = set()
+        for key in signature.blocking_keys():
+            block = self._blocks.setdefault(key, [])
+            if len(block) < self.max_block:
+                candidates.update(block)
+                block.append(index)
+
+        for candidate in candidates:
+            self.pairs += 1
+            score = signature.similarity(self._signatures[candidate])
+            if score >= self.threshold:
+                self._union(candidate, index, score)
+
+    def clusters(self) -> list[DuplicateCluster]:
+        """Return duplicate clusters, most likely ones first."""
+        groups: dict[int, list[int]] = {}
+        for index in self._parents:
+            groups.setdefault(self._find(index), []).append(index)
+        clusters = [
+            DuplicateCluster(
+                score=self._scores[root],
+                contacts=[
+                    (self._signatures[x].id, self._signatures[x].name)
+                    for x in sorted(members)
+                ],
+            )
+            for root, members in groups.items()
+        ]
+        return sorted(clusters, key=lambda x: (-x.score, -len(x.contacts)))
+
+    def _find(self, index: int) -> int:
+        parent = self._parents.setdefault(index, index)
+        while parent != self._parents[parent]:
+            self._parents[parent] = self._parents[self._parents[parent]]
+            parent = self._parents[parent]
+        return parent
+
+    def _union(self, a: int, b: int, score: float) -> None:
+        root_a, root_b = self._find(a), self._find(b)
+        best = max(score, self._scores.get(root_a, 0.0), self._scores.get(root_b, 0.0))
+        self._parents[root_b] = root_a
+        self._scores[root_a] = best
+
+
+def find_duplicates(
+    contacts: Iterable[Contact], threshold: float = 0.7
+) -> list[DuplicateCluster]:
+    """Return clusters of contacts that are likely the same person."""
+    finder = DuplicateFinder(threshold)
+    for contact in contacts:
+        finder.add(contact)
+    return finder.clusters()
@@ -0,0 +1,237 @@
+"""Background execution of checks."""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Executor, Future
+from concurrent.futures import wait as wait_done
+from functools import cached_property
+from typing import Any, Callable, Optional, Sequence, TypeVar
+
+from contacts import timing
+from contacts.contact import Contact, check_name
+from contacts.defaults import CHECK_TIMEOUT, RUN_TIMEOUT
+from contacts.problem import Check, Problem
+
+T = TypeVar("T")
+
+WORKERS = 4
+
+
+class DaemonExecutor(Executor):
+    """Thread pool whose threads never delay interpreter exit.
+
+    Network calls such as DNS lookups cannot be interrupted, so threads that
+    are stuck on them are abandoned instead of joined.
+    """
+
+    def __init__(self, max_workers: int):
+        """Initialize pool with a maximum thread count."""
+        self._max_workers = max_workers
+        self._tasks: queue.SimpleQueue[Optional[tuple[Future[Any], Any]]] = (
+            queue.SimpleQueue()
+        )
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> Future[T]:
+        """Schedule a call on a daemon thread."""
+        future: Future[T] = Future()
+        self._tasks.put((future, (fn, args, kwargs)))
+        with self._lock:
+            if len(self._threads) < self._max_workers:
+                thread = threading.Thread(
+                    target=timing.threaded(self._work), daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """Stop threads once they are done with their tasks."""
+        if cancel_futures:
+            while not self._tasks.empty():
+                task = self._tasks.get_nowait()
+                if task:
+                    task[0].cancel()
+        for _ in self._threads:
+            self._tasks.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _work(self) -> None:
+        while task := self._tasks.get():
+            future, (fn, args, kwargs) = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:  # noqa: B036
+                future.set_exception(e)
+
+
+class _Task:
+    """Network check running against a batch of contacts."""
+
+    def __init__(self, check: Check, contacts: Sequence[Contact]):
+        self.check = check
+        self.contacts = contacts
+        self.started: Optional[float] = None
+
+    def __call__(self) -> list[list[Problem]]:
+        self.started = time.monotonic()
+        with timing.timed(check_name(self.check)):
+            return self.check.check_many(self.contacts)
+
+
+class CheckExecutor:
+    """Runs offline checks right away and network checks in background.
+
+    Network checks are bounded by a deadline for each check run and a deadline
+    for the whole run. Checks that miss their deadline report unknown problems.
+    Contacts may be checked from multiple threads, each with contacts of its own.
+    """
+
+    def __init__(
+        self,
+        checks: Optional[Sequence[Check]] = None,
+        *,
+        check_timeout: float = CHECK_TIMEOUT,
+        run_timeout: float = RUN_TIMEOUT,
+        workers: int = WORKERS,
+    ):
+        """Initialize executor.
+
+        :param checks: checks to run instead of all of them
+        :param check_timeout: seconds a network check may take for a batch
+        :param run_timeout: seconds all network checks may take in total
+        """
+        self._checks = checks
+        self.check_timeout = check_timeout
+        self._deadline = time.monotonic() + run_timeout
+        self._executor = DaemonExecutor(workers)
+        self._pending: list[tuple[_Task, Future[list[list[Problem]]]]] = []
+        self._lock = threading.Lock()
+
+    @cached_property
+    def offline(self) -> list[Check]:
+        """Return the checks run in the calling thread."""
+        return [x for x in self.checks if not x.network]
+
+    @cached_property
+    def network(self) -> list[Check]:
+        """Return the checks run in the background."""
+        return [x for x in self.checks if x.network]
+
+    @cached_property
+    def checks(self) -> Sequence[Check]:
+        """Return the checks to run, imported only once contacts are checked."""
+        if self._checks is not None:
+            return self._checks
+        from contacts.checks import Checks
+
+        return [x.value for x in Checks]
+
+    def submit(self, contacts: Sequence[Contact]) -> None:
+        """Check contacts offline now and queue their network checks."""
+        started = self._start(contacts)
+        with self._lock:
+            self._pending += started
+
+    def run(self, contacts: Sequence[Contact]) -> None:
+        """Check contacts, waiting for their network checks only."""
+        for task, future in self._start(contacts):
+            found = self._result(task, future, wait=True)
+            if found is not None:
+                self._record(task, found)
+
+    def settle(self, wait: bool = False) -> list[tuple[Contact, list[Problem]]]:
+        """Collect finished network checks and return their problems by contact.
+
+        :param wait: block until all pending checks finish or time out
+        """
+        with self._lock:
+            started, self._pending = self._pending, []
+        settled: list[tuple[Contact, list[Problem]]] = []
+        pending = []
+        for task, future in started:
+            found = self._result(task, future, wait)
+            if found is None:
+                pending.append((task, future))
+                continue
+            settled += self._record(task, found)
+        with self._lock:
+            self._pending[:0] = pending
+        return settled
+
+    def shutdown(self) -> None:
+        """Abandon pending network checks."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _start(
+        self, contacts: Sequence[Contact]
+    ) -> list[tuple[_Task, Future[list[list[Problem]]]]]:
+        Contact.check_all(contacts, self.offline)
+        started = []
+        for check in self.network:
+            pending = [x for x in contacts if not x.is_checked(check)]
+            if not pending:
+                continue
+            task = _Task(check, pending)
+            started.append((task, self._executor.submit(task)))
+        return started
+
+    @staticmethod
+    def _record(
+        task: _Task, found: list[list[Problem]]
+    ) -> list[tuple[Contact, list[Problem]]]:
+        settled = []
+        for contact, problems in zip(task.contacts, found):
+            contact.record_problems(task.check, problems)
+            if problems:
+                settled.append((contact, problems))
+        return settled
+
+    def _result(
+        self, task: _Task, future: Future[list[list[Problem]]], wait: bool
+    ) -> Optional[list[list[Problem]]]:
+        while True:
+            now = time.monotonic()
+            deadline = self._deadline
+            if task.started is not None:
+                deadline = min(deadline, task.started + self.check_timeout)
+            if future.done():
+                return self._outcome(task, future)
+            if now >= deadline:
+                future.cancel()
+                return [self._unknown(task.check, x) for x in task.contacts]
+            if not wait:
+                return None
+            # wake up when the task starts to pick up its own deadline
+            wait_done([future], timeout=min(deadline - now, 0.1))
+
+    def _outcome(
+        self, task: _Task, future: Future[list[list[Problem]]]
+    ) -> list[list[Problem]]:
+        """Return problems of a finished task, unknown ones if it failed."""
+        try:
+            return future.result()
+        except Exception as e:
+            reason = f"({e or type(e).__name__})"
+            return [self._unknown(task.check, x, reason) for x in task.contacts]
+
+    @staticmethod
+    def _unknown(
+        check: Check, contact: Contact, reason: str = "in time"
+    ) -> list[Problem]:
+        fields = [x.value for x in check.fields if x.value.get(contact)]
+        return [
+            Problem(
+                f"{getattr(x, 'plural', x.singular)} could not be checked {reason}.",
+                unknown=True,
+            )
+            for x in fields
+        ]
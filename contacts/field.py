@@ -11,6 +11,7 @@ from contacts.contact import Contact, ContactInfo
 class ContactFieldMetadata(NamedTuple):
     """Types for simple field metadata."""
 
+    key: str
     singular: str
     category: Category
     get: Callable[[Contact], Optional[str]]
@@ -21,18 +22,21 @@ class ContactFieldMetadata(NamedTuple):
 class ContactInfoMetadata(NamedTuple):
     """Types for simple field metadata."""
 
+    key: str
     singular: str
     plural: str
     category: Category
     get: Callable[[Contact], Sequence[ContactInfo]]
     update: AddressBook.UpdateInfoLabelFunction
     delete: AddressBook.DeleteInfoFunction
+    delete_many: AddressBook.DeleteInfosFunction
 
 
 class ContactFields(Enum):
     """Field metadatas."""
 
     PREFIX = ContactFieldMetadata(
+        "prefix",
         "Prefix",
         Category.NAME,
         lambda contact: contact.prefix,
@@ -40,6 +44,7 @@ class ContactFields(Enum):
         AddressBook.delete_prefix,
     )
     FIRST_NAME = ContactFieldMetadata(
+        "first_name",
         "First name",
         Category.NAME,
         lambda contact: contact.first_name,
@@ -47,6 +52,7 @@ class ContactFields(Enum):
         AddressBook.delete_first_name,
     )
     PHONETIC_FIRST_NAME = ContactFieldMetadata(
+        "phonetic_first_name",
         "Phonetic first name",
         Category.NAME,
         lambda contact: contact.phonetic_first_name,
@@ -54,6 +60,7 @@ class ContactFields(Enum):
         AddressBook.delete_phonetic_first_name,
     )
     MIDDLE_NAME = ContactFieldMetadata(
+        "middle_name",
         "Middle name",
         Category.NAME,
         lambda contact: contact.middle_name,
@@ -61,6 +68,7 @@ class ContactFields(Enum):
         AddressBook.delete_middle_name,
     )
     PHONETIC_MIDDLE_NAME = ContactFieldMetadata(
+        "phonetic_middle_name",
         "Phonetic middle name",
         Category.NAME,
         lambda contact: contact.phonetic_middle_name,
@@ -68,6 +76,7 @@ class ContactFields(Enum):
         AddressBook.delete_phonetic_middle_name,
     )
     LAST_NAME = ContactFieldMetadata(
+        "last_name",
         "Last name",
         Category.NAME,
         lambda contact: contact.last_name,
@@ -75,6 +84,7 @@ class ContactFields(Enum):
         AddressBook.delete_last_name,
     )
     PHONETIC_LAST_NAME = ContactFieldMetadata(
+        "phonetic_last_name",
         "Phonetic last name",
         Category.NAME,
         lambda contact: contact.phonetic_last_name,
@@ -82,6 +92,7 @@ class ContactFields(Enum):
         AddressBook.delete_phonetic_last_name,
     )
     MAIDEN_NAME = ContactFieldMetadata(
+        "maiden_name",
         "Maiden name",
         Category.NAME,
         lambda contact: contact.maiden_name,
@@ -89,6 +100,7 @@ class ContactFields(Enum):
         AddressBook.delete_maiden_name,
     )
     SUFFIX = ContactFieldMetadata(
+        "suffix",
         "Suffix",
         Category.NAME,
         lambda contact: contact.suffix,
@@ -96,6 +108,7 @@ class ContactFields(Enum):
         AddressBook.delete_suffix,
     )
     NICKNAME = ContactFieldMetadata(
+        "nickname",
         "Nickname",
         Category.NAME,
         lambda contact: contact.nickname,
@@ -103,6 +116,7 @@ class ContactFields(Enum):
         AddressBook.delete_nickname,
     )
     JOB_TITLE = ContactFieldMetadata(
+        "job_title",
         "Job title",
         Category.WORK,
         lambda contact: contact.job_title,
@@ -110,6 +124,7 @@ class ContactFields(Enum):
         AddressBook.delete_job_title,
     )
     DEPARTMENT = ContactFieldMetadata(
+        "department",
         "Department",
         Category.WORK,
         lambda contact: contact.department,
@@ -117,6 +132,7 @@ class ContactFields(Enum):
         AddressBook.delete_department,
     )
     ORGANIZATION = ContactFieldMetadata(
+        "organization",
         "Organization",
         Category.WORK,
         lambda contact: contact.organization,
@@ -124,22 +140,27 @@ class ContactFields(Enum):
         AddressBook.delete_organization,
     )
     PHONE = ContactInfoMetadata(
+        "phones",
         "Phone",
         "Phones",
         Category.PHONE,
         lambda contact: contact.phones,
         AddressBook.update_phone,
         AddressBook.delete_phone,
+        AddressBook.delete_phones,
     )
     EMAIL = ContactInfoMetadata(
+        "emails",
         "E-mail",
         "E-mails",
         Category.EMAIL,
         lambda contact: contact.emails,
         AddressBook.update_email,
         AddressBook.delete_email,
+        AddressBook.delete_emails,
     )
     HOME_PAGE = ContactFieldMetadata(
+        "home_page",
         "Home page",
         Category.URL,
         lambda contact: contact.home_page,
@@ -147,22 +168,27 @@ class ContactFields(Enum):
         AddressBook.delete_home_page,
     )
     URL = ContactInfoMetadata(
+        "urls",
         "URL",
         "URLs",
         Category.URL,
         lambda contact: contact.urls,
         AddressBook.update_url,
         AddressBook.delete_url,
+        AddressBook.delete_urls,
     )
     ADDRESS = ContactInfoMetadata(
+        "addresses",
         "Address",
         "Addresses",
         Category.ADDRESS,
         lambda contact: contact.addresses,
         AddressBook.update_address,
         AddressBook.delete_address,
+        AddressBook.delete_addresses,
     )
     BIRTH_DATE = ContactFieldMetadata(
+        "birth_date",
         "Birth date",
         Category.DATE,
         lambda contact: contact.birth_date,
@@ -170,38 +196,47 @@ class ContactFields(Enum):
         AddressBook.delete_birth_date,
     )
     CUSTOM_DATE = ContactInfoMetadata(
+        "custom_dates",
         "Custom date",
         "Custom dates",
         Category.DATE,
         lambda contact: contact.custom_dates,
         AddressBook.update_custom_date,
         AddressBook.delete_custom_date,
+        AddressBook.delete_custom_dates,
     )
     RELATED_NAME = ContactInfoMetadata(
+        "related_names",
         "Related name",
         "Related names",
         Category.RELATED,
         lambda contact: contact.related_names,
         AddressBook.update_related_name,
         AddressBook.delete_related_name,
+        AddressBook.delete_related_names,
     )
     SOCIAL_PROFILE = ContactInfoMetadata(
+        "social_profiles",
         "Social profile",
         "Social profiles",
         Category.URL,
         lambda contact: contact.social_profiles,
         AddressBook.update_social_profile,
         AddressBook.delete_social_profile,
+        AddressBook.delete_social_profiles,
     )
     INSTANT_MESSAGE = ContactInfoMetadata(
+        "instant_messages",
         "Instant message",
         "Instant messages",
         Category.MESSAGING,
         lambda contact: contact.instant_messages,
         AddressBook.update_instant_message,
         AddressBook.delete_instant_message,
+        AddressBook.delete_instant_messages,
     )
     NOTE = ContactFieldMetadata(
+        "note",
         "Note",
         Category.NOTE,
         lambda contact: contact.note,
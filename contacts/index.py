@@ -0,0 +1,254 @@
+"""Local search indexes built from a snapshot of the address book."""
+
+from __future__ import annotations
+
+import heapq
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional, Union
+
+import typer
+
+from contacts import normalize, phonetic
+from contacts.contact import Contact, Contacts
+from contacts.defaults import DEFAULT_LIMIT, DEFAULT_THRESHOLD
+
+SNAPSHOT_PATH = Path(typer.get_app_dir("contacts")) / "snapshot.json"
+
+# fields searched in addition to the contact name
+INDEXED_FIELDS = frozenset(
+    [
+        "nickname",
+        "organization",
+        "job_title",
+        "phonetic_first_name",
+        "phonetic_middle_name",
+        "phonetic_last_name",
+    ]
+)
+
+
+def dump_snapshot(contacts: Iterable[Contact]) -> int:
+    """Write indexed fields of contacts to the snapshot file.
+
+    :return: number of contacts written
+    """
+    snapshot = Contacts(
+        contacts=[
+            Contact(
+                **x.model_dump(include={"id", "name", "is_company", *INDEXED_FIELDS})
+            )
+            for x in contacts
+        ]
+    )
+    SNAPSHOT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    SNAPSHOT_PATH.write_text(
+        snapshot.model_dump_json(exclude_defaults=True), encoding="utf-8"
+    )
+    return len(snapshot.contacts)
+
+
+def load_snapshot() -> Optional[list[Contact]]:
+    """Read contacts from the snapshot file, if there is one."""
+    if not SNAPSHOT_PATH.is_file():
+        return None
+    return Contacts.model_validate_json(
+        SNAPSHOT_PATH.read_text(encoding="utf-8")
+    ).contacts
+
+
+def indexed_texts(contact: Contact) -> list[str]:
+    """Return the texts of a contact searched for typos."""
+    texts = [contact.name, contact.nickname, contact.organization, contact.job_title]
+    return [x for x in texts if x]
+
+
+def name_texts(contact: Contact) -> list[str]:
+    """Return the names of a contact, including how they are pronounced."""
+    texts = [
+        contact.name,
+        contact.nickname,
+        contact.phonetic_first_name,
+        contact.phonetic_middle_name,
+        contact.phonetic_last_name,
+    ]
+    return [x for x in texts if x]
+
+
+def split(text: str) -> list[str]:
+    """Split text into folded words."""
+    return normalize.address(text).split()
+
+
+def trigrams(word: str) -> frozenset[str]:
+    """Return trigrams of a word, padded to weigh its start more."""
+    padded = f"  {word} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+class Match(NamedTuple):
+    """A contact found by a search, with how well it matched."""
+
+    score: float
+    contact_id: str
+    name: str
+
+
+def top(
+    scores: dict[int, float],
+    contacts: list[tuple[str, str]],
+    limit: int,
+    threshold: float,
+) -> list[Match]:
+    """Return best scoring contacts, best and then first added first."""
+    found = heapq.nlargest(
+        limit,
+        ((x, i) for i, x in scores.items() if x >= threshold),
+        key=lambda x: (x[0], -x[1]),
+    )
+    return [Match(score, *contacts[i]) for score, i in found]
+
+
+class TrigramIndex:
+    """Typo tolerant word index over contact names and organizations.
+
+    Each query word is scored against indexed words with the Jaccard similarity
+    of their trigrams, and a contact scores the average of the best score of
+    each query word in it.
+    """
+
+    def __init__(self, contacts: Iterable[Contact] = ()):
+        """Initialize index with contacts."""
+        self.contacts: list[tuple[str, str]] = []
+        self._words: dict[str, int] = {}
+        self._sizes: list[int] = []
+        self._owners: list[list[int]] = []
+        self._postings: dict[str, list[int]] = {}
+        for contact in contacts:
+            self.add(contact)
+
+    def add(self, contact: Contact) -> None:
+        """Add a contact to the index."""
+        owner = len(self.contacts)
+        self.contacts.append((contact.id, contact.name))
+        words = {x for text in indexed_texts(contact) for x in split(text)}
+        for word in words:
+            self._owners[self._word(word)].append(owner)
+
+    def search(
+        self,
+        text: str,
+        *,
+        limit: int = DEFAULT_LIMIT,
+        threshold: float = DEFAULT_THRESHOLD,
+    ) -> list[Match]:
+        """Return best matching contacts, best first.
+
+        :param limit: maximum number of contacts to return
+        :param threshold: minimum score of returned contacts, from 0 to 1
+        """
+        words = split(text)
+        if not words:
+            return []
+        scores: dict[int, float] = {}
+        for word in words:
+            best: dict[int, float] = {}
+            for word_id, similarity in self._similar(word, threshold).items():
+                for owner in self._owners[word_id]:
+                    if best.get(owner, 0.0) < similarity:
+                        best[owner] = similarity
+            for owner, similarity in best.items():
+                scores[owner] = scores.get(owner, 0.0) + similarity / len(words)
+        return top(scores, self.contacts, limit, threshold)
+
+    def _similar(self, word: str, threshold: float) -> dict[int, float]:
+        grams = trigrams(word)
+        shared: dict[int, int] = {}
+        for gram in grams:
+            for word_id in self._postings.get(gram, []):
+                shared[word_id] = shared.get(word_id, 0) + 1
+        similar = {
+            x: count / (len(grams) + self._sizes[x] - count)
+            for x, count in shared.items()
+        }
+        return {x: y for x, y in similar.items() if y >= threshold}
+
+    def _word(self, word: str) -> int:
+        word_id = self._words.get(word)
+        if word_id is None:
+            word_id = self._words[word] = len(self._sizes)
+            grams = trigrams(word)
+            self._sizes.append(len(grams))
+            self._owners.append([])
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(word_id)
+        return word_id
+
+
+class PhoneticIndex:
+    """Index of contacts by how the words in their names sound.
+
+    Every phonetic key maps to the contacts with a name word having that key,
+    so looking up a word takes a dictionary access per key. A contact scores
+    the ratio of query words that sound like one of its names.
+    """
+
+    def __init__(self, contacts: Iterable[Contact] = ()):
+        """Initialize index with contacts."""
+        self.contacts: list[tuple[str, str]] = []
+        self._keys: dict[str, list[int]] = {}
+        for contact in contacts:
+            self.add(contact)
+
+    def add(self, contact: Contact) -> None:
+        """Add a contact to the index."""
+        owner = len(self.contacts)
+        self.contacts.append((contact.id, contact.name))
+        words = {x for text in name_texts(contact) for x in split(text)}
+        for key in {x for word in words for x in phonetic.keys(word)}:
+            self._keys.setdefault(key, []).append(owner)
+
+    def search(
+        self,
+        text: str,
+        *,
+        limit: int = DEFAULT_LIMIT,
+        threshold: float = DEFAULT_THRESHOLD,
+    ) -> list[Match]:
+        """Return contacts with names sounding like the text, best first.
+
+        :param limit: maximum number of contacts to return
+        :param threshold: minimum ratio of words to match, from 0 to 1
+        """
+        words = split(text)
+        scores: dict[int, float] = {}
+        for word in words:
+            owners = {y for x in phonetic.keys(word) for y in self._keys.get(x, [])}
+            for owner in owners:
+                scores[owner] = scores.get(owner, 0.0) + 1 / len(words)
+        return top(scores, self.contacts, limit, threshold)
+
+
+# indexes of the snapshot by kind, with the snapshot path and modification time
+_indexes: dict[bool, tuple[Path, int, Union[TrigramIndex, PhoneticIndex]]] = {}
+
+
+def load_index(
+    sounds_like: bool = False,
+) -> Optional[Union[TrigramIndex, PhoneticIndex]]:
+    """Return an index of the snapshot, reused until the snapshot changes.
+
+    :param sounds_like: index names by how they sound instead of by trigrams
+    """
+    try:
+        modified = SNAPSHOT_PATH.stat().st_mtime_ns
+    except OSError:
+        return None
+    loaded = _indexes.get(sounds_like)
+    if loaded is not None and loaded[:2] == (SNAPSHOT_PATH, modified):
+        return loaded[2]
+    snapshot = load_snapshot()
+    if snapshot is None:
+        return None
+    index = PhoneticIndex(snapshot) if sounds_like else TrigramIndex(snapshot)
+    _indexes[sounds_like] = (SNAPSHOT_PATH, modified, index)
+    return index
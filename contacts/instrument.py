@@ -0,0 +1,273 @@
+"""Address book that records the calls made to another, to see where time goes.
+
+Calls are counted and timed by method, with latency histograms, and may be
+kept as a trace of events to view with chrome://tracing or Perfetto. Each
+batch of a search is recorded as a call of its own.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Callable, Generator, Iterator, Optional, TypeVar
+
+from contacts.address_book import AddressBook
+from contacts.contact import Contact
+from contacts.defaults import SLOW_CALL
+
+T = TypeVar("T")
+
+# latency bucket upper bounds, doubling from a millisecond to about a minute
+BUCKETS = [0.001 * 2.0**x for x in range(17)]
+
+
+class Histogram:
+    """Counts of latencies in buckets of doubling width."""
+
+    def __init__(self) -> None:
+        """Initialize empty histogram."""
+        self.counts = [0] * (len(BUCKETS) + 1)
+
+    def add(self, seconds: float) -> None:
+        """Count a latency."""
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """Return the upper bound of the bucket of a percentile, in seconds."""
+        rank = fraction * sum(self.counts)
+        seen = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            seen += count
+            if count and seen >= rank:
+                return bound
+        return float("inf")
+
+    def __str__(self) -> str:
+        """Return the non-empty buckets with their upper bounds in milliseconds."""
+        bounds = [f"{x * 1000:g}ms" for x in BUCKETS] + ["inf"]
+        return " ".join(
+            f"<={bound}:{count}" for bound, count in zip(bounds, self.counts) if count
+        )
+
+
+class MethodStats:
+    """Calls made to an address book method."""
+
+    def __init__(self, method: str):
+        """Initialize with no calls."""
+        self.method = method
+        self.calls = 0
+        self.seconds = 0.0
+        self.contacts = 0
+        self.bytes_read = 0
+        self.histogram = Histogram()
+
+    def __str__(self) -> str:
+        """Return a summary line."""
+        return (
+            f"{self.method}: {self.calls} calls in {self.seconds:.2f}s, "
+            f"{self.contacts} contacts, {self.bytes_read} bytes, "
+            f"p50 <={self.histogram.percentile(0.5) * 1000:g}ms "
+            f"p95 <={self.histogram.percentile(0.95) * 1000:g}ms"
+        )
+
+
+class CallLog:
+    """Statistics of address book calls, shared by instrumented address books."""
+
+    def __init__(
+        self,
+        *,
+        trace: bool = False,
+        slow: float = SLOW_CALL,
+        log: Optional[Callable[[str], Any]] = None,
+    ):
+        """Initialize log.
+
+        :param trace: keep an event of each call for a trace
+        :param slow: seconds above which calls are logged
+        :param log: where slow calls are logged
+        """
+        self.stats: dict[str, MethodStats] = {}
+        self.events: Optional[list[dict[str, Any]]] = [] if trace else None
+        self.slow = slow
+        self.log = log
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        method: str,
+        started: float,
+        seconds: float,
+        contacts: int = 0,
+        bytes_read: int = 0,
+    ) -> None:
+        """Record a call that started at a performance counter time."""
+        with self._lock:
+            stats = self.stats.setdefault(method, MethodStats(method))
+            stats.calls += 1
+            stats.seconds += seconds
+            stats.contacts += contacts
+            stats.bytes_read += bytes_read
+            stats.histogram.add(seconds)
+            if self.events is not None:
+                self.events.append(
+                    {
+                        "name": method,
+                        "cat": "address_book",
+                        "ph": "X",
+                        "ts": round((started - self._origin) * 1e6),
+                        "dur": round(seconds * 1e6),
+                        "pid": os.getpid(),
+                        "tid": threading.get_ident(),
+                        "args": {"contacts": contacts, "bytes": bytes_read},
+                    }
+                )
+        if self.log is not None and seconds > self.slow:
+            self.log(f"Slow {method} call took {seconds:.2f}s.")
+
+    def dump_trace(self, path: Path) -> None:
+        """Write the events of calls in Chrome trace event format."""
+        trace = {"traceEvents": self.events or [], "displayTimeUnit": "ms"}
+        path.write_text(json.dumps(trace), encoding="utf-8")
+
+
+class InstrumentedAddressBook(AddressBook):
+    """Address book that records the calls made to another in a call log."""
+
+    def __init__(self, address_book: AddressBook, calls: CallLog):
+        """Initialize with the address book to record the calls of."""
+        self.address_book = address_book
+        self.calls = calls
+
+    def identity(self) -> str:
+        """Return the identity of the instrumented address book."""
+        return self.address_book.identity()
+
+    def count(self, keywords: list[str]) -> int:
+        """Return number of contacts matching given keywords."""
+        return self._call("count", lambda: self.address_book.count(keywords))
+
+    def find(self, keywords: list[str]) -> Iterator[Contact]:
+        """Return list of contact ids matching given keywords."""
+        return self._iterate("find", self.address_book.find(keywords))
+
+    def find_batches(
+        self, keywords: list[str], *, offset: int = 0, limit: Optional[int] = None
+    ) -> Generator[list[Contact], None, None]:
+        """Return contacts matching given keywords in batches as they are fetched."""
+        return self._iterate(
+            "find_batches",
+            self.address_book.find_batches(keywords, offset=offset, limit=limit),
+        )
+
+    def get(self, contact_id: str) -> Contact:
+        """Fetch a contact with its id."""
+        return self._call("get", lambda: self.address_book.get(contact_id))
+
+    def get_many(self, contact_ids: list[str]) -> list[Contact]:
+        """Fetch contacts with their ids."""
+        return self._call("get_many", lambda: self.address_book.get_many(contact_ids))
+
+    def _update_field(self, contact_id: str, field: str, value: str) -> None:
+        """Add or update a contact field with given value."""
+        self._call(
+            "_update_field",
+            lambda: self.address_book._update_field(contact_id, field, value),
+        )
+
+    def _delete_field(self, contact_id: str, field: str) -> None:
+        """Delete a contact field."""
+        self._call(
+            "_delete_field", lambda: self.address_book._delete_field(contact_id, field)
+        )
+
+    def _update_info(
+        self, contact_id: str, field: str, info_id: str, **values: str
+    ) -> None:
+        """Update a contact info with given label and value."""
+        self._call(
+            "_update_info",
+            lambda: self.address_book._update_info(
+                contact_id, field, info_id, **values
+            ),
+        )
+
+    def _add_info(self, contact_id: str, field: str, **values: str) -> None:
+        """Add a contact info."""
+        self._call(
+            "_add_info",
+            lambda: self.address_book._add_info(contact_id, field, **values),
+        )
+
+    def _delete_info(self, contact_id: str, field: str, info_id: str) -> None:
+        """Delete a contact info."""
+        self._call(
+            "_delete_info",
+            lambda: self.address_book._delete_info(contact_id, field, info_id),
+        )
+
+    def _delete_infos(self, contact_id: str, field: str, info_ids: list[str]) -> None:
+        """Delete multiple contact infos of the same field at once."""
+        self._call(
+            "_delete_infos",
+            lambda: self.address_book._delete_infos(contact_id, field, info_ids),
+        )
+
+    def _call(self, method: str, call: Callable[[], T]) -> T:
+        """Make a call, recording it whether it succeeds or not."""
+        bytes_read = self._bytes_read()
+        started = time.perf_counter()
+        result: Optional[T] = None
+        try:
+            result = call()
+        finally:
+            self.calls.record(
+                method,
+                started,
+                time.perf_counter() - started,
+                _contacts(result),
+                self._bytes_read() - bytes_read,
+            )
+        return result
+
+    def _iterate(self, method: str, items: Iterator[T]) -> Generator[T, None, None]:
+        """Return items, recording the fetch of each as a call."""
+        try:
+            while True:
+                bytes_read = self._bytes_read()
+                started = time.perf_counter()
+                try:
+                    item = next(items)
+                except StopIteration:
+                    return
+                self.calls.record(
+                    method,
+                    started,
+                    time.perf_counter() - started,
+                    _contacts(item),
+                    self._bytes_read() - bytes_read,
+                )
+                yield item
+        finally:
+            close = getattr(items, "close", None)
+            if close is not None:
+                close()
+
+    def _bytes_read(self) -> int:
+        """Return bytes read so far by this thread, for backends that count them."""
+        return int(getattr(self.address_book, "bytes_read", 0))
+
+
+def _contacts(result: Any) -> int:
+    """Return the number of contacts in a call result."""
+    if isinstance(result, Contact):
+        return 1
+    if isinstance(result, list):
+        return sum(isinstance(x, Contact) for x in result)
+    return 0
@@ -0,0 +1,99 @@
+"""Normalized keys for comparing contact values.
+
+Libraries for transliteration and phone numbers are imported on first use,
+as keys are cached and completions use only `fold`.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Optional
+from urllib.parse import unwrap, urlparse
+
+CACHE_SIZE = 1 << 16
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+class _FoldTable(dict[int, str]):
+    """Translation table stripping diacritics and case, filled as characters occur."""
+
+    def __missing__(self, code: int) -> str:
+        decomposed = unicodedata.normalize("NFD", chr(code))
+        if all(unicodedata.combining(x) for x in decomposed[1:]):
+            folded = decomposed[0].casefold()
+        else:
+            folded = chr(code).casefold()
+        self[code] = folded
+        return folded
+
+
+FOLD_TABLE = _FoldTable()
+
+
+def fold(value: str) -> str:
+    """Fold text to lowercase without diacritics, as the address book searches."""
+    return value.translate(FOLD_TABLE)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def text(value: str) -> str:
+    """Fold text to lowercase ASCII with single spaces."""
+    from unidecode import unidecode
+
+    return " ".join(unidecode(value).casefold().split())
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def e164(value: str) -> Optional[str]:
+    """Return E.164 form of a phone number, or None if it is not parsable."""
+    import phonenumbers
+
+    try:
+        return phonenumbers.format_number(
+            phonenumbers.parse(value),
+            phonenumbers.PhoneNumberFormat.E164,
+        )
+    except phonenumbers.NumberParseException:
+        return None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def phone(value: str) -> str:
+    """Return E.164 form of a phone number, or its bare digits if unparsable."""
+    formatted = e164(value)
+    if formatted is not None:
+        return formatted
+    return "".join(c for c in value if c.isdigit() or c == "+")
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def email(value: str) -> str:
+    """Return an e-mail address in case-insensitive form."""
+    return value.strip().casefold()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def url(value: str) -> str:
+    """Return a canonical URL, ignoring host case, default ports and end slash."""
+    parsed = urlparse(unwrap(value.strip()))
+    scheme = parsed.scheme.lower()
+    try:
+        port = parsed.port
+    except ValueError:
+        port = None
+    if not parsed.hostname:
+        return value.strip().casefold()
+    netloc = parsed.hostname
+    if port is not None and DEFAULT_PORTS.get(scheme) != port:
+        netloc = f"{netloc}:{port}"
+    path = parsed.path.rstrip("/")
+    return parsed._replace(scheme=scheme, netloc=netloc, path=path).geturl()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def address(value: str) -> str:
+    """Fold an address, ignoring punctuation, line breaks and diacritics."""
+    return " ".join(re.split(r"\W+", text(value))).strip()
@@ -0,0 +1,190 @@
+"""Writers that output contacts one at a time, as they are fetched."""
+
+from __future__ import annotations
+
+import json
+import sys
+import textwrap
+from typing import Any, Callable, Iterator, Optional, Protocol, TextIO
+
+from rich.console import Console, RenderableType
+
+from contacts.category import Category
+from contacts.contact import Contact, ContactInfo
+from contacts.field import ContactFieldMetadata, ContactFields, ContactInfoMetadata
+
+# field name on the first row of a field only, icon and value
+Row = tuple[Optional[str], str, str]
+
+
+def with_icon(person: Contact) -> str:
+    """Contact with display icon."""
+    return f"{person.category.icon} {person.name}"
+
+
+def rows(person: Contact) -> Iterator[Row]:
+    """Return the fields, infos and problems of a contact to show, in order."""
+    for field in ContactFields:
+        if isinstance(field.value, ContactFieldMetadata):
+            value = field.value.get(person)
+            if not value:
+                continue
+            yield field.value.singular, field.value.category.icon, value
+        elif isinstance(field.value, ContactInfoMetadata):
+            for index, info in enumerate(field.value.get(person)):
+                if isinstance(info, ContactInfo):
+                    category = Category.from_label(info.label, field.value.category)
+                    if category is None or category == Category.OTHER:
+                        category = field.value.category
+                    yield (
+                        field.value.plural if index == 0 else None,
+                        category.icon,
+                        str(info),
+                    )
+
+    for index, problem in enumerate(person.problems):
+        yield (
+            "Problems" if index == 0 else None,
+            problem.category.icon,
+            problem.message,
+        )
+
+
+def contact_data(person: Contact, problems: bool = False) -> dict[str, Any]:
+    """Return JSON data of a contact.
+
+    :param problems: include problems found on the contact
+    """
+    data = person.model_dump(mode="json", exclude_defaults=True)
+    if problems and person.problems:
+        data["problems"] = [
+            {"category": x.category.name.lower(), "message": x.message}
+            for x in person.problems
+        ]
+    return data
+
+
+class Writer(Protocol):
+    """Output of contacts, written one at a time."""
+
+    def write(self, person: Contact) -> None:
+        """Write a contact."""
+
+    def close(self) -> None:
+        """End the output."""
+
+
+class RenderWriter:
+    """Writes a view of each contact to the console."""
+
+    def __init__(self, console: Console, render: Callable[[Contact], RenderableType]):
+        """Initialize writer.
+
+        :param render: view of a contact to print
+        """
+        self.console = console
+        self.render = render
+
+    def write(self, person: Contact) -> None:
+        """Write a contact."""
+        self.console.print(self.render(person))
+
+    def close(self) -> None:
+        """Nothing to end for views."""
+
+
+class PlainWriter:
+    """Writes contacts as plain text, skipping rich rendering for speed.
+
+    Each contact is a line with its icon and name, or with details, a line per
+    field with the tab separated contact name, field name and value.
+    """
+
+    def __init__(self, *, detail: bool = False, file: Optional[TextIO] = None):
+        """Initialize writer.
+
+        :param detail: write every field of contacts
+        :param file: file to write to instead of stdout
+        """
+        self.detail = detail
+        self.file = file
+
+    def line(self, text: str) -> None:
+        """Write a line of text."""
+        (self.file or sys.stdout).write(f"{text}\n")
+
+    def write(self, person: Contact) -> None:
+        """Write a contact."""
+        if not self.detail:
+            self.line(with_icon(person))
+            return
+        name = _cell(person.name)
+        label = ""
+        lines = []
+        for field, _, value in rows(person):
+            label = field or label
+            lines.append(f"{name}\t{label}\t{_cell(value)}\n")
+        (self.file or sys.stdout).write("".join(lines))
+
+    def close(self) -> None:
+        """Flush the written text."""
+        (self.file or sys.stdout).flush()
+
+
+def _cell(value: str) -> str:
+    """Return a value fit for a tab separated column."""
+    return value.replace("\t", " ").replace("\n", " ")
+
+
+class JsonWriter:
+    """Writes contacts into a single JSON document as they arrive."""
+
+    def __init__(self, console: Console, *, problems: bool = False):
+        """Initialize writer.
+
+        :param problems: include problems found on contacts
+        """
+        self.console = console
+        self.problems = problems
+        self.count = 0
+
+    def write(self, person: Contact) -> None:
+        """Write a contact."""
+        text = json.dumps(
+            contact_data(person, self.problems), indent=4, ensure_ascii=False
+        )
+        start = ",\n" if self.count else '{\n    "contacts": [\n'
+        self.console.out(
+            start + textwrap.indent(text, " " * 8), end="", highlight=False
+        )
+        self.count += 1
+
+    def close(self) -> None:
+        """End the document."""
+        if self.count:
+            self.console.out("\n    ]\n}", highlight=False)
+        else:
+            self.console.out('{\n    "contacts": []\n}', highlight=False)
+
+
+class NdjsonWriter:
+    """Writes contacts as JSON documents, one per line."""
+
+    def __init__(self, console: Console, *, problems: bool = False):
+        """Initialize writer.
+
+        :param problems: include problems found on contacts
+        """
+        self.console = console
+        self.problems = problems
+
+    def write(self, person: Contact) -> None:
+        """Write a contact."""
+        data = contact_data(person, self.problems)
+        self.console.out(
+            json.dumps(data, ensure_ascii=False, separators=(",", ":")),
+            highlight=False,
+        )
+
+    def close(self) -> None:
+        """Nothing to end for lines."""
@@ -0,0 +1,177 @@
+"""Phonetic keys for finding names by how they sound.
+
+Keys follow the Double Metaphone approach in a reduced form: words are
+transliterated to ASCII, and consonant sounds are encoded into a primary key
+and an alternate key where the pronunciation is ambiguous, like `ch` in
+`Charles` and `Christoph`.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Optional
+
+KEY_LENGTH = 4
+VOWELS = frozenset("AEIOUY")
+SILENT_STARTS = ("GN", "KN", "PN", "WR", "PS")
+
+
+class _Encoder:
+    """Builds primary and alternate keys of a word side by side."""
+
+    def __init__(self, word: str):
+        self.word = word
+        self.primary = ""
+        self.alternate = ""
+
+    def at(self, i: int, *options: str) -> bool:
+        """Return whether any option occurs at a position."""
+        return any(self.word.startswith(x, i) for x in options if i >= 0)
+
+    def vowel(self, i: int) -> bool:
+        """Return whether there is a vowel at a position."""
+        return 0 <= i < len(self.word) and self.word[i] in VOWELS
+
+    def add(self, primary: str, alternate: Optional[str] = None) -> None:
+        """Add sounds to the keys."""
+        self.primary += primary
+        self.alternate += primary if alternate is None else alternate
+
+    def encode(self) -> tuple[str, str]:
+        """Return the primary and alternate keys."""
+        word = self.word
+        i = 1 if self.at(0, *SILENT_STARTS) else 0
+        if self.at(0, "X"):
+            self.add("S")
+            i = 1
+        elif self.at(0, "WH"):
+            self.add("W")
+            i = 2
+        elif self.vowel(0):
+            self.add("A")
+            i = 1
+        while i < len(word) and len(self.primary) < KEY_LENGTH:
+            i = self._consonant(i)
+        return self.primary[:KEY_LENGTH], self.alternate[:KEY_LENGTH]
+
+    def _consonant(self, i: int) -> int:
+        c = self.word[i]
+        if c in VOWELS:
+            return i + 1
+        encode = getattr(self, f"_{c.lower()}", None)
+        if encode is not None:
+            step: int = encode(i)
+            return step
+        if c in "FLMNR":
+            self.add(c)
+        return i + 2 if self.at(i + 1, c) else i + 1
+
+    def _b(self, i: int) -> int:
+        if not (self.at(i - 1, "M") and i + 1 == len(self.word)):
+            self.add("P")
+        return i + 2 if self.at(i + 1, "B") else i + 1
+
+    def _c(self, i: int) -> int:
+        if self.at(i, "CH"):
+            self.add("X", "K")
+            return i + 2
+        if self.at(i, "CIA"):
+            self.add("X")
+            return i + 3
+        if self.at(i, "CI", "CE", "CY"):
+            self.add("S")
+            return i + 2
+        self.add("K")
+        return i + 2 if self.at(i, "CK", "CC", "CQ") else i + 1
+
+    def _d(self, i: int) -> int:
+        if self.at(i, "DGE", "DGI", "DGY"):
+            self.add("J")
+            return i + 3
+        self.add("T")
+        return i + 2 if self.at(i, "DT", "DD") else i + 1
+
+    def _g(self, i: int) -> int:
+        if self.at(i, "GH") and not self.vowel(i + 2):
+            return i + 2
+        if self.at(i, "GN") and i + 2 == len(self.word):
+            return i + 2
+        if self.at(i, "GE", "GI", "GY"):
+            self.add("J", "K")
+        else:
+            self.add("K")
+        return i + 2 if self.at(i + 1, "G") else i + 1
+
+    def _h(self, i: int) -> int:
+        if self.vowel(i + 1) and not self.at(i - 1, "C", "G", "P", "S", "T"):
+            self.add("H")
+        return i + 1
+
+    def _j(self, i: int) -> int:
+        self.add("J", "H")
+        return i + 2 if self.at(i + 1, "J") else i + 1
+
+    def _k(self, i: int) -> int:
+        if not self.at(i - 1, "C"):
+            self.add("K")
+        return i + 2 if self.at(i + 1, "K") else i + 1
+
+    def _p(self, i: int) -> int:
+        if self.at(i, "PH"):
+            self.add("F")
+            return i + 2
+        self.add("P")
+        return i + 2 if self.at(i + 1, "P", "B") else i + 1
+
+    def _q(self, i: int) -> int:
+        self.add("K")
+        return i + 2 if self.at(i + 1, "Q") else i + 1
+
+    def _s(self, i: int) -> int:
+        if self.at(i, "SCH"):
+            self.add("SK", "X")
+            return i + 3
+        if self.at(i, "SH", "SIO", "SIA"):
+            self.add("X")
+            return i + 2
+        self.add("S")
+        return i + 2 if self.at(i + 1, "S", "Z") else i + 1
+
+    def _t(self, i: int) -> int:
+        if self.at(i, "TIA", "TIO"):
+            self.add("X")
+            return i + 3
+        if self.at(i, "TH"):
+            self.add("0", "T")
+            return i + 2
+        if not self.at(i, "TCH"):
+            self.add("T")
+        return i + 2 if self.at(i + 1, "T", "D") else i + 1
+
+    def _v(self, i: int) -> int:
+        self.add("F")
+        return i + 2 if self.at(i + 1, "V") else i + 1
+
+    def _w(self, i: int) -> int:
+        if self.vowel(i + 1):
+            self.add("W", "F")
+        return i + 1
+
+    def _x(self, i: int) -> int:
+        self.add("KS")
+        return i + 2 if self.at(i + 1, "X") else i + 1
+
+    def _z(self, i: int) -> int:
+        self.add("S", "TS")
+        return i + 2 if self.at(i + 1, "Z") else i + 1
+
+
+@lru_cache(maxsize=1 << 16)
+def keys(word: str) -> frozenset[str]:
+    """Return the phonetic keys of a word, one or two of them."""
+    from unidecode import unidecode
+
+    letters = "".join(x for x in unidecode(word).upper() if x.isalpha())
+    if not letters:
+        return frozenset()
+    return frozenset(x for x in _Encoder(letters).encode() if x)
@@ -0,0 +1,208 @@
+"""Staged pipelines, with stages running side by side on their own threads."""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Generator, Iterator, NamedTuple
+
+from contacts import timing
+
+QUEUE_SIZE = 4
+POLL_SECONDS = 0.05
+
+_END = object()
+
+
+class _Failure(NamedTuple):
+    """An error raised by a stage, passed on to be raised in order."""
+
+    error: BaseException
+
+
+class StageStats:
+    """Work done by a stage and how full its input queue was."""
+
+    def __init__(self, name: str, workers: int, capacity: int):
+        """Initialize empty statistics."""
+        self.name = name
+        self.workers = workers
+        self.capacity = capacity
+        self.items = 0
+        self.busy = 0.0
+        self.queued = 0
+        self.max_queued = 0
+
+    @property
+    def per_second(self) -> float:
+        """Return items processed per second of work."""
+        return self.items / self.busy if self.busy else 0.0
+
+    @property
+    def occupancy(self) -> float:
+        """Return the average number of items queued when one was taken."""
+        return self.queued / self.items if self.items else 0.0
+
+    def __str__(self) -> str:
+        """Return a summary line."""
+        line = (
+            f"{self.name}: {self.items} items in {self.busy:.2f}s, "
+            f"{self.per_second:.1f}/s, workers {self.workers}"
+        )
+        if self.capacity:
+            line += (
+                f", queue {self.occupancy:.1f} average, "
+                f"{self.max_queued}/{self.capacity} max"
+            )
+        return line
+
+
+class _Stage:
+    """Workers applying a function to items of a queue, passing them on in order."""
+
+    def __init__(
+        self, name: str, func: Callable[[Any], Any], workers: int, capacity: int
+    ):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.input: queue.Queue[Any] = queue.Queue(capacity)
+        self.stats = StageStats(name, workers, capacity)
+        self.lock = threading.Lock()
+        self.done: dict[int, Any] = {}
+        self.next = 0
+        self.running = workers
+
+
+class Pipeline:
+    """Items from a source passed through stages, connected by bounded queues.
+
+    Each stage runs on worker threads of its own, so that a slow stage does
+    not stall the others until the queues between them are full. Stages with
+    multiple workers process items out of order, but pass them on in order.
+    """
+
+    def __init__(self, source: Iterator[Any], *, capacity: int = QUEUE_SIZE):
+        """Initialize pipeline.
+
+        :param source: items to process, pulled on a thread of its own
+        :param capacity: maximum number of items waiting for each stage
+        """
+        self.source = source
+        self.capacity = capacity
+        self.stages: list[_Stage] = []
+        self.output: queue.Queue[Any] = queue.Queue(capacity)
+        self.source_stats = StageStats("source", 1, 0)
+        self._stopped = threading.Event()
+        self._aborted = threading.Event()
+
+    @property
+    def stats(self) -> list[StageStats]:
+        """Return statistics of the source and each stage."""
+        return [self.source_stats, *(x.stats for x in self.stages)]
+
+    def add(self, name: str, func: Callable[[Any], Any], workers: int = 1) -> None:
+        """Add a stage applying a function to each item."""
+        self.stages.append(_Stage(name, func, workers, self.capacity))
+
+    def stop(self) -> None:
+        """Stop pulling items from the source, still processing pulled items."""
+        self._stopped.set()
+
+    def run(self) -> Generator[Any, None, None]:
+        """Return processed items in source order, as they are done.
+
+        Errors raised by stages are raised here, in the order of their items.
+        """
+        outputs = [x.input for x in self.stages[1:]] + [self.output]
+        threads = [threading.Thread(target=timing.threaded(self._pull), daemon=True)]
+        for stage, output in zip(self.stages, outputs):
+            threads += [
+                threading.Thread(
+                    target=timing.threaded(self._work),
+                    args=(stage, output),
+                    daemon=True,
+                )
+                for _ in range(stage.workers)
+            ]
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                item = self._get(self.output)
+                if item is None or item is _END:
+                    return
+                if isinstance(item[1], _Failure):
+                    raise item[1].error
+                yield item[1]
+        finally:
+            self._aborted.set()
+
+    def _pull(self) -> None:
+        first = self.stages[0].input if self.stages else self.output
+        seq = 0
+        try:
+            while not (self._stopped.is_set() or self._aborted.is_set()):
+                start = time.perf_counter()
+                try:
+                    item: Any = next(self.source)
+                except StopIteration:
+                    break
+                except Exception as e:
+                    item = _Failure(e)
+                self.source_stats.busy += time.perf_counter() - start
+                self.source_stats.items += 1
+                if not self._put(first, (seq, item)) or isinstance(item, _Failure):
+                    break
+                seq += 1
+        finally:
+            close = getattr(self.source, "close", None)
+            if close is not None:
+                close()
+            self._put(first, _END)
+
+    def _work(self, stage: _Stage, output: queue.Queue[Any]) -> None:
+        while (item := self._get(stage.input)) is not None:
+            if item is _END:
+                self._put(stage.input, _END)
+                break
+            queued = stage.input.qsize() + 1
+            seq, value = item
+            start = time.perf_counter()
+            if not isinstance(value, _Failure):
+                try:
+                    value = stage.func(value)
+                except Exception as e:
+                    value = _Failure(e)
+            with stage.lock:
+                stage.stats.busy += time.perf_counter() - start
+                stage.stats.items += 1
+                stage.stats.queued += queued
+                stage.stats.max_queued = max(stage.stats.max_queued, queued)
+                stage.done[seq] = value
+                while stage.next in stage.done:
+                    self._put(output, (stage.next, stage.done.pop(stage.next)))
+                    stage.next += 1
+        with stage.lock:
+            stage.running -= 1
+            if stage.running == 0:
+                self._put(output, _END)
+
+    def _get(self, source: queue.Queue[Any]) -> Any:
+        while not self._aborted.is_set():
+            try:
+                item = source.get(timeout=POLL_SECONDS)
+            except queue.Empty:
+                continue
+            return item
+        return None
+
+    def _put(self, target: queue.Queue[Any], item: Any) -> bool:
+        while not self._aborted.is_set():
+            try:
+                target.put(item, timeout=POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
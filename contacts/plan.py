@@ -0,0 +1,356 @@
+"""Fix planning to apply the fewest mutations for a set of problems."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from enum import Enum
+from pathlib import Path
+from typing import Any, Generator, Iterable, NamedTuple, Optional, Sequence
+
+from pydantic import BaseModel
+
+from contacts.address_book import ContactEditor
+from contacts.contact import Contact
+from contacts.defaults import APPLY_BATCH_SIZE
+from contacts.problem import Problem
+
+JOURNAL_SUFFIX = ".journal"
+
+
+class Operation(Enum):
+    """Kind of change made to a contact."""
+
+    UPDATE_FIELD = "update_field"
+    DELETE_FIELD = "delete_field"
+    UPDATE_INFO = "update_info"
+    ADD_INFO = "add_info"
+    DELETE_INFO = "delete_info"
+
+
+class Mutation(NamedTuple):
+    """A single change to a contact."""
+
+    operation: Operation
+    contact_id: str
+    field: str
+    info_id: Optional[str] = None
+    values: tuple[tuple[str, str], ...] = ()
+
+    def apply(self, address_book: ContactEditor) -> None:
+        """Make this change on an address book."""
+        values = dict(self.values)
+        if self.operation == Operation.UPDATE_FIELD:
+            address_book._update_field(self.contact_id, self.field, values["value"])
+        elif self.operation == Operation.DELETE_FIELD:
+            address_book._delete_field(self.contact_id, self.field)
+        elif self.operation == Operation.UPDATE_INFO and self.info_id:
+            address_book._update_info(
+                self.contact_id, self.field, self.info_id, **values
+            )
+        elif self.operation == Operation.ADD_INFO:
+            address_book._add_info(self.contact_id, self.field, **values)
+        elif self.operation == Operation.DELETE_INFO and self.info_id:
+            address_book._delete_info(self.contact_id, self.field, self.info_id)
+
+
+class MutationRecorder(ContactEditor):
+    """Editor that records the changes made through it instead of making them."""
+
+    def __init__(self) -> None:
+        """Initialize with no changes."""
+        self.mutations: list[Mutation] = []
+        self.calls = 0
+
+    def _update_field(self, contact_id: str, field: str, value: str) -> None:
+        """Record a field update."""
+        self._record(Operation.UPDATE_FIELD, contact_id, field, values={"value": value})
+
+    def _delete_field(self, contact_id: str, field: str) -> None:
+        """Record a field deletion."""
+        self._record(Operation.DELETE_FIELD, contact_id, field)
+
+    def _update_info(
+        self, contact_id: str, field: str, info_id: str, **values: str
+    ) -> None:
+        """Record an info update."""
+        self._record(Operation.UPDATE_INFO, contact_id, field, info_id, values)
+
+    def _add_info(self, contact_id: str, field: str, **values: str) -> None:
+        """Record an info addition."""
+        self._record(Operation.ADD_INFO, contact_id, field, values=values)
+
+    def _delete_info(self, contact_id: str, field: str, info_id: str) -> None:
+        """Record an info deletion."""
+        self._record(Operation.DELETE_INFO, contact_id, field, info_id)
+
+    def _delete_infos(self, contact_id: str, field: str, info_ids: list[str]) -> None:
+        """Record info deletions, made with a single call."""
+        self.calls += 1
+        self.mutations.extend(
+            Mutation(Operation.DELETE_INFO, contact_id, field, x) for x in info_ids
+        )
+
+    def _record(
+        self,
+        operation: Operation,
+        contact_id: str,
+        field: str,
+        info_id: Optional[str] = None,
+        values: Optional[dict[str, str]] = None,
+    ) -> None:
+        self.calls += 1
+        self.mutations.append(
+            Mutation(
+                operation, contact_id, field, info_id, tuple((values or {}).items())
+            )
+        )
+
+
+class Conflict(NamedTuple):
+    """Update dropped for setting another value than an earlier one."""
+
+    kept: Mutation
+    dropped: Mutation
+
+
+class FixPlan:
+    """Every change proposed by the fixes of a set of problems.
+
+    Updates of the same field or info are merged, updates of deleted fields and
+    infos are dropped, and deletions are made last, batched per field. Updates
+    that set another value than an earlier one conflict, and the first is kept.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty plan."""
+        self.problems: list[tuple[Problem, list[Mutation]]] = []
+        self.proposed_calls = 0
+
+    def add(self, problem: Problem) -> None:
+        """Add the changes proposed by the fix of a problem."""
+        if not problem.fix:
+            return
+        recorder = MutationRecorder()
+        problem.fix(recorder)
+        self.problems.append((problem, recorder.mutations))
+        self.proposed_calls += recorder.calls
+
+    def add_contacts(self, contacts: Iterable[Contact]) -> None:
+        """Add the changes proposed for all problems of contacts."""
+        for contact in contacts:
+            for problem in contact.problems:
+                self.add(problem)
+
+    def mutations(self) -> list[Mutation]:
+        """Return the minimal list of changes, in the order to make them."""
+        return [x for x, _ in self._coalesce()[0]]
+
+    def conflicts(self) -> list[Conflict]:
+        """Return the updates dropped for conflicting with earlier ones."""
+        return self._coalesce()[1]
+
+    def export(self) -> PlanFile:
+        """Return the changes along with the problems they fix."""
+        return PlanFile(
+            changes=[
+                PlannedChange(
+                    problems=[x.message for x in problems],
+                    operation=mutation.operation,
+                    contact_id=mutation.contact_id,
+                    field=mutation.field,
+                    info_id=mutation.info_id,
+                    values=dict(mutation.values),
+                )
+                for mutation, problems in self._coalesce()[0]
+            ]
+        )
+
+    def apply(self, address_book: ContactEditor) -> int:
+        """Make the planned changes and return the number of backend calls."""
+        return apply_mutations(address_book, self.mutations())
+
+    def _coalesce(
+        self,
+    ) -> tuple[list[tuple[Mutation, list[Problem]]], list[Conflict]]:
+        proposed = [(x, p) for p, mutations in self.problems for x in mutations]
+        deleted_fields = {
+            (x.contact_id, x.field)
+            for x, _ in proposed
+            if x.operation == Operation.DELETE_FIELD
+        }
+        deleted_infos = {
+            (x.contact_id, x.field, x.info_id)
+            for x, _ in proposed
+            if x.operation == Operation.DELETE_INFO
+        }
+
+        field_updates: dict[tuple[str, str], Mutation] = {}
+        info_updates: dict[tuple[str, str, Optional[str]], dict[str, str]] = {}
+        adds: dict[Mutation, None] = {}
+        deletes: dict[Mutation, None] = {}
+        problems: dict[tuple[Any, ...], list[Problem]] = {}
+        conflicts: list[Conflict] = []
+        for x, problem in proposed:
+            if x.operation == Operation.UPDATE_FIELD:
+                key: tuple[Any, ...] = (x.contact_id, x.field)
+                if key in deleted_fields:
+                    continue
+                kept = field_updates.get(key)
+                if kept is not None and kept.values != x.values:
+                    conflicts.append(Conflict(kept, x))
+                    continue
+                field_updates[key] = x
+            elif x.operation == Operation.UPDATE_INFO:
+                key = (x.contact_id, x.field, x.info_id)
+                if key in deleted_infos:
+                    continue
+                values = info_updates.setdefault(key, {})
+                if any(values.get(k, v) != v for k, v in x.values):
+                    merged = Mutation(
+                        Operation.UPDATE_INFO, *key, tuple(values.items())
+                    )
+                    conflicts.append(Conflict(merged, x))
+                    continue
+                values.update(x.values)
+            else:
+                key = x
+                (adds if x.operation == Operation.ADD_INFO else deletes)[x] = None
+            found = problems.setdefault(key, [])
+            if problem not in found:
+                found.append(problem)
+
+        coalesced = [
+            *((x, problems[(x.contact_id, x.field)]) for x in field_updates.values()),
+            *(
+                (
+                    Mutation(Operation.UPDATE_INFO, c, f, i, tuple(values.items())),
+                    problems[(c, f, i)],
+                )
+                for (c, f, i), values in info_updates.items()
+            ),
+            *((x, problems[x]) for x in adds),
+            *(
+                (x, problems[x])
+                for x in sorted(
+                    deletes, key=lambda x: x.operation != Operation.DELETE_FIELD
+                )
+            ),
+        ]
+        return coalesced, conflicts
+
+
+def apply_mutations(address_book: ContactEditor, mutations: Sequence[Mutation]) -> int:
+    """Make changes, deleting infos last per field, and return the backend calls."""
+    calls = call_groups(mutations)
+    for call in calls:
+        apply_call(address_book, [mutations[i] for i in call])
+    return len(calls)
+
+
+def call_groups(mutations: Sequence[Mutation]) -> list[list[int]]:
+    """Return the indexes of the mutations made by each backend call, in order.
+
+    Infos are deleted last, with a single call for each field.
+    """
+    calls: list[list[int]] = []
+    info_deletes: dict[tuple[str, str], list[int]] = {}
+    for i, mutation in enumerate(mutations):
+        if mutation.operation == Operation.DELETE_INFO and mutation.info_id:
+            key = (mutation.contact_id, mutation.field)
+            info_deletes.setdefault(key, []).append(i)
+        else:
+            calls.append([i])
+    return calls + list(info_deletes.values())
+
+
+def apply_call(address_book: ContactEditor, mutations: Sequence[Mutation]) -> None:
+    """Make the mutations of a single backend call, as grouped by call_groups."""
+    first = mutations[0]
+    if first.operation == Operation.DELETE_INFO and first.info_id:
+        info_ids = [x.info_id for x in mutations if x.info_id]
+        address_book._delete_infos(first.contact_id, first.field, info_ids)
+    else:
+        first.apply(address_book)
+
+
+class PlannedChange(BaseModel):
+    """A change in a fix plan file, with the problems it fixes."""
+
+    problems: list[str]
+    operation: Operation
+    contact_id: str
+    field: str
+    info_id: Optional[str] = None
+    values: dict[str, str] = {}
+
+    def mutation(self) -> Mutation:
+        """Return the change to make."""
+        return Mutation(
+            self.operation,
+            self.contact_id,
+            self.field,
+            self.info_id,
+            tuple(self.values.items()),
+        )
+
+
+class PlanFile(BaseModel):
+    """Fix plan that can be reviewed and applied later."""
+
+    changes: list[PlannedChange] = []
+
+    def dump(self, path: Path) -> None:
+        """Write plan to a file."""
+        path.write_text(self.model_dump_json(indent=4), encoding="utf-8")
+
+    @staticmethod
+    def load(path: Path) -> PlanFile:
+        """Load plan from a file."""
+        return PlanFile.model_validate_json(path.read_text(encoding="utf-8"))
+
+
+def journal_path(path: Path) -> Path:
+    """Return the path of the checkpoint journal for a plan file."""
+    return path.with_name(path.name + JOURNAL_SUFFIX)
+
+
+def apply_plan(
+    path: Path, address_book: ContactEditor, batch_size: int = APPLY_BATCH_SIZE
+) -> Generator[tuple[int, int], None, None]:
+    """Apply a plan file in batches, yielding the changes made so far and in total.
+
+    The changes made by each backend call are appended to a journal next to
+    the plan, and an interrupted apply resumes with the changes not journaled.
+    Only the changes of a call interrupted while it ran are made again.
+    """
+    content = path.read_bytes()
+    digest = hashlib.sha256(content).hexdigest()
+    plan = PlanFile.model_validate_json(content)
+
+    journal = journal_path(path)
+    made: set[int] = set()
+    if journal.is_file():
+        lines = journal.read_text(encoding="utf-8").splitlines()
+        if not lines or lines[0] != digest:
+            raise ValueError(f"Journal '{journal}' is for a different plan.")
+        made = {int(x) for line in lines[1:] for x in line.split()}
+    else:
+        journal.write_text(f"{digest}\n", encoding="utf-8")
+
+    total = len(plan.changes)
+    yield len(made), total
+    with journal.open("a", encoding="utf-8") as file:
+        for start in range(0, total, batch_size):
+            end = min(start + batch_size, total)
+            pending = [x for x in range(start, end) if x not in made]
+            if not pending:
+                continue
+            mutations = [plan.changes[x].mutation() for x in pending]
+            for call in call_groups(mutations):
+                apply_call(address_book, [mutations[x] for x in call])
+                file.write(" ".join(str(pending[x]) for x in call) + "\n")
+                file.flush()
+                os.fsync(file.fileno())
+                made.update(pending[x] for x in call)
+            yield len(made), total
@@ -3,19 +3,34 @@
 from __future__ import annotations
 
 import abc
-from typing import Any, Callable, Optional
+from typing import TYPE_CHECKING, Any, Callable, Optional, Sequence
 
 from contacts import address_book, contact
 from contacts.category import Category
 
+if TYPE_CHECKING:
+    from contacts.field import ContactFields
+
 
 class Check(metaclass=abc.ABCMeta):
     """A single problem check."""
 
+    # contact fields read by the check, and so need fetching for it
+    fields: frozenset[ContactFields]
+    # whether the check waits on the network, and so is run in background
+    network = False
+
     @abc.abstractmethod
     def check(self, contact: contact.Contact) -> list[Problem]:
         """Check contact."""
 
+    def check_many(self, contacts: Sequence[contact.Contact]) -> list[list[Problem]]:
+        """Check a batch of contacts, returning problems for each in order.
+
+        Checks can override this to share work across the batch.
+        """
+        return [self.check(x) for x in contacts]
+
 
 class Problem:
     """Represents something being off in a contact."""
@@ -23,18 +38,26 @@ class Problem:
     def __init__(
         self,
         message: str,
-        fix: Optional[Callable[[address_book.AddressBook], Any]] = None,
+        fix: Optional[Callable[[address_book.ContactEditor], Any]] = None,
+        *,
+        unknown: bool = False,
     ):
-        """Initialize problem details."""
+        """Initialize problem details.
+
+        :param unknown: the check could not tell whether there is a problem
+        """
         self.message = message.replace("\n", " ")
         self.fix = fix
+        self.unknown = unknown
 
     @property
     def category(self) -> Category:
         """Return the category of this problem."""
+        if self.unknown:
+            return Category.UNKNOWN
         return Category.WARNING if self.fix else Category.ERROR
 
-    def try_fix(self, address_book: address_book.AddressBook) -> None:
+    def try_fix(self, address_book: address_book.ContactEditor) -> None:
         """Attempt to fix this problem."""
         if self.fix:
             self.fix(address_book)
@@ -1,11 +1,20 @@
 """Query operations."""
 
-from functools import cache
-from itertools import chain, combinations
+import math
+import warnings
+from functools import cache, lru_cache
+from itertools import islice, product
+from typing import Iterable, Mapping, NamedTuple, Optional
 
 from unidecode import unidecode
 
+from contacts import normalize
+from contacts.category import Category
 from contacts.config import get_config
+from contacts.contact import Contact
+from contacts.field import ContactFields, ContactInfoMetadata
+
+MAX_VARIANTS = 32
 
 
 @cache
@@ -18,27 +27,257 @@ def romanization() -> dict[str, list[str]]:
     return trans
 
 
-def prepare_keywords(keywords: list[str]) -> list[str]:
-    """Capitalize keywords to match contacts.
+@cache
+def variant_letters() -> dict[str, list[str]]:
+    """Return romanizations that are not matched by ignoring diacritics."""
+    trans = {
+        key: [x for x in letters if normalize.fold(x) != key]
+        for key, letters in romanization().items()
+    }
+    return {key: letters for key, letters in trans.items() if letters}
+
 
-    :param extend: extend the search space to find near matches
+def variants(keyword: str, letters: Mapping[str, list[str]]) -> list[str]:
+    """Return keyword with every combination of romanized letters.
+
+    The keyword itself comes first, and at most MAX_VARIANTS are returned.
     """
-    result = {" ".join(x.capitalize() for x in k.split()) for k in keywords}
-
-    for keyword in list(result):
-        trans_pairs = list(
-            chain(
-                *(
-                    [(i, y) for y in romanization().get(c.lower(), [])]
-                    for (i, c) in enumerate(keyword)
-                )
+    options = [
+        list(
+            dict.fromkeys(
+                [
+                    c,
+                    *(
+                        x.upper() if c.isupper() else x
+                        for x in letters.get(c.lower(), [])
+                    ),
+                ]
             )
         )
-        for trans_count in range(1, len(trans_pairs) + 1):
-            for trans_combination in combinations(trans_pairs, trans_count):
-                translated = list(keyword)
-                for trans in trans_combination:
-                    translated[trans[0]] = trans[1]
-                    result.add("".join(translated))
-
-    return sorted(result)
+        for c in keyword
+    ]
+    total = math.prod(len(x) for x in options)
+    if total > MAX_VARIANTS:
+        warnings.warn(
+            f"Keyword '{keyword}' has {total} romanized variants, "
+            f"searching for the first {MAX_VARIANTS}.",
+            stacklevel=2,
+        )
+    return ["".join(x) for x in islice(product(*options), MAX_VARIANTS)]
+
+
+def prepare_keywords(keywords: list[str]) -> list[str]:
+    """Fold and capitalize keywords to match contacts.
+
+    Contacts are searched ignoring diacritics, so keywords are folded and only
+    romanized letters that differ by more than diacritics make variants.
+    """
+    folded = {
+        " ".join(x.capitalize() for x in normalize.fold(k).split()) for k in keywords
+    }
+    letters = variant_letters()
+    if not letters:
+        return sorted(folded)
+    return sorted({x for keyword in folded for x in variants(keyword, letters)})
+
+
+# terms whose values the address book search matches, though more loosely
+PUSHED_DOWN = ["org", "city", "country", "job"]
+TERMS = [*PUSHED_DOWN, "name", "has", "label", "problem"]
+PROBLEMS: dict[str, Optional[Category]] = {
+    "any": None,
+    "error": Category.ERROR,
+    "warning": Category.WARNING,
+    "unknown": Category.UNKNOWN,
+}
+
+
+@cache
+def info_fields() -> list[ContactInfoMetadata]:
+    """Return metadata of fields with multiple labeled infos."""
+    return [x.value for x in ContactFields if isinstance(x.value, ContactInfoMetadata)]
+
+
+def find_field(name: str) -> ContactFields:
+    """Return the field with a given name, like `phone` or `phones`."""
+    key = name.strip().upper()
+    for field in ContactFields:
+        if key in (field.name, field.value.key.upper()):
+            return field
+    raise ValueError(f"Unknown field '{name}'.")
+
+
+@lru_cache(maxsize=1 << 10)
+def needles(value: str) -> tuple[str, ...]:
+    """Return folded search variants of a term value."""
+    return tuple(normalize.fold(x) for x in prepare_keywords([value]))
+
+
+def contains(value: str, texts: Iterable[Optional[str]]) -> bool:
+    """Return whether any text contains the term value, or a variant of it."""
+    folded = [normalize.fold(x) for x in texts if x]
+    return any(x in y for x in needles(value) for y in folded)
+
+
+def label_name(label: str) -> str:
+    """Return the folded display name of an info label."""
+    category = Category.from_label(label)
+    if category is not None:
+        return category.name.lower()
+    return normalize.fold(label.removeprefix("_$!<").removesuffix(">!$_"))
+
+
+class Term(NamedTuple):
+    """A single query term, like `org:acme`, `-has:email` or a bare keyword."""
+
+    name: str
+    value: str
+    negated: bool = False
+
+    @property
+    def fields(self) -> frozenset[str]:
+        """Return keys of the contact fields this term reads."""
+        if self.name == "org":
+            return frozenset(["organization"])
+        if self.name in ["city", "country"]:
+            return frozenset(["addresses"])
+        if self.name == "job":
+            return frozenset(["job_title"])
+        if self.name == "has":
+            return frozenset([find_field(self.value).value.key])
+        if self.name == "label":
+            return frozenset(x.key for x in info_fields())
+        return frozenset()
+
+    def matches(self, contact: Contact) -> bool:
+        """Return whether a contact satisfies this term."""
+        return self._matches(contact) != self.negated
+
+    def _matches(self, contact: Contact) -> bool:
+        if self.name == "org":
+            return contains(self.value, [contact.organization])
+        if self.name == "city":
+            return contains(self.value, (x.city for x in contact.addresses))
+        if self.name == "country":
+            return contains(self.value, (x.country for x in contact.addresses))
+        if self.name == "job":
+            return contains(self.value, [contact.job_title])
+        if self.name == "name":
+            return contains(self.value, [contact.name])
+        if self.name == "has":
+            return bool(find_field(self.value).value.get(contact))
+        if self.name == "label":
+            label = normalize.fold(self.value)
+            return any(
+                label_name(y.label) == label
+                for x in info_fields()
+                for y in x.get(contact)
+            )
+        category = PROBLEMS[self.value.lower()]
+        return any(category in (None, x.category) for x in contact.problems)
+
+
+class Query(NamedTuple):
+    """Parsed query, with keywords to search for and terms to filter with."""
+
+    keywords: list[str]
+    terms: list[Term]
+
+    @property
+    def search(self) -> list[str]:
+        """Return the keywords to push down to the address book search.
+
+        Bare keywords are searched for as they are. Otherwise, the value of a
+        term the search matches loosely narrows down what is fetched.
+        """
+        if self.keywords:
+            return self.keywords
+        for term in self.terms:
+            if term.name in PUSHED_DOWN and not term.negated:
+                return [term.value]
+        return []
+
+    @property
+    def fields(self) -> frozenset[str]:
+        """Return keys of the contact fields filters read."""
+        return frozenset(x for term in self.terms for x in term.fields)
+
+    @property
+    def filters(self) -> list[Term]:
+        """Return terms that can be evaluated on fetched contacts."""
+        return [x for x in self.terms if x.name != "problem"]
+
+    @property
+    def problem_filters(self) -> list[Term]:
+        """Return terms that can only be evaluated once contacts are checked."""
+        return [x for x in self.terms if x.name == "problem"]
+
+    def matching(self, contacts: Iterable[Contact]) -> list[Contact]:
+        """Return contacts matching all filters."""
+        return [x for x in contacts if all(y.matches(x) for y in self.filters)]
+
+    def matching_problems(self, contacts: Iterable[Contact]) -> list[Contact]:
+        """Return checked contacts matching all problem filters."""
+        return [x for x in contacts if all(y.matches(x) for y in self.problem_filters)]
+
+
+class Page:
+    """Window of contacts to return, after skipping some of them."""
+
+    def __init__(self, offset: int = 0, limit: Optional[int] = None):
+        """Initialize window.
+
+        :param offset: number of contacts to skip
+        :param limit: maximum number of contacts to return
+        """
+        self.offset = offset
+        self.limit = limit
+
+    @property
+    def full(self) -> bool:
+        """Return whether no more contacts are returned."""
+        return self.limit is not None and self.limit <= 0
+
+    def take(self, contacts: list[Contact]) -> list[Contact]:
+        """Return contacts in the window, and move it past them."""
+        skipped = min(self.offset, len(contacts))
+        self.offset -= skipped
+        taken = contacts[skipped:]
+        if self.limit is not None:
+            taken = taken[: self.limit]
+            self.limit -= len(taken)
+        return taken
+
+
+def parse(args: list[str]) -> Query:
+    """Parse query terms like `org:acme city:berlin has:phone -has:email`.
+
+    Arguments not starting with a known term name are bare keywords, matched
+    by the address book search.
+    """
+    keywords: list[str] = []
+    terms: list[Term] = []
+    for arg in args:
+        term = parse_term(arg)
+        if term is None and arg.startswith("-"):
+            raise ValueError(f"Unknown option or term '{arg}'.")
+        if term is None:
+            keywords.append(arg)
+        else:
+            terms.append(term)
+    return Query(keywords, terms)
+
+
+def parse_term(arg: str) -> Optional[Term]:
+    """Parse a single query term, or return None for a bare keyword."""
+    name, colon, value = arg.removeprefix("-").partition(":")
+    if not colon or name.lower() not in TERMS:
+        return None
+    term = Term(name.lower(), value.strip(), arg.startswith("-"))
+    if not term.value:
+        raise ValueError(f"Missing value for '{arg}'.")
+    if term.name == "has":
+        find_field(term.value)
+    if term.name == "problem" and term.value.lower() not in PROBLEMS:
+        raise ValueError(f"Unknown problem '{term.value}'.")
+    return term
@@ -0,0 +1,344 @@
+"""Recordings of backend calls, to replay runs without the backend.
+
+A recording is a file with a JSON line for each step of each call: its
+result, or the error it raised, and how long it took. Searches take a step
+for each batch they return and a last step for their end, so that runs
+that stop early are recorded as far as they went.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, Callable, Generator, Iterator, Optional, TypeVar
+
+from pydantic import BaseModel
+
+from contacts.address_book import AddressBook
+from contacts.contact import Contact
+
+T = TypeVar("T")
+
+
+class Step(BaseModel):
+    """Result of a call, or of a step of a search."""
+
+    call: int
+    identity: str
+    method: str
+    args: list[Any]
+    seconds: float
+    result: Any = None
+    error: Optional[str] = None
+    end: bool = False
+
+    def key(self) -> str:
+        """Return what tells apart calls of different requests."""
+        return json.dumps([self.identity, self.method, self.args], sort_keys=True)
+
+
+class Recording:
+    """File that steps of calls are appended to as they are made."""
+
+    def __init__(self, path: Path):
+        """Start an empty recording, replacing one at the path."""
+        self.path = path
+        path.write_text("", encoding="utf-8")
+        self._calls = itertools.count()
+        self._lock = threading.Lock()
+
+    def next_call(self) -> int:
+        """Return the number of a new call."""
+        return next(self._calls)
+
+    def append(self, step: Step) -> None:
+        """Write a step."""
+        line = step.model_dump_json(exclude_defaults=True)
+        with self._lock, self.path.open("a", encoding="utf-8") as file:
+            file.write(line + "\n")
+
+
+def load_recording(path: Path) -> dict[str, deque[list[Step]]]:
+    """Return steps of recorded calls by request, in call order."""
+    calls: dict[int, list[Step]] = defaultdict(list)
+    with path.open(encoding="utf-8") as file:
+        for line in file:
+            step = Step.model_validate_json(line)
+            calls[step.call].append(step)
+    requests: dict[str, deque[list[Step]]] = defaultdict(deque)
+    for _, steps in sorted(calls.items()):
+        requests[steps[0].key()].append(steps)
+    return requests
+
+
+class RecorderAddressBook(AddressBook):
+    """Address book that records the calls made to another into a recording."""
+
+    def __init__(self, address_book: AddressBook, recording: Recording):
+        """Initialize with the address book to record the calls of."""
+        self.address_book = address_book
+        self.recording = recording
+
+    def identity(self) -> str:
+        """Return the identity of the recorded address book."""
+        return self.address_book.identity()
+
+    def count(self, keywords: list[str]) -> int:
+        """Return number of contacts matching given keywords."""
+        return self._call(
+            "count", [keywords], lambda: self.address_book.count(keywords)
+        )
+
+    def find(self, keywords: list[str]) -> Iterator[Contact]:
+        """Return list of contact ids matching given keywords."""
+        return self._steps("find", [keywords], self.address_book.find(keywords))
+
+    def find_batches(
+        self, keywords: list[str], *, offset: int = 0, limit: Optional[int] = None
+    ) -> Generator[list[Contact], None, None]:
+        """Return contacts matching given keywords in batches as they are fetched."""
+        return self._steps(
+            "find_batches",
+            [keywords, offset, limit],
+            self.address_book.find_batches(keywords, offset=offset, limit=limit),
+        )
+
+    def get(self, contact_id: str) -> Contact:
+        """Fetch a contact with its id."""
+        return self._call(
+            "get", [contact_id], lambda: self.address_book.get(contact_id)
+        )
+
+    def get_many(self, contact_ids: list[str]) -> list[Contact]:
+        """Fetch contacts with their ids."""
+        return self._call(
+            "get_many", [contact_ids], lambda: self.address_book.get_many(contact_ids)
+        )
+
+    def _update_field(self, contact_id: str, field: str, value: str) -> None:
+        """Add or update a contact field with given value."""
+        self._call(
+            "_update_field",
+            [contact_id, field, value],
+            lambda: self.address_book._update_field(contact_id, field, value),
+        )
+
+    def _delete_field(self, contact_id: str, field: str) -> None:
+        """Delete a contact field."""
+        self._call(
+            "_delete_field",
+            [contact_id, field],
+            lambda: self.address_book._delete_field(contact_id, field),
+        )
+
+    def _update_info(
+        self, contact_id: str, field: str, info_id: str, **values: str
+    ) -> None:
+        """Update a contact info with given label and value."""
+        self._call(
+            "_update_info",
+            [contact_id, field, info_id, values],
+            lambda: self.address_book._update_info(
+                contact_id, field, info_id, **values
+            ),
+        )
+
+    def _add_info(self, contact_id: str, field: str, **values: str) -> None:
+        """Add a contact info."""
+        self._call(
+            "_add_info",
+            [contact_id, field, values],
+            lambda: self.address_book._add_info(contact_id, field, **values),
+        )
+
+    def _delete_info(self, contact_id: str, field: str, info_id: str) -> None:
+        """Delete a contact info."""
+        self._call(
+            "_delete_info",
+            [contact_id, field, info_id],
+            lambda: self.address_book._delete_info(contact_id, field, info_id),
+        )
+
+    def _delete_infos(self, contact_id: str, field: str, info_ids: list[str]) -> None:
+        """Delete multiple contact infos of the same field at once."""
+        self._call(
+            "_delete_infos",
+            [contact_id, field, info_ids],
+            lambda: self.address_book._delete_infos(contact_id, field, info_ids),
+        )
+
+    def _step(self, call: int, method: str, args: list[Any], **values: Any) -> Step:
+        return Step(
+            call=call, identity=self.identity(), method=method, args=args, **values
+        )
+
+    def _call(self, method: str, args: list[Any], call: Callable[[], T]) -> T:
+        """Make a call, recording its result or error."""
+        number = self.recording.next_call()
+        started = time.perf_counter()
+        try:
+            result = call()
+        except Exception as e:
+            seconds = time.perf_counter() - started
+            self.recording.append(
+                self._step(number, method, args, seconds=seconds, error=str(e))
+            )
+            raise
+        seconds = time.perf_counter() - started
+        self.recording.append(
+            self._step(number, method, args, seconds=seconds, result=_dump(result))
+        )
+        return result
+
+    def _steps(
+        self, method: str, args: list[Any], items: Iterator[T]
+    ) -> Generator[T, None, None]:
+        """Return items of a search, recording each as a step."""
+        number = self.recording.next_call()
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    item = next(items)
+                except StopIteration:
+                    seconds = time.perf_counter() - started
+                    self.recording.append(
+                        self._step(number, method, args, seconds=seconds, end=True)
+                    )
+                    return
+                except Exception as e:
+                    seconds = time.perf_counter() - started
+                    self.recording.append(
+                        self._step(number, method, args, seconds=seconds, error=str(e))
+                    )
+                    raise
+                seconds = time.perf_counter() - started
+                self.recording.append(
+                    self._step(
+                        number, method, args, seconds=seconds, result=_dump(item)
+                    )
+                )
+                yield item
+        finally:
+            close = getattr(items, "close", None)
+            if close is not None:
+                close()
+
+
+def _dump(result: Any) -> Any:
+    """Return JSON data of a call result."""
+    if isinstance(result, Contact):
+        return result.model_dump(mode="json", exclude_defaults=True)
+    if isinstance(result, list):
+        return [_dump(x) for x in result]
+    return result
+
+
+class ReplayAddressBook(AddressBook):
+    """Address book that serves the calls of a recording.
+
+    Repeated requests are served by their recorded calls in order, and then
+    by the last of them. Changes are served, but not made.
+    """
+
+    def __init__(
+        self,
+        requests: dict[str, deque[list[Step]]],
+        identity: str,
+        *,
+        latency: float = 0.0,
+    ):
+        """Initialize with recorded calls.
+
+        :param identity: identity of the recorded address book to serve
+        :param latency: ratio of recorded latencies to wait for, none if zero
+        """
+        self.requests = requests
+        self._identity = identity
+        self.latency = latency
+        self._lock = threading.Lock()
+
+    def identity(self) -> str:
+        """Return the identity of the recorded address book."""
+        return self._identity
+
+    def count(self, keywords: list[str]) -> int:
+        """Return number of contacts matching given keywords."""
+        return int(self._call("count", [keywords]))
+
+    def find(self, keywords: list[str]) -> Iterator[Contact]:
+        """Return list of contact ids matching given keywords."""
+        for result in self._steps("find", [keywords]):
+            yield Contact(**result)
+
+    def find_batches(
+        self, keywords: list[str], *, offset: int = 0, limit: Optional[int] = None
+    ) -> Generator[list[Contact], None, None]:
+        """Return contacts matching given keywords in batches as they are fetched."""
+        for result in self._steps("find_batches", [keywords, offset, limit]):
+            yield [Contact(**x) for x in result]
+
+    def get(self, contact_id: str) -> Contact:
+        """Fetch a contact with its id."""
+        return Contact(**self._call("get", [contact_id]))
+
+    def get_many(self, contact_ids: list[str]) -> list[Contact]:
+        """Fetch contacts with their ids."""
+        return [Contact(**x) for x in self._call("get_many", [contact_ids])]
+
+    def _update_field(self, contact_id: str, field: str, value: str) -> None:
+        """Replay a field update."""
+        self._call("_update_field", [contact_id, field, value])
+
+    def _delete_field(self, contact_id: str, field: str) -> None:
+        """Replay a field deletion."""
+        self._call("_delete_field", [contact_id, field])
+
+    def _update_info(
+        self, contact_id: str, field: str, info_id: str, **values: str
+    ) -> None:
+        """Replay an info update."""
+        self._call("_update_info", [contact_id, field, info_id, values])
+
+    def _add_info(self, contact_id: str, field: str, **values: str) -> None:
+        """Replay an info addition."""
+        self._call("_add_info", [contact_id, field, values])
+
+    def _delete_info(self, contact_id: str, field: str, info_id: str) -> None:
+        """Replay an info deletion."""
+        self._call("_delete_info", [contact_id, field, info_id])
+
+    def _delete_infos(self, contact_id: str, field: str, info_ids: list[str]) -> None:
+        """Replay a deletion of multiple infos."""
+        self._call("_delete_infos", [contact_id, field, info_ids])
+
+    def _recorded(self, method: str, args: list[Any]) -> list[Step]:
+        """Return the steps of the next recorded call of a request."""
+        key = json.dumps([self._identity, method, args], sort_keys=True)
+        with self._lock:
+            calls = self.requests.get(key)
+            if not calls:
+                raise RuntimeError(f"No recorded {method} call with {args}")
+            return calls.popleft() if len(calls) > 1 else calls[0]
+
+    def _serve(self, step: Step) -> Any:
+        """Wait for the latency of a step, and return its result."""
+        if self.latency:
+            time.sleep(step.seconds * self.latency)
+        if step.error is not None:
+            raise RuntimeError(step.error)
+        return step.result
+
+    def _call(self, method: str, args: list[Any]) -> Any:
+        return self._serve(self._recorded(method, args)[0])
+
+    def _steps(self, method: str, args: list[Any]) -> Generator[Any, None, None]:
+        for step in self._recorded(method, args):
+            result = self._serve(step)
+            if step.end:
+                return
+            yield result
@@ -0,0 +1,244 @@
+"""Seeded synthetic address books for benchmarks."""
+
+from __future__ import annotations
+
+import random
+from collections import deque
+from typing import Iterator, NamedTuple
+
+from contacts.address_book import AddressBook
+from contacts.contact import Contact, ContactInfo
+
+FIRST_NAMES = [
+    "Amelia", "Bob", "Carla", "Deniz", "Émile", "Fatma", "Gülşen", "Hans",
+    "Ines", "João", "Kemal", "Lena", "Mehmet", "Noémie", "Oscar", "Pınar",
+    "Quinn", "Rosa", "Søren", "Tuğrul", "Ulla", "Víctor", "Wanda", "Xavier",
+    "Yusuf", "Zoë",
+]  # fmt: skip
+SYLLABLES = [
+    "al", "bal", "can", "dor", "er", "fen", "gar", "han", "is", "kar", "lon",
+    "mer", "nus", "ol", "per", "ran", "sen", "tan", "ur", "van", "yıl", "zor",
+    "öz", "çe", "şa", "ün",
+]  # fmt: skip
+ORGANIZATIONS = [
+    "Acme", "Balloon Co.", "Carnival Inc.", "Delta Labs", "Echo Ltd.",
+    "Foxtrot GmbH", "Golf A.Ş.", "Hotel SARL",
+]  # fmt: skip
+DOMAINS = ["example.com", "mail.test", "post.test"]
+DIACRITICS = str.maketrans("aceginosuz", "áçéğíñöşüž")
+RECENT = 1000
+
+
+class Mess(NamedTuple):
+    """Ratios of contacts with each kind of messy data."""
+
+    casing: float = 0.0
+    unlabeled: float = 0.0
+    duplicate_infos: float = 0.0
+    home_pages: float = 0.0
+    malformed_urls: float = 0.0
+    diacritics: float = 0.0
+
+
+CLEAN = Mess()
+MESSY = Mess(
+    casing=0.1,
+    unlabeled=0.1,
+    duplicate_infos=0.05,
+    home_pages=0.05,
+    malformed_urls=0.05,
+    diacritics=0.2,
+)
+
+
+def _last_name(rand: random.Random) -> str:
+    syllables = rand.choices(SYLLABLES, k=rand.randint(2, 3))
+    return "".join(syllables).capitalize()
+
+
+def _phone(rand: random.Random) -> str:
+    return "+1" + "".join(rand.choices("0123456789", k=10))
+
+
+def _person(rand: random.Random, index: int) -> Contact:
+    first_name = rand.choice(FIRST_NAMES)
+    last_name = _last_name(rand)
+    organization = rand.choice(ORGANIZATIONS) if rand.random() < 0.3 else None
+    return Contact(
+        id=f"SYNTHETIC-{index:08d}:ABPerson",
+        name=f"{first_name} {last_name}",
+        first_name=first_name,
+        last_name=last_name,
+        organization=organization,
+        phones=[
+            ContactInfo(
+                id=f"SYNTHETIC-{index:08d}-PHONE-{i}",
+                label="_$!<Mobile>!$_",
+                value=_phone(rand),
+            )
+            for i in range(rand.randint(0, 2))
+        ],
+        emails=[
+            ContactInfo(
+                id=f"SYNTHETIC-{index:08d}-EMAIL-0",
+                label="_$!<Home>!$_",
+                value=f"{first_name}.{last_name}@{rand.choice(DOMAINS)}".lower(),
+            )
+        ],
+    )
+
+
+def typo(rand: random.Random, value: str) -> str:
+    """Swap two adjacent letters of a value, keeping its first letter."""
+    if len(value) < 3:
+        return value
+    i = rand.randrange(1, len(value) - 1)
+    return value[:i] + value[i + 1] + value[i] + value[i + 2 :]
+
+
+def _duplicate(rand: random.Random, original: Contact, index: int) -> Contact:
+    first_name = original.first_name or ""
+    last_name = original.last_name or ""
+    if rand.random() < 0.5:
+        first_name = typo(rand, first_name)
+    phones = [
+        ContactInfo(
+            id=f"SYNTHETIC-{index:08d}-PHONE-{i}",
+            label=x.label,
+            value=f"{x.value[:2]} ({x.value[2:5]}) {x.value[5:8]}-{x.value[8:]}",
+        )
+        for i, x in enumerate(original.phones)
+        if rand.random() < 0.7
+    ]
+    emails = [
+        ContactInfo(
+            id=f"SYNTHETIC-{index:08d}-EMAIL-{i}",
+            label=x.label,
+            value=x.value.upper() if rand.random() < 0.5 else x.value,
+        )
+        for i, x in enumerate(original.emails)
+        if rand.random() < 0.7
+    ]
+    return original.model_copy(
+        update={
+            "id": f"SYNTHETIC-{index:08d}:ABPerson",
+            "name": f"{first_name} {last_name}",
+            "first_name": first_name,
+            "phones": phones,
+            "emails": emails,
+        }
+    )
+
+
+def _mess(rand: random.Random, person: Contact, mess: Mess) -> Contact:
+    """Return a contact with messy data added at the given ratios."""
+    update: dict[str, object] = {}
+    last_name = person.last_name or ""
+    if rand.random() < mess.diacritics:
+        last_name = last_name.translate(DIACRITICS)
+    if rand.random() < mess.casing:
+        last_name = last_name.upper() if rand.random() < 0.5 else last_name.lower()
+    if last_name != person.last_name:
+        update["last_name"] = last_name
+        update["name"] = f"{person.first_name} {last_name}"
+    phones = list(person.phones)
+    if phones and rand.random() < mess.unlabeled:
+        phones[0] = phones[0].model_copy(update={"label": ""})
+    emails = list(person.emails)
+    if rand.random() < mess.duplicate_infos:
+        for infos in [phones, emails]:
+            if infos:
+                infos.append(infos[0].model_copy(update={"id": f"{infos[0].id}-DUPE"}))
+    update["phones"], update["emails"] = phones, emails
+    site = f"{person.first_name}{last_name}".lower()
+    if rand.random() < mess.home_pages:
+        update["home_page"] = f"https://{site}.example.com"
+    if rand.random() < mess.malformed_urls:
+        url = f"{person.id.removesuffix(':ABPerson')}-URL-0"
+        value = rand.choice([f"htp:/{site}", f"www.{site}.test/ path", "https://"])
+        update["urls"] = [ContactInfo(id=url, label="_$!<Home>!$_", value=value)]
+    return person.model_copy(update=update)
+
+
+def generate(
+    size: int, *, seed: int = 0, duplicate_rate: float = 0.1, mess: Mess = CLEAN
+) -> Iterator[Contact]:
+    """Generate a reproducible population of contacts.
+
+    Messy data is added with randomness of its own, so that the same people
+    are generated with and without it.
+
+    :param duplicate_rate: ratio of contacts that repeat an earlier person
+    :param mess: ratios of contacts with each kind of messy data
+    """
+    rand = random.Random(seed)  # nosec B311
+    messy = random.Random(seed + 1) if mess != CLEAN else None  # nosec B311
+    recent: deque[Contact] = deque(maxlen=RECENT)
+    for index in range(size):
+        if recent and rand.random() < duplicate_rate:
+            person = _duplicate(rand, rand.choice(recent), index)
+        else:
+            person = _person(rand, index)
+            recent.append(person)
+        yield person if messy is None else _mess(messy, person, mess)
+
+
+class SyntheticAddressBook(AddressBook):
+    """Address book of generated contacts, made as they are fetched.
+
+    Keywords match contacts with a name containing them. Changes are counted,
+    but not made.
+    """
+
+    def __init__(self, size: int, *, seed: int = 0, mess: Mess = CLEAN):
+        """Initialize with the number of contacts to generate.
+
+        :param mess: ratios of contacts with each kind of messy data
+        """
+        self.size = size
+        self.seed = seed
+        self.mess = mess
+        self.changes = 0
+
+    def count(self, keywords: list[str]) -> int:
+        """Return number of contacts matching given keywords."""
+        if not keywords:
+            return self.size
+        return sum(1 for _ in self.find(keywords))
+
+    def find(self, keywords: list[str]) -> Iterator[Contact]:
+        """Return contacts matching given keywords."""
+        needles = [x.lower() for x in keywords]
+        for contact in generate(self.size, seed=self.seed, mess=self.mess):
+            name = contact.name.lower()
+            if not needles or any(x in name for x in needles):
+                yield contact
+
+    def get(self, contact_id: str) -> Contact:
+        """Fetch a contact with its id, generating contacts up to it."""
+        for contact in self.find([]):
+            if contact.id == contact_id:
+                return contact
+        raise RuntimeError(f"Contact not found {contact_id}")
+
+    def _update_field(self, contact_id: str, field: str, value: str) -> None:
+        """Count a field update."""
+        self.changes += 1
+
+    def _delete_field(self, contact_id: str, field: str) -> None:
+        """Count a field deletion."""
+        self.changes += 1
+
+    def _update_info(
+        self, contact_id: str, field: str, info_id: str, **values: str
+    ) -> None:
+        """Count an info update."""
+        self.changes += 1
+
+    def _add_info(self, contact_id: str, field: str, **values: str) -> None:
+        """Count an info addition."""
+        self.changes += 1
+
+    def _delete_info(self, contact_id: str, field: str, info_id: str) -> None:
+        """Count an info deletion."""
+        self.changes += 1
@@ -0,0 +1,111 @@
+"""Timers of the stages of a run, to find out where its time goes.
+
+Timers record nothing until started, so that timed code costs next to
+nothing in normal runs. A started run may also be profiled with cProfile,
+on each thread that runs timed work.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import math
+import pstats
+import time
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Iterator, NamedTuple, Optional
+
+_durations: Optional[dict[str, list[float]]] = None
+_profiles: Optional[list[cProfile.Profile]] = None
+
+
+class Summary(NamedTuple):
+    """Durations of a stage, in seconds."""
+
+    name: str
+    calls: int
+    total: float
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+
+
+def start(*, profile: bool = False) -> None:
+    """Start recording durations of timed stages.
+
+    :param profile: also profile the current thread and threads of timed work
+    """
+    global _durations, _profiles
+    _durations = {}
+    _profiles = None
+    if profile:
+        _profiles = [cProfile.Profile()]
+        _profiles[0].enable()
+
+
+def stop() -> list[Summary]:
+    """Stop recording and return the summary of each stage, slowest first."""
+    global _durations
+    durations = _durations or {}
+    _durations = None
+    if _profiles:
+        _profiles[0].disable()
+    summaries = [summarize(name, values) for name, values in durations.items()]
+    return sorted(summaries, key=lambda x: x.total, reverse=True)
+
+
+def dump(path: Path) -> None:
+    """Write the profile of the run, to be read with pstats."""
+    if _profiles:
+        pstats.Stats(*_profiles).dump_stats(path)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Record the duration of a stage, if recording."""
+    durations = _durations
+    if durations is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        durations.setdefault(name, []).append(time.perf_counter() - started)
+
+
+def threaded(target: Callable[..., Any]) -> Callable[..., Any]:
+    """Return a thread target that is profiled along with the run."""
+
+    @wraps(target)
+    def run(*args: Any, **kwargs: Any) -> Any:
+        profiles = _profiles
+        if profiles is None:
+            return target(*args, **kwargs)
+        profile = cProfile.Profile()
+        profiles.append(profile)
+        return profile.runcall(target, *args, **kwargs)
+
+    return run
+
+
+def summarize(name: str, durations: list[float]) -> Summary:
+    """Return the summary of durations of a stage."""
+    values = sorted(durations)
+    total = math.fsum(values)
+    return Summary(
+        name,
+        len(values),
+        total,
+        total / len(values),
+        _percentile(values, 0.5),
+        _percentile(values, 0.95),
+        _percentile(values, 0.99),
+    )
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    """Return the nearest rank percentile of sorted values."""
+    return values[max(math.ceil(fraction * len(values)) - 1, 0)]
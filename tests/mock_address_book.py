@@ -2,7 +2,7 @@
 
 import json
 from pathlib import Path
-from typing import Iterator
+from typing import AbstractSet, Iterator, Optional
 
 from contacts.address_book import AddressBook
 from contacts.contact import Contact
@@ -78,3 +78,61 @@ class MockAddressBook(AddressBook):
     def _delete_info(self, contact_id: str, field: str, info_id: str) -> None:
         """Delete a contact info."""
         self.deletes.append((contact_id, field, info_id))
+
+
+class ProjectedAddressBook(AddressBook):
+    """Mock address book returning only the fields fetched, as the backend does."""
+
+    def __init__(
+        self,
+        address_book: AddressBook,
+        brief: bool,
+        fields: Optional[AbstractSet[str]] = None,
+    ):
+        """Initialize with the address book to project contacts of."""
+        self.address_book = address_book
+        self.fields: Optional[set[str]] = None
+        if brief:
+            self.fields = {"is_company"}
+        elif fields is not None:
+            self.fields = set(fields)
+
+    def count(self, keywords: list[str]) -> int:
+        """Return number of contacts matching given keywords."""
+        return self.address_book.count(keywords)
+
+    def find(self, keywords: list[str]) -> Iterator[Contact]:
+        """Return contacts matching given keywords, with fetched fields only."""
+        return (self._project(x) for x in self.address_book.find(keywords))
+
+    def get(self, contact_id: str) -> Contact:
+        """Fetch a contact with its id, with all of its fields."""
+        return self.address_book.get(contact_id)
+
+    def _project(self, contact: Contact) -> Contact:
+        """Return a contact with only its id, name and fetched fields."""
+        if self.fields is None:
+            return contact
+        return Contact(**contact.model_dump(include={"id", "name", *self.fields}))
+
+    def _update_field(self, contact_id: str, field: str, value: str) -> None:
+        """Update a contact field with given value."""
+        self.address_book._update_field(contact_id, field, value)
+
+    def _delete_field(self, contact_id: str, field: str) -> None:
+        """Delete a contact field."""
+        self.address_book._delete_field(contact_id, field)
+
+    def _update_info(
+        self, contact_id: str, field: str, info_id: str, **values: str
+    ) -> None:
+        """Update a contact info with given label and value."""
+        self.address_book._update_info(contact_id, field, info_id, **values)
+
+    def _add_info(self, contact_id: str, field: str, **values: str) -> None:
+        """Add a contact info."""
+        self.address_book._add_info(contact_id, field, **values)
+
+    def _delete_info(self, contact_id: str, field: str, info_id: str) -> None:
+        """Delete a contact info."""
+        self.address_book._delete_info(contact_id, field, info_id)
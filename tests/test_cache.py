@@ -0,0 +1,158 @@
+"""Unittests for cache."""
+
+from pathlib import Path
+
+import pytest
+
+from contacts import cache
+from contacts.cache import CachedAddressBook, MemoryQueryCache, QueryCache
+from tests.mock_address_book import MockAddressBook
+
+
+@pytest.fixture(autouse=True)
+def cache_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Fixture to keep cached results in a temporary directory."""
+    path = tmp_path / "cache"
+    monkeypatch.setattr(cache, "CACHE_PATH", path)
+    return path
+
+
+@pytest.fixture
+def mock_address_book(request: pytest.FixtureRequest) -> MockAddressBook:
+    """Fixture for mock address book."""
+    mock = MockAddressBook(request.path.parent / "data")
+    mock.provide("bob", "bobby", "errona")
+    return mock
+
+
+def test_hit(mock_address_book: MockAddressBook) -> None:
+    """Test results being reused by later runs."""
+    address_book = CachedAddressBook(mock_address_book, QueryCache(ttl=60, size=8))
+    assert address_book.count(["Bob"]) == 3
+    assert len(list(address_book.find(["Bob"]))) == 3
+
+    mock_address_book.error()
+    query_cache = QueryCache(ttl=60, size=8)
+    address_book = CachedAddressBook(mock_address_book, query_cache)
+    assert address_book.count(["Bob"]) == 3
+    assert [x.name for x in address_book.find(["Bob"])] == [
+        "Bob Balloon",
+        "Bobby Balon",
+        "Errona Tragedia",
+    ]
+    assert (query_cache.hits, query_cache.misses) == (2, 0)
+    with pytest.raises(RuntimeError):
+        address_book.count(["Bobby"])
+    assert (query_cache.hits, query_cache.misses) == (2, 1)
+
+
+def test_expired(mock_address_book: MockAddressBook) -> None:
+    """Test results not being reused after they expire or with no TTL."""
+    address_book = CachedAddressBook(mock_address_book, QueryCache(ttl=60, size=8))
+    address_book.count(["Bob"])
+
+    mock_address_book.error()
+    address_book = CachedAddressBook(mock_address_book, QueryCache(ttl=-1, size=8))
+    with pytest.raises(RuntimeError):
+        address_book.count(["Bob"])
+
+
+def test_evict(mock_address_book: MockAddressBook, cache_path: Path) -> None:
+    """Test least recently used results being evicted."""
+    query_cache = QueryCache(ttl=60, size=2)
+    address_book = CachedAddressBook(mock_address_book, query_cache)
+    address_book.count(["A"])
+    address_book.count(["B"])
+    address_book.count(["A"])
+    address_book.count(["C"])
+    assert len(list(cache_path.iterdir())) == 2
+    assert (query_cache.hits, query_cache.misses) == (1, 3)
+
+    mock_address_book.error()
+    assert address_book.count(["A"]) == 3
+    assert address_book.count(["C"]) == 3
+    with pytest.raises(RuntimeError):
+        address_book.count(["B"])
+
+
+def test_fresh(mock_address_book: MockAddressBook) -> None:
+    """Test runs that change contacts fetching them, and dropping cached results."""
+    query_cache = QueryCache(ttl=60, size=8)
+    CachedAddressBook(mock_address_book, query_cache).count(["Bob"])
+
+    address_book = CachedAddressBook(mock_address_book, query_cache, fresh=True)
+    assert address_book.count(["Bob"]) == 3
+    assert len(list(address_book.find(["Bob"]))) == 3
+    assert (query_cache.hits, query_cache.misses) == (0, 1)
+    address_book.update_note("ID", "NOTE")
+    assert query_cache.clears == 1
+
+
+def test_private(mock_address_book: MockAddressBook, cache_path: Path) -> None:
+    """Test cached results being readable by their owner only."""
+    cache_path.mkdir(mode=0o755)
+    address_book = CachedAddressBook(mock_address_book, QueryCache(ttl=60, size=8))
+    address_book.count(["Bob"])
+    assert cache_path.stat().st_mode & 0o777 == 0o700
+    assert [x.stat().st_mode & 0o777 for x in cache_path.iterdir()] == [0o600]
+
+
+def test_invalidate(mock_address_book: MockAddressBook) -> None:
+    """Test changes dropping all results, and the results fetched meanwhile."""
+    address_book = CachedAddressBook(mock_address_book, QueryCache(ttl=60, size=8))
+    address_book.count(["Bob"])
+    for _ in address_book.find(["Bob"]):
+        address_book.update_note("ID", "NOTE")
+    assert mock_address_book.updates == [("ID", "note", "NOTE")] * 3
+
+    mock_address_book.error()
+    with pytest.raises(RuntimeError):
+        address_book.count(["Bob"])
+    with pytest.raises(RuntimeError):
+        list(address_book.find(["Bob"]))
+
+
+def test_window(mock_address_book: MockAddressBook) -> None:
+    """Test windows of a search being cached apart from the whole search."""
+    address_book = CachedAddressBook(mock_address_book, QueryCache(ttl=60, size=8))
+    batches = list(address_book.find_batches(["Bob"], offset=1, limit=1))
+    assert [x.name for batch in batches for x in batch] == ["Bobby Balon"]
+
+    mock_address_book.error()
+    batches = list(address_book.find_batches(["Bob"], offset=1, limit=1))
+    assert [x.name for batch in batches for x in batch] == ["Bobby Balon"]
+    with pytest.raises(RuntimeError):
+        list(address_book.find_batches(["Bob"]))
+
+
+def test_large(
+    mock_address_book: MockAddressBook, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test large find results not being cached."""
+    monkeypatch.setattr(cache, "MAX_CONTACTS", 2)
+    address_book = CachedAddressBook(mock_address_book, QueryCache(ttl=60, size=8))
+    assert len(list(address_book.find(["Bob"]))) == 3
+    assert len(list(address_book.find_batches(["Bob"], limit=2))) == 1
+
+    mock_address_book.error()
+    assert len(list(address_book.find_batches(["Bob"], limit=2))) == 1
+    with pytest.raises(RuntimeError):
+        list(address_book.find(["Bob"]))
+
+
+def test_memory(mock_address_book: MockAddressBook) -> None:
+    """Test results kept in memory without the problems found on them."""
+    address_book = CachedAddressBook(
+        mock_address_book, MemoryQueryCache(ttl=60, size=8)
+    )
+    found = list(address_book.find(["Bob"]))
+    assert found[-1].problems
+
+    mock_address_book.error()
+    cached = list(address_book.find(["Bob"]))
+    assert [x.name for x in cached] == [x.name for x in found]
+    assert not any(x.is_checked(y) for x in cached for y in found[-1]._results)
+    assert cached[-1] is not found[-1]
+    assert [x.message for x in cached[-1].problems] == [
+        x.message for x in found[-1].problems
+    ]
@@ -1,12 +1,13 @@
 """Unittests for contact_diff."""
 
 from pathlib import Path
+from typing import Optional
 
 import email_validator
 import pytest
 
 from contacts.category import Category
-from contacts.checks import url_check
+from contacts.checks import Checks, select_checks, url_check
 from contacts.contact import Contact, ContactAddress, ContactInfo, ContactSocialProfile
 from contacts.problem import Problem
 from tests.mock_address_book import MockAddressBook
@@ -630,3 +631,154 @@ def test_duplicate_instant_messages(
     assert sorted(mock_address_book.updates) == []
     assert sorted(mock_address_book.adds) == []
     assert sorted(mock_address_book.deletes) == [("ID", "instant_messages", "IID3")]
+
+
+def test_duplicate_phones_normalized(
+    problem_checker: ProblemChecker, mock_address_book: MockAddressBook
+) -> None:
+    """Test duplicate phones differing only in formatting."""
+    contact = Contact(
+        id="ID",
+        name="NAME",
+        phones=[
+            ContactInfo(id="PID1", label="mobile", value="+1 817 200 0001"),
+            ContactInfo(id="PID2", label="_$!<Mobile>!$_", value="+18172000001"),
+            ContactInfo(id="PID3", label="_$!<Home>!$_", value="+1 (817) 200-0001"),
+        ],
+    )
+    # only the phone check problems on formatting and labels are expected
+    problems = [x for x in contact.problems if "duplicate" in x.message]
+    assert [x.message for x in problems] == ["Phone '+18172000001' has duplicate(s)."]
+    problems[0].try_fix(mock_address_book)
+    assert sorted(mock_address_book.deletes) == [
+        ("ID", "phones", "PID1"),
+        ("ID", "phones", "PID3"),
+    ]
+
+
+def test_duplicate_emails_case(
+    problem_checker: ProblemChecker, mock_address_book: MockAddressBook
+) -> None:
+    """Test duplicate e-mails differing only in casing."""
+    contact = Contact(
+        id="ID",
+        name="NAME",
+        emails=[
+            ContactInfo(id="EID1", label="_$!<Home>!$_", value="bob@x.com"),
+            ContactInfo(id="EID2", label="_$!<Work>!$_", value="Bob@X.com"),
+        ],
+    )
+    problems = [x for x in contact.problems if "duplicate" in x.message]
+    assert [x.message for x in problems] == ["E-mail 'bob@x.com' has duplicate(s)."]
+    problems[0].try_fix(mock_address_book)
+    assert sorted(mock_address_book.deletes) == [("ID", "emails", "EID2")]
+
+
+def test_duplicate_urls_canonical(
+    problem_checker: ProblemChecker, mock_address_book: MockAddressBook
+) -> None:
+    """Test duplicate URLs differing only in host casing and end slash."""
+    contact = Contact(
+        id="ID",
+        name="NAME",
+        urls=[
+            ContactInfo(id="UID1", label="_$!<HomePage>!$_", value="http://h.com"),
+            ContactInfo(id="UID2", label="_$!<HomePage>!$_", value="http://H.com/"),
+        ],
+    )
+    problem = problem_checker.problem(contact)
+    assert problem.message == "URL 'http://h.com' has duplicate(s)."
+    assert sorted(mock_address_book.deletes) == [("ID", "urls", "UID2")]
+
+
+def test_duplicate_addresses_folded(
+    problem_checker: ProblemChecker, mock_address_book: MockAddressBook
+) -> None:
+    """Test duplicate addresses differing in diacritics and punctuation."""
+    contact = Contact(
+        id="ID",
+        name="NAME",
+        addresses=[
+            ContactAddress(id="AID1", label="_$!<Home>!$_", value="Çiçek Sk. 1"),
+            ContactAddress(id="AID2", label="_$!<Home>!$_", value="cicek sk 1"),
+        ],
+    )
+    problem = problem_checker.problem(contact)
+    assert problem.message == "Address 'Çiçek Sk. 1' has duplicate(s)."
+    assert sorted(mock_address_book.deletes) == [("ID", "addresses", "AID2")]
+
+
+def test_check_many(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test checking a batch of contacts resolving each host once."""
+    resolved: list[tuple[str, Optional[int]]] = []
+
+    def is_reachable(address: tuple[str, Optional[int]]) -> bool:
+        resolved.append(address)
+        return address[0] != "unreachable.com"
+
+    monkeypatch.setattr(url_check, "is_reachable", is_reachable)
+    contacts = [
+        Contact(
+            id=f"ID{i}",
+            name="NAME",
+            phones=[ContactInfo(id="PID", label="_$!<Mobile>!$_", value="+1 111")],
+            emails=[ContactInfo(id="EID", label="_$!<Home>!$_", value="a@H.com")],
+            urls=[
+                ContactInfo(id="UID1", label="_$!<HomePage>!$_", value="http://h.com"),
+                ContactInfo(
+                    id="UID2",
+                    label="_$!<HomePage>!$_",
+                    value="http://unreachable.com",
+                ),
+            ],
+        )
+        for i in range(3)
+    ]
+    Contact.check_all(contacts)
+    assert sorted(resolved) == [("h.com", None), ("unreachable.com", None)]
+    for contact in contacts:
+        assert [x.message for x in contact.problems] == [
+            "Phone number '+1 111' should be '+1111'.",
+            "E-mail 'a@H.com' should be 'a@h.com'.",
+            "URL 'http://unreachable.com' is not reachable.",
+        ]
+
+
+def test_select_checks() -> None:
+    """Test selecting checks by field or check name."""
+    assert select_checks(["phone", "email_check"]) == [
+        Checks.PHONE_LABEL_CHECK,
+        Checks.PHONE_CHECK,
+        Checks.PHONE_DUPE_CHECK,
+        Checks.EMAIL_CHECK,
+    ]
+    with pytest.raises(ValueError, match="Unknown check 'spelling'."):
+        select_checks(["spelling"])
+
+
+def test_reuse_problems(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test re-checking only the checks reading changed fields."""
+    before = Contact(
+        id="ID",
+        name="NAME",
+        phones=[ContactInfo(id="PID", label="_$!<Mobile>!$_", value="+1 111")],
+        emails=[ContactInfo(id="EID", label="_$!<Home>!$_", value="a@H.com")],
+    )
+    Contact.check_all([before])
+    after = Contact(
+        id="ID",
+        name="NAME",
+        phones=[ContactInfo(id="PID", label="_$!<Mobile>!$_", value="+1111")],
+        emails=[ContactInfo(id="EID", label="_$!<Home>!$_", value="a@H.com")],
+    )
+    after.reuse_problems(before, {"phones"})
+    assert after.is_checked(Checks.EMAIL_CHECK.value)
+    assert not after.is_checked(Checks.PHONE_CHECK.value)
+
+    def check(_: Contact) -> list[Problem]:
+        raise AssertionError("e-mails re-checked")
+
+    monkeypatch.setattr(Checks.EMAIL_CHECK.value, "check", check)
+    assert [x.message for x in after.problems] == [
+        "E-mail 'a@H.com' should be 'a@h.com'.",
+    ]
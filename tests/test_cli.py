@@ -2,17 +2,24 @@
 
 import importlib
 import json
+import os
+import subprocess  # nosec B404
+import sys
+import threading
 from pathlib import Path
+from typing import Any, Sequence
 
 import email_validator
 import pytest
 from typer.testing import CliRunner
 
-from contacts import cli, config
+from contacts import address_book, cache, cli, complete, config, executor, index
 from contacts.checks import url_check
 from contacts.contact import Contact
+from contacts.executor import CheckExecutor
+from contacts.problem import Problem
 from tests.contact_diff import ContactDiff
-from tests.mock_address_book import MockAddressBook
+from tests.mock_address_book import MockAddressBook, ProjectedAddressBook
 
 runner = CliRunner()
 
@@ -29,6 +36,10 @@ def environment() -> None:
 def cfg(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> config.Config:
     """Initialize the test configuration."""
     monkeypatch.setattr(config, "CONFIG_PATH", tmp_path / "config.json")
+    monkeypatch.setattr(index, "SNAPSHOT_PATH", tmp_path / "snapshot.json")
+    monkeypatch.setattr(cache, "CACHE_PATH", tmp_path / "cache")
+    monkeypatch.setattr(complete, "ENTRIES_PATH", tmp_path / "completion.json")
+    monkeypatch.setattr(complete, "PREFIX_PATH", tmp_path / "completion.txt")
     cfg = config.Config()
     cfg.dump()
     importlib.reload(cli)
@@ -79,7 +90,9 @@ def test_config_show() -> None:
     assert result.exit_code == 0
     assert result.stdout.strip().split("\n") == [
         "{",
-        '    "romanize": "öøÑ"',
+        '    "romanize": "öøÑ",',
+        '    "cache_ttl": 0.0,',
+        '    "cache_size": 32',
         "}",
     ]
 
@@ -161,6 +174,43 @@ def test_fix_warnings(data_path: Path, mock_address_book: MockAddressBook) -> No
     assert sorted(mock_address_book.deletes) == sorted(diff.deletes)
 
 
+def test_plan_and_apply(
+    tmp_path: Path, data_path: Path, mock_address_book: MockAddressBook
+) -> None:
+    """Test writing fixes to a plan and applying it later."""
+    mock_address_book.provide("warnen")
+    plan = tmp_path / "plan.json"
+    result = runner.invoke(cli.app, ["main", "--plan", str(plan)])
+    assert result.exit_code == 0
+    assert not mock_address_book.updates
+    assert plan.is_file()
+
+    result = runner.invoke(cli.app, ["apply", str(plan)])
+    assert result.exit_code == 0
+    assert result.stdout.rstrip().startswith("Applied ")
+    before = Contact.load(data_path / "warnen.json")
+    after = Contact.load(data_path / "warnen.fixed.json")
+    diff = ContactDiff(before, after)
+    assert sorted(mock_address_book.updates) == sorted(diff.updates)
+    assert sorted(mock_address_book.adds) == sorted(diff.adds)
+    assert sorted(mock_address_book.deletes) == sorted(diff.deletes)
+
+    result = runner.invoke(cli.app, ["apply", str(plan)])
+    assert result.exit_code == 0
+    assert len(mock_address_book.updates) == len(diff.updates)
+
+
+def test_apply_invalid(tmp_path: Path) -> None:
+    """Test reporting plans that are missing or not valid."""
+    result = runner.invoke(cli.app, ["apply", str(tmp_path / "none.json")])
+    assert result.exit_code == 2
+
+    plan = tmp_path / "plan.json"
+    plan.write_text("not a plan", encoding="utf-8")
+    result = runner.invoke(cli.app, ["apply", str(plan)])
+    assert result.exit_code == 2
+
+
 def test_errors(mock_address_book: MockAddressBook) -> None:
     """Test reporting errors."""
     mock_address_book.provide("errona")
@@ -192,6 +242,23 @@ def test_detail_multiple(data_path: Path, mock_address_book: MockAddressBook) ->
     assert result.stdout.strip() == expected_output
 
 
+def test_plain(mock_address_book: MockAddressBook) -> None:
+    """Test plain text output matching the rich listing, and plain details."""
+    mock_address_book.provide("bob", "bobby")
+    plain = runner.invoke(cli.app, "main --plain")
+    rich = runner.invoke(cli.app, "main --rich")
+    assert plain.exit_code == rich.exit_code == 0
+    assert plain.stdout.split() == rich.stdout.split()
+
+    mock_address_book.provide("bobby")
+    result = runner.invoke(cli.app, "main --detail --plain")
+    assert result.exit_code == 0
+    lines = [x.split("\t") for x in result.stdout.strip().split("\n")]
+    assert lines[0] == ["Bobby Balon", "First name", "Bobby"]
+    assert all(len(x) == 3 and x[0] == "Bobby Balon" for x in lines)
+    assert ["Bobby Balon", "Problems"] in [x[:2] for x in lines]
+
+
 def test_detail_warnings(data_path: Path, mock_address_book: MockAddressBook) -> None:
     """Test warnings on detail."""
     mock_address_book.provide("warnen")
@@ -221,3 +288,365 @@ def test_json(data_path: Path, mock_address_book: MockAddressBook) -> None:
     ]
     expected = json.dumps({"contacts": contacts}, indent=4, ensure_ascii=False)
     assert result.stdout.strip() == expected
+
+
+def test_json_empty() -> None:
+    """Test JSON output with no contacts."""
+    result = runner.invoke(cli.app, "main --json")
+    assert result.exit_code == 0
+    assert json.loads(result.stdout) == {"contacts": []}
+
+
+def test_ndjson(data_path: Path, mock_address_book: MockAddressBook) -> None:
+    """Test a JSON document per contact, with problems when checked."""
+    mock_address_book.provide("amelie", "bob")
+    result = runner.invoke(cli.app, "main --ndjson")
+    assert result.exit_code == 0
+    assert [json.loads(x) for x in result.stdout.splitlines() if x] == [
+        json.loads(Path(data_path / x).read_text(encoding="utf-8"))
+        for x in ["amelie.json", "bob.json"]
+    ]
+
+    mock_address_book.provide("errona")
+    result = runner.invoke(cli.app, "main --ndjson --check")
+    assert result.exit_code == 0
+    (line,) = result.stdout.strip().splitlines()
+    problems = json.loads(line)["problems"]
+    assert problems
+    assert {x["category"] for x in problems} <= {"error", "warning", "unknown"}
+
+    result = runner.invoke(cli.app, "main --json --ndjson")
+    assert result.exit_code == 2
+
+
+def test_dupes(mock_address_book: MockAddressBook) -> None:
+    """Test finding duplicate people across contacts."""
+    mock_address_book.provide("amelie", "bob", "bobby", "carnival")
+    result = runner.invoke(cli.app, "dupes")
+    assert result.exit_code == 0
+    assert result.stdout.rstrip().split("\n") == [
+        "👥 0.87 Bob Balloon, Bobby Balon",
+    ]
+
+
+def test_selected_checks(
+    mock_address_book: MockAddressBook, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test running only selected checks, fetching only the fields they read."""
+    requested: dict[str, Any] = {}
+
+    def get_address_book(**kwargs: Any) -> MockAddressBook:
+        requested.update(kwargs)
+        return mock_address_book
+
+    monkeypatch.setattr(cli, "get_address_book", get_address_book)
+    mock_address_book.provide("warnen", "errona")
+    result = runner.invoke(cli.app, "main --checks phone,email_check")
+    assert result.exit_code == 0
+    assert requested["fields"] == {"phones", "emails"}
+    assert result.stdout.rstrip().split("\n") == [
+        "⚠️  dr. warnen bitte sanft jr.",
+        "⛔ Errona Tragedia",
+    ]
+
+
+def test_unknown_check() -> None:
+    """Test selecting a check that does not exist."""
+    result = runner.invoke(cli.app, "main --checks phone,spelling")
+    assert result.exit_code == 2
+
+
+def test_network_problems(
+    mock_address_book: MockAddressBook, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test reporting network problems after the contacts are listed."""
+    monkeypatch.setattr(url_check, "is_reachable", lambda _: False)
+    mock_address_book.provide("errona", "amelie")
+    result = runner.invoke(cli.app, "main --check")
+    assert result.exit_code == 0
+    assert result.stdout.rstrip().split("\n") == [
+        "⛔ Errona Tragedia",
+        "👤 Ms. Amelia Avery Arch.",
+        "⛔ Errona Tragedia: URL 'https://www.tragedia.net' is not reachable.",
+        "⛔ Ms. Amelia Avery Arch.: URL 'https://www.avery.com' is not reachable.",
+    ]
+
+
+def test_network_problems_order(
+    mock_address_book: MockAddressBook, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test printing network problems only once their contacts are written."""
+    monkeypatch.setattr(url_check, "is_reachable", lambda _: False)
+    monkeypatch.setattr(address_book, "BATCH_SIZE", 1)
+    all_submitted = threading.Event()
+
+    class AheadExecutor(CheckExecutor):
+        """Executor checking all contacts before the first is settled."""
+
+        submitted = 0
+
+        def submit(self, contacts: Sequence[Contact]) -> None:
+            super().submit(contacts)
+            self.submitted += len(contacts)
+            if self.submitted == 2:
+                all_submitted.set()
+
+        def settle(self, wait: bool = False) -> list[tuple[Contact, list[Problem]]]:
+            all_submitted.wait(timeout=5)
+            return super().settle(wait=True)
+
+    monkeypatch.setattr(executor, "CheckExecutor", AheadExecutor)
+    mock_address_book.provide("errona", "amelie")
+    result = runner.invoke(cli.app, "main --check")
+    assert result.exit_code == 0
+    assert result.stdout.rstrip().split("\n") == [
+        "⛔ Errona Tragedia",
+        "⛔ Errona Tragedia: URL 'https://www.tragedia.net' is not reachable.",
+        "⛔ Ms. Amelia Avery Arch.",
+        "⛔ Ms. Amelia Avery Arch.: URL 'https://www.avery.com' is not reachable.",
+    ]
+
+
+def test_query_terms(
+    mock_address_book: MockAddressBook, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test filtering with terms, fetching only the fields they read."""
+    requested: list[dict[str, Any]] = []
+
+    def get_address_book(**kwargs: Any) -> MockAddressBook:
+        requested.append(kwargs)
+        return mock_address_book
+
+    monkeypatch.setattr(cli, "get_address_book", get_address_book)
+    mock_address_book.provide("amelie", "bob", "errona")
+    result = runner.invoke(cli.app, ["main", "-has:email"])
+    assert result.exit_code == 0
+    assert requested[-1]["fields"] == {"emails"}
+    assert result.stdout.rstrip().split("\n") == ["👤 Bob Balloon"]
+
+    result = runner.invoke(cli.app, ["main", "city:arlington", "--detail"])
+    assert result.exit_code == 0
+    assert [x["fields"] for x in requested[-2:]] == [None, {"addresses"}]
+    assert "Ms. Amelia Avery" in result.stdout
+    assert "Errona" not in result.stdout
+
+    result = runner.invoke(cli.app, ["main", "problem:error", "--check"])
+    assert result.exit_code == 0
+    assert result.stdout.rstrip().split("\n")[0] == "⛔ Errona Tragedia"
+
+
+def test_problem_terms(
+    mock_address_book: MockAddressBook, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test filtering by problems, fetching the fields that checks read."""
+    monkeypatch.setattr(
+        cli,
+        "get_address_book",
+        lambda brief, batch, fields=None: ProjectedAddressBook(
+            mock_address_book, brief, fields
+        ),
+    )
+    mock_address_book.provide("amelie", "bob", "errona")
+    result = runner.invoke(cli.app, ["main", "problem:error"])
+    assert result.exit_code == 0
+    assert result.stdout.rstrip().split("\n") == ["⛔ Errona Tragedia"]
+
+    result = runner.invoke(cli.app, ["main", "problem:error", "--checks", "phone"])
+    assert result.exit_code == 0
+    assert result.stdout.split("\n")[0] == "⛔ Errona Tragedia"
+
+
+def test_limit(
+    mock_address_book: MockAddressBook, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test showing a window of contacts, without counting them all."""
+
+    def count(_: list[str]) -> int:
+        raise AssertionError("counted")
+
+    monkeypatch.setattr(mock_address_book, "count", count)
+    mock_address_book.provide("amelie", "bob", "bobby", "errona")
+    result = runner.invoke(cli.app, "main --limit 2")
+    assert result.exit_code == 0
+    assert result.stdout.rstrip().split("\n") == [
+        "👤 Ms. Amelia Avery Arch.",
+        "👤 Bob Balloon",
+    ]
+
+    result = runner.invoke(cli.app, "main --offset 1 --limit 2")
+    assert result.exit_code == 0
+    assert result.stdout.rstrip().split("\n") == [
+        "👤 Bob Balloon",
+        "⚠️  Bobby Balon",
+    ]
+
+    result = runner.invoke(
+        cli.app, ["main", "has:email", "--offset", "1", "--limit", "1"]
+    )
+    assert result.exit_code == 0
+    assert result.stdout.rstrip().split("\n") == ["⛔ Errona Tragedia"]
+
+
+def test_unknown_term() -> None:
+    """Test reporting unknown terms."""
+    result = runner.invoke(cli.app, ["main", "has:feet"])
+    assert result.exit_code == 2
+
+
+def test_fuzzy(mock_address_book: MockAddressBook) -> None:
+    """Test finding contacts with typos in an indexed snapshot."""
+    mock_address_book.provide("bob", "bobby", "errona")
+    result = runner.invoke(cli.app, "main Balon --fuzzy")
+    assert result.exit_code == 2
+
+    result = runner.invoke(cli.app, "index")
+    assert result.exit_code == 0
+    assert result.stdout.rstrip() == "Indexed 3 contacts."
+    assert cli.complete_keywords("bal") == ["Bob Balloon", "Bobby Balon"]
+
+    result = runner.invoke(cli.app, "main Erona --fuzzy")
+    assert result.exit_code == 0
+    assert result.stdout.rstrip().split("\n") == ["⛔ Errona Tragedia"]
+
+    result = runner.invoke(cli.app, "main Balon --fuzzy --top 1")
+    assert result.exit_code == 0
+    assert result.stdout.rstrip().split("\n") == ["⚠️  Bobby Balon"]
+
+    result = runner.invoke(cli.app, "main Eronna --sounds-like")
+    assert result.exit_code == 0
+    assert result.stdout.rstrip().split("\n") == ["⛔ Errona Tragedia"]
+
+
+def test_cache_stats(mock_address_book: MockAddressBook) -> None:
+    """Test reusing query results and printing cache statistics."""
+    mock_address_book.provide("bob", "bobby")
+    runner.invoke(cli.app, "config --cache-ttl 60 --cache-size 8")
+    assert config.get_config().cache_ttl == 60
+
+    result = runner.invoke(cli.app, "main Bob --cache-stats")
+    assert result.exit_code == 0
+    assert "Query cache: 0 hits, 2 misses." in result.stderr
+
+    mock_address_book.error()
+    result = runner.invoke(cli.app, "main Bob --cache-stats")
+    assert result.exit_code == 0
+    assert result.stdout.rstrip().split("\n") == ["👤 Bob Balloon", "⚠️  Bobby Balon"]
+    assert "Query cache: 2 hits, 0 misses." in result.stderr
+
+
+def test_workers(mock_address_book: MockAddressBook) -> None:
+    """Test running stages on multiple threads and printing their statistics."""
+    mock_address_book.provide("amelie", "bob", "bobby", "errona")
+    result = runner.invoke(
+        cli.app, "main --detail --plain --workers check=3,fix=2 --pipeline-stats"
+    )
+    assert result.exit_code == 0
+    assert result.stdout.startswith("Ms. Amelia Avery Arch.\t")
+    assert "check: 1 items in " in result.stderr
+    assert "workers 3, queue " in result.stderr
+
+    result = runner.invoke(cli.app, "main --workers render=2")
+    assert result.exit_code == 2
+    assert "Invalid 'render=2'" in result.stderr
+
+
+def test_profile(mock_address_book: MockAddressBook, tmp_path: Path) -> None:
+    """Test printing durations of stages and writing a profile."""
+    mock_address_book.provide("bob", "bobby")
+    result = runner.invoke(
+        cli.app, ["main", "--check", "--profile-dump", str(tmp_path / "profile")]
+    )
+    assert result.exit_code == 0
+    assert "Profile (ms)" in result.stderr
+    assert "render" in result.stderr
+    assert "PHONE_CHECK" in result.stderr
+    assert (tmp_path / "profile").exists()
+
+
+def test_backend_stats(mock_address_book: MockAddressBook, tmp_path: Path) -> None:
+    """Test printing backend calls and writing them as a trace."""
+    mock_address_book.provide("bob", "bobby")
+    result = runner.invoke(
+        cli.app, ["main", "--backend-stats", "--trace", str(tmp_path / "trace.json")]
+    )
+    assert result.exit_code == 0
+    assert "count: 1 calls in " in result.stderr
+    assert "find_batches: 1 calls in " in result.stderr
+    trace = json.loads((tmp_path / "trace.json").read_text())
+    assert [x["name"] for x in trace["traceEvents"]] == ["count", "find_batches"]
+
+
+def test_light_import(tmp_path: Path) -> None:
+    """Test showing the configuration without importing what listings need."""
+    code = (
+        "import sys\n"
+        "from contacts.client import main\n"
+        "try:\n"
+        "    main()\n"
+        "finally:\n"
+        "    print(' '.join(sys.modules), file=sys.stderr)\n"
+    )
+    env = {
+        **os.environ,
+        "HOME": str(tmp_path),
+        "XDG_CONFIG_HOME": str(tmp_path),
+        "CONTACTS_NO_DAEMON": "1",
+    }
+    modules = subprocess.run(  # nosec B603
+        [sys.executable, "-c", code, "config", "--show"],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stderr.split()
+    assert "contacts.cli" in modules
+    for name in [
+        "contacts.applescript_address_book",
+        "contacts.cache",
+        "contacts.checks",
+        "contacts.contact",
+        "contacts.executor",
+        "contacts.field",
+        "contacts.index",
+        "contacts.instrument",
+        "contacts.pipeline",
+        "contacts.plan",
+        "contacts.query",
+        "contacts.replay",
+        "rich.progress",
+        "unidecode",
+        "phonenumbers",
+    ]:
+        assert name not in modules
+
+
+def test_bench(tmp_path: Path) -> None:
+    """Test running benchmarks and writing their results."""
+    result = runner.invoke(
+        cli.app, ["bench", "plan", "--size", "20", "--output", str(tmp_path / "b")]
+    )
+    assert result.exit_code == 0
+    results = json.loads((tmp_path / "b").read_text())["results"]
+    assert results["plan"]["20"]["per_second"] > 0
+
+    result = runner.invoke(cli.app, ["bench", "nothing"])
+    assert result.exit_code == 2
+    assert "Unknown nothing" in result.stderr
+
+
+def test_replay(mock_address_book: MockAddressBook, tmp_path: Path) -> None:
+    """Test replaying a recorded run without the backend."""
+    mock_address_book.provide("bob", "bobby")
+    result = runner.invoke(cli.app, ["main", "--record", str(tmp_path / "rec")])
+    assert result.exit_code == 0
+
+    mock_address_book.error()
+    replayed = runner.invoke(
+        cli.app,
+        ["main", "--replay", str(tmp_path / "rec"), "--replay-latency", "0"],
+    )
+    assert replayed.exit_code == 0
+    assert replayed.stdout == result.stdout
+
+    result = runner.invoke(cli.app, ["main", "--replay", str(tmp_path / "none")])
+    assert result.exit_code == 2
@@ -0,0 +1,79 @@
+"""Unittests for complete."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from contacts import complete
+from contacts.contact import Contact
+
+
+@pytest.fixture(autouse=True)
+def paths(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Fixture to keep the prefix index in a temporary directory."""
+    monkeypatch.setattr(complete, "ENTRIES_PATH", tmp_path / "completion.json")
+    monkeypatch.setattr(complete, "PREFIX_PATH", tmp_path / "completion.txt")
+
+
+def test_complete() -> None:
+    """Test completing texts by the start of any of their words."""
+    complete.update(
+        [
+            Contact(id="1", name="Böb Balloon", nickname="Bobby"),
+            Contact(id="2", name="Alice Bell", organization="Acme Bakery"),
+            Contact(id="3", name="Carol"),
+        ],
+        replace=True,
+    )
+    assert complete.complete("bo") == ["Böb Balloon", "Bobby"]
+    assert complete.complete("BA") == ["Acme Bakery", "Böb Balloon"]
+    assert complete.complete("alice b") == ["Alice Bell"]
+    assert complete.complete("ba", limit=1) == ["Acme Bakery"]
+    assert complete.complete("zed") == []
+    assert complete.complete("") == [
+        "Acme Bakery",
+        "Alice Bell",
+        "Böb Balloon",
+        "Bobby",
+        "Carol",
+    ]
+
+
+def test_update() -> None:
+    """Test updating entries of changed contacts only."""
+    assert complete.update([Contact(id="1", name="Bob")]) == 0
+    assert complete.complete("b") == []
+
+    complete.update(
+        [Contact(id="1", name="Bob"), Contact(id="2", name="Carol")], replace=True
+    )
+    assert complete.update([Contact(id="1", name="Robert")]) == 2
+    assert complete.complete("b") == []
+    assert complete.complete("r") == ["Robert"]
+    assert complete.complete("c") == ["Carol"]
+
+    # unchanged entries leave the index as it is
+    complete.PREFIX_PATH.write_text("", encoding="utf-8")
+    assert complete.update([Contact(id="1", name="Robert")]) == 2
+    assert complete.PREFIX_PATH.read_text(encoding="utf-8") == ""
+
+
+def test_light_import() -> None:
+    """Test completing not importing checks and backends."""
+    modules = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, contacts.complete; print(' '.join(sys.modules))",
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.split()
+    assert "contacts.complete" in modules
+    assert "contacts.checks" not in modules
+    assert "contacts.address_book" not in modules
+    assert "phonenumbers" not in modules
+    assert "unidecode" not in modules
@@ -0,0 +1,133 @@
+"""Unittests for daemon and client."""
+
+import socket
+import threading
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+import typer
+from typer.testing import CliRunner
+
+from contacts import cli, client, config, index
+from contacts.daemon import Daemon
+from tests.mock_address_book import MockAddressBook
+
+unix_sockets = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="Unix sockets are not supported"
+)
+
+
+@pytest.fixture
+def mock_address_book(
+    request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> MockAddressBook:
+    """Fixture for mock address book served by the daemon."""
+    monkeypatch.setattr(config, "CONFIG_PATH", tmp_path / "config.json")
+    monkeypatch.setattr(index, "SNAPSHOT_PATH", tmp_path / "snapshot.json")
+    mock = MockAddressBook(request.path.parent / "data")
+    monkeypatch.setattr(cli, "get_address_book", lambda **_: mock)
+    return mock
+
+
+@pytest.fixture
+def daemon(tmp_path: Path) -> Iterator[Daemon]:
+    """Fixture for a daemon serving on a temporary socket."""
+    with Daemon(ttl=60, size=8, path=tmp_path / "serve.sock") as daemon:
+        thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+        thread.start()
+        yield daemon
+        daemon.shutdown()
+        thread.join()
+
+
+@unix_sockets
+def test_serve(mock_address_book: MockAddressBook, daemon: Daemon) -> None:
+    """Test runs being served from contacts kept in memory."""
+    mock_address_book.provide("bob", "bobby")
+    response = client.request(["Bob"], path=daemon.path)
+    assert response is not None
+    assert response["exit"] == 0
+    assert response["stdout"].rstrip().split("\n") == [
+        "👤 Bob Balloon",
+        "⚠️  Bobby Balon",
+    ]
+
+    mock_address_book.error()
+    assert client.request(["Bob"], path=daemon.path) == response
+    assert (daemon.cache.hits, daemon.cache.misses) == (2, 2)
+
+    response = client.request(["--limit", "-1"], path=daemon.path)
+    assert response is not None
+    assert response["exit"] == 2
+    assert "--limit" in response["stderr"]
+
+
+@unix_sockets
+def test_already_serving(daemon: Daemon) -> None:
+    """Test refusing to serve on a socket served by another daemon."""
+    with pytest.raises(RuntimeError, match="Already serving"):
+        Daemon(ttl=60, size=8, path=daemon.path)
+
+
+def test_not_serving(tmp_path: Path) -> None:
+    """Test no response without a daemon, so that runs fall back."""
+    assert client.request(["Bob"], path=tmp_path / "serve.sock") is None
+
+
+def test_unsupported(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test refusing to serve on platforms without Unix sockets."""
+    monkeypatch.delattr(socket, "AF_UNIX", raising=False)
+    result = CliRunner().invoke(cli.app, ["serve"])
+    assert result.exit_code == 1
+    assert "not supported" in result.stderr
+
+
+def test_serve_config(
+    mock_address_book: MockAddressBook, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test serving with the cache settings of the configuration by default."""
+    served: list[dict[str, float]] = []
+
+    def serve(**kwargs: float) -> None:
+        served.append(kwargs)
+        raise RuntimeError("Not serving.")
+
+    monkeypatch.setattr("contacts.daemon.Daemon", serve)
+    config.Config(cache_ttl=30, cache_size=4).dump()
+    CliRunner().invoke(cli.app, ["serve"])
+    CliRunner().invoke(cli.app, ["serve", "--ttl", "0"])
+    assert served == [{"ttl": 30, "size": 4}, {"ttl": 0, "size": 4}]
+
+
+@pytest.mark.parametrize(
+    ("args", "expected"),
+    [
+        ([], True),
+        (["Bob", "--check"], True),
+        (["--", "--fix"], True),
+        (["Bob", "--fix"], False),
+        (["--json"], False),
+        (["--ndjson", "Bob"], False),
+        (["apply", "plan.json"], False),
+        (["serve"], False),
+    ],
+)
+def test_served(
+    args: list[str], expected: bool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test only runs that look contacts up being sent to the daemon."""
+    monkeypatch.delenv(client.NO_DAEMON, raising=False)
+    monkeypatch.delenv(client.COMPLETE, raising=False)
+    assert client.served(args) == expected
+
+
+def test_served_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test runs not being sent to the daemon when it is disabled."""
+    monkeypatch.setenv(client.NO_DAEMON, "1")
+    assert not client.served(["Bob"])
+
+
+def test_app_dir() -> None:
+    """Test clients looking for the socket in the app directory."""
+    assert client.app_dir() == Path(typer.get_app_dir("contacts"))
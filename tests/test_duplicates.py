@@ -0,0 +1,78 @@
+"""Unittests for duplicates."""
+
+from contacts import synthetic
+from contacts.contact import Contact, ContactInfo
+from contacts.duplicates import DuplicateFinder, find_duplicates
+
+
+def person(contact_id: str, first_name: str, last_name: str, **kwargs: str) -> Contact:
+    """Create a person contact with an optional phone and e-mail."""
+    return Contact(
+        id=contact_id,
+        name=f"{first_name} {last_name}",
+        first_name=first_name,
+        last_name=last_name,
+        phones=(
+            [ContactInfo(id="P", label="_$!<Mobile>!$_", value=kwargs["phone"])]
+            if "phone" in kwargs
+            else []
+        ),
+        emails=(
+            [ContactInfo(id="E", label="_$!<Home>!$_", value=kwargs["email"])]
+            if "email" in kwargs
+            else []
+        ),
+    )
+
+
+def test_no_duplicates() -> None:
+    """Test distinct people."""
+    assert not find_duplicates(
+        [
+            person("1", "Amelia", "Arch", phone="+12012000001"),
+            person("2", "Bob", "Balon", phone="+12012000002"),
+        ]
+    )
+
+
+def test_same_name() -> None:
+    """Test people with the same name in a different order."""
+    clusters = find_duplicates(
+        [person("1", "Amelia", "Arch"), person("2", "Arch", "Amelia")]
+    )
+    assert [[x for x, _ in c.contacts] for c in clusters] == [["1", "2"]]
+    assert clusters[0].score == 1.0
+
+
+def test_fuzzy_name_shared_phone() -> None:
+    """Test misspelled names sharing a differently formatted phone."""
+    clusters = find_duplicates(
+        [
+            person("1", "Gülşen", "Öztürk", phone="+12012000001"),
+            person("2", "Gulsen", "Ozturk", phone="+1 (201) 200-0001"),
+            person("3", "Gulsen", "Ozturk", email="g@x.com"),
+            person("4", "Bob", "Balon", email="G@X.com"),
+        ]
+    )
+    assert [[x for x, _ in c.contacts] for c in clusters] == [["1", "2", "3"]]
+
+
+def test_shared_phone_only() -> None:
+    """Test different people sharing a landline."""
+    assert not find_duplicates(
+        [
+            person("1", "Amelia", "Arch", phone="+12012000001"),
+            person("2", "Bob", "Balon", phone="+12012000001"),
+        ]
+    )
+
+
+def test_synthetic() -> None:
+    """Test that duplicates in a synthetic address book are found in blocks."""
+    finder = DuplicateFinder()
+    people = list(synthetic.generate(1000, duplicate_rate=0.2))
+    for contact in people:
+        finder.add(contact)
+    clustered = sum(len(x.contacts) - 1 for x in finder.clusters())
+    assert clustered >= 150
+    assert finder.pairs < 10 * len(people)
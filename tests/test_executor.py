@@ -0,0 +1,113 @@
+"""Unittests for executor."""
+
+import threading
+
+from contacts.category import Category
+from contacts.contact import Contact, ContactInfo
+from contacts.executor import CheckExecutor
+from contacts.field import ContactFields
+from contacts.problem import Check, Problem
+
+
+class OfflineCheck(Check):
+    """Check that reports every URL right away."""
+
+    fields = frozenset([ContactFields.URL])
+
+    def check(self, contact: Contact) -> list[Problem]:
+        """Check contact."""
+        return [Problem(f"Offline '{x.value}'.") for x in contact.urls]
+
+
+class NetworkCheck(Check):
+    """Check that reports every URL once it is released."""
+
+    fields = frozenset([ContactFields.URL])
+    network = True
+
+    def __init__(self) -> None:
+        """Initialize check as blocked."""
+        self.release = threading.Event()
+
+    def check(self, contact: Contact) -> list[Problem]:
+        """Check contact."""
+        self.release.wait()
+        return [Problem(f"Network '{x.value}'.") for x in contact.urls]
+
+
+class FailingCheck(NetworkCheck):
+    """Check that fails on every contact with an unexpected error."""
+
+    def check(self, contact: Contact) -> list[Problem]:
+        """Check contact."""
+        raise UnicodeError("label too long")
+
+
+def contacts() -> list[Contact]:
+    """Return contacts with and without URLs."""
+    return [
+        Contact(
+            id="ID1",
+            name="NAME",
+            urls=[ContactInfo(id="UID", label="_$!<HomePage>!$_", value="http://h")],
+        ),
+        Contact(id="ID2", name="NAME"),
+    ]
+
+
+def test_network_checks_in_background() -> None:
+    """Test offline problems being available before network problems."""
+    network = NetworkCheck()
+    executor = CheckExecutor([network, OfflineCheck()])
+    people = contacts()
+    executor.submit(people)
+    assert [x.message for x in people[0].problems] == ["Offline 'http://h'."]
+    assert executor.settle() == []
+
+    network.release.set()
+    settled = executor.settle(wait=True)
+    assert [(x.id, [y.message for y in p]) for x, p in settled] == [
+        ("ID1", ["Network 'http://h'."])
+    ]
+    assert [x.message for x in people[0].problems] == [
+        "Offline 'http://h'.",
+        "Network 'http://h'.",
+    ]
+    executor.shutdown()
+
+
+def test_network_check_timeout() -> None:
+    """Test network checks missing their deadline reporting unknown problems."""
+    executor = CheckExecutor([NetworkCheck()], check_timeout=0.05)
+    people = contacts()
+    executor.submit(people)
+    settled = executor.settle(wait=True)
+    assert [(x.id, [y.message for y in p]) for x, p in settled] == [
+        ("ID1", ["URLs could not be checked in time."])
+    ]
+    assert people[0].category == Category.UNKNOWN
+    assert people[1].category == Category.PERSON
+    executor.shutdown()
+
+
+def test_run_timeout() -> None:
+    """Test network checks missing the deadline of the whole run."""
+    executor = CheckExecutor([NetworkCheck()], run_timeout=0)
+    people = contacts()
+    executor.submit(people)
+    assert [x.id for x, _ in executor.settle()] == ["ID1"]
+    executor.shutdown()
+
+
+def test_network_check_error() -> None:
+    """Test network checks that fail reporting unknown problems."""
+    executor = CheckExecutor([FailingCheck()])
+    people = contacts()
+    executor.run(people)
+    assert [x.message for x in people[0].problems] == [
+        "URLs could not be checked (label too long)."
+    ]
+    assert people[0].category == Category.UNKNOWN
+    executor.submit(contacts())
+    assert [x.id for x, _ in executor.settle(wait=True)] == ["ID1"]
+    executor.shutdown()
@@ -0,0 +1,75 @@
+"""Unittests for index."""
+
+from pathlib import Path
+
+import pytest
+
+from contacts import index
+from contacts.contact import Contact
+
+
+@pytest.fixture
+def data_path(request: pytest.FixtureRequest) -> Path:
+    """Fixture for the test data directory."""
+    return request.path.parent / "data"
+
+
+@pytest.fixture
+def people(data_path: Path) -> list[Contact]:
+    """Fixture for test contacts."""
+    return [
+        Contact.load(data_path / f"{x}.json")
+        for x in ["amelie", "bob", "bobby", "carnival", "errona"]
+    ]
+
+
+def test_trigrams() -> None:
+    """Test padded trigrams."""
+    assert index.trigrams("bob") == {"  b", " bo", "bob", "ob "}
+
+
+def test_search(people: list[Contact]) -> None:
+    """Test ranking contacts by similarity."""
+    trigrams = index.TrigramIndex(people)
+    assert [x.name for x in trigrams.search("Balon")] == [
+        "Bobby Balon",
+        "Bob Balloon",
+        "Carnival Balloon Co.",
+    ]
+    assert [x.name for x in trigrams.search("bob balloon", limit=1)] == ["Bob Balloon"]
+    assert [x.name for x in trigrams.search("Ameila")] == ["Ms. Amelia Avery Arch."]
+    assert trigrams.search("Balun", threshold=0.9) == []
+    assert trigrams.search("") == []
+
+
+def test_sounds_like(people: list[Contact]) -> None:
+    """Test finding contacts by how their names sound."""
+    people.append(
+        Contact(
+            id="ID",
+            name="山田 太郎",
+            phonetic_first_name="Taro",
+            phonetic_last_name="Yamada",
+        )
+    )
+    phonetic = index.PhoneticIndex(people)
+    assert [x.name for x in phonetic.search("Bop Baloon")] == [
+        "Bob Balloon",
+        "Bobby Balon",
+        "Carnival Balloon Co.",
+    ]
+    assert [x.name for x in phonetic.search("Yamadah")] == ["山田 太郎"]
+    assert phonetic.search("Zebra") == []
+
+
+def test_snapshot(
+    tmp_path: Path, people: list[Contact], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test writing and reading indexed fields of contacts."""
+    monkeypatch.setattr(index, "SNAPSHOT_PATH", tmp_path / "snapshot.json")
+    assert index.load_snapshot() is None
+    assert index.dump_snapshot(people) == len(people)
+    snapshot = index.load_snapshot()
+    assert snapshot is not None
+    assert [x.name for x in snapshot] == [x.name for x in people]
+    assert not snapshot[0].phones
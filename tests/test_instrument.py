@@ -0,0 +1,102 @@
+"""Unittests for instrument."""
+
+import json
+import subprocess  # nosec B404
+import threading
+from pathlib import Path
+
+import pytest
+
+from contacts.applescript_address_book import AppleScriptBasedAddressBook
+from contacts.instrument import CallLog, Histogram, InstrumentedAddressBook
+from tests.mock_address_book import MockAddressBook
+
+
+@pytest.fixture
+def mock_address_book(request: pytest.FixtureRequest) -> MockAddressBook:
+    """Fixture for mock address book."""
+    mock = MockAddressBook(request.path.parent / "data")
+    mock.provide("bob", "bobby", "errona")
+    return mock
+
+
+def test_calls(mock_address_book: MockAddressBook) -> None:
+    """Test counting calls and contacts by method."""
+    calls = CallLog()
+    address_book = InstrumentedAddressBook(mock_address_book, calls)
+    assert address_book.count(["Bob"]) == 3
+    assert len(list(address_book.find_batches(["Bob"]))) == 1
+    assert len(list(address_book.find(["Bob"]))) == 3
+    address_book.update_note("ID", "NOTE")
+    assert {x.method: (x.calls, x.contacts) for x in calls.stats.values()} == {
+        "count": (1, 0),
+        "find_batches": (1, 3),
+        "find": (3, 3),
+        "_update_field": (1, 0),
+    }
+
+    mock_address_book.error()
+    with pytest.raises(RuntimeError):
+        address_book.get("ID")
+    assert calls.stats["get"].calls == 1
+
+
+def test_slow(mock_address_book: MockAddressBook) -> None:
+    """Test logging slow calls."""
+    logged: list[str] = []
+    address_book = InstrumentedAddressBook(
+        mock_address_book, CallLog(slow=-1, log=logged.append)
+    )
+    address_book.count([])
+    assert len(logged) == 1
+    assert logged[0].startswith("Slow count call took ")
+
+
+def test_trace(mock_address_book: MockAddressBook, tmp_path: Path) -> None:
+    """Test writing calls as Chrome trace events."""
+    calls = CallLog(trace=True)
+    address_book = InstrumentedAddressBook(mock_address_book, calls)
+    address_book.count([])
+    list(address_book.find_batches([]))
+    calls.dump_trace(tmp_path / "trace.json")
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    assert [(x["name"], x["ph"], x["args"]["contacts"]) for x in events] == [
+        ("count", "X", 0),
+        ("find_batches", "X", 3),
+    ]
+    assert events[0]["ts"] <= events[1]["ts"]
+
+
+def test_histogram() -> None:
+    """Test counting latencies in buckets."""
+    histogram = Histogram()
+    for seconds in [0.0005, 0.0015, 0.003, 0.003, 100]:
+        histogram.add(seconds)
+    assert histogram.percentile(0.5) == 0.004
+    assert histogram.percentile(0.2) == 0.001
+    assert histogram.percentile(1) == float("inf")
+    assert str(histogram) == "<=1ms:1 <=2ms:1 <=4ms:2 <=inf:1"
+
+
+def test_bytes_read(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test backend reads counted for each thread, without losing any."""
+    monkeypatch.setattr(
+        subprocess,
+        "run",
+        lambda args, **_: subprocess.CompletedProcess(args, 0, stdout="0123456789"),
+    )
+    address_book = AppleScriptBasedAddressBook(brief=True, batch=1)
+    counts: list[int] = []
+
+    def read() -> None:
+        for _ in range(1000):
+            address_book._run_and_read_output("count")
+        counts.append(address_book.bytes_read)
+
+    threads = [threading.Thread(target=read) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert counts == [10000] * 4
+    assert address_book.bytes_read == 0
@@ -0,0 +1,30 @@
+"""Unittests for phonetic."""
+
+from contacts.phonetic import keys
+
+
+def test_same_sound() -> None:
+    """Test names sounding alike sharing keys."""
+    for first, second in [
+        ("Philip", "Filip"),
+        ("Stephen", "Steven"),
+        ("Knight", "Night"),
+        ("Catherine", "Kathryn"),
+        ("Mehmet", "Mehmed"),
+        ("Gülşen", "Gulsen"),
+        ("Matt", "Mathew"),
+    ]:
+        assert keys(first) & keys(second), (first, second)
+
+
+def test_alternate() -> None:
+    """Test ambiguous sounds making alternate keys."""
+    assert keys("Charles") == {"XRLS", "KRLS"}
+    assert keys("Karl") == {"KRL"}
+    assert keys("Smith") == {"SM0", "SMT"}
+
+
+def test_different_sound() -> None:
+    """Test names sounding differently not sharing keys."""
+    assert not keys("Bob") & keys("Amelia")
+    assert keys("") == frozenset()
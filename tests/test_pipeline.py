@@ -0,0 +1,76 @@
+"""Unittests for pipeline."""
+
+import random
+import time
+from typing import Iterator
+
+import pytest
+
+from contacts.pipeline import Pipeline
+
+
+def slowly(value: int) -> int:
+    """Return a value after a random delay, to finish out of order."""
+    time.sleep(random.random() / 100)
+    return value
+
+
+def test_order() -> None:
+    """Test items coming out in source order through multiple workers."""
+    pipeline = Pipeline(iter(range(50)), capacity=2)
+    pipeline.add("slow", slowly, workers=4)
+    pipeline.add("double", lambda x: x * 2)
+    assert list(pipeline.run()) == [x * 2 for x in range(50)]
+
+
+def test_error() -> None:
+    """Test errors being raised in the order of their items."""
+
+    def fail(value: int) -> int:
+        if value == 3:
+            raise ValueError(value)
+        return slowly(value)
+
+    pipeline = Pipeline(iter(range(10)))
+    pipeline.add("fail", fail, workers=3)
+    done = []
+    with pytest.raises(ValueError, match="3"):
+        for item in pipeline.run():
+            done.append(item)
+    assert done == [0, 1, 2]
+
+
+def test_stop() -> None:
+    """Test stopping pulling from the source, and closing it."""
+    closed = []
+
+    def source() -> Iterator[int]:
+        try:
+            yield from range(1000)
+        finally:
+            closed.append(True)
+
+    pipeline = Pipeline(source(), capacity=1)
+
+    def stop(value: int) -> int:
+        if value == 2:
+            pipeline.stop()
+        return value
+
+    pipeline.add("stop", stop)
+    assert list(pipeline.run())[:3] == [0, 1, 2]
+    assert pipeline.stats[0].items < 10
+    assert closed == [True]
+
+
+def test_stats() -> None:
+    """Test counting items and queued items of stages."""
+    pipeline = Pipeline(iter(range(8)), capacity=3)
+    pipeline.add("first", lambda x: x)
+    pipeline.add("second", slowly, workers=2)
+    list(pipeline.run())
+    source, first, second = pipeline.stats
+    assert [source.items, first.items, second.items] == [8, 8, 8]
+    assert 1 <= second.max_queued <= 3
+    assert 1 <= second.occupancy <= 3
+    assert str(second).startswith("second: 8 items in ")
@@ -0,0 +1,184 @@
+"""Unittests for plan."""
+
+from pathlib import Path
+
+import pytest
+
+from contacts.address_book import ContactEditor
+from contacts.contact import Contact
+from contacts.plan import (
+    Conflict,
+    FixPlan,
+    Mutation,
+    Operation,
+    PlanFile,
+    apply_plan,
+    journal_path,
+)
+from contacts.problem import Problem
+from tests.mock_address_book import MockAddressBook
+
+
+@pytest.fixture
+def data_path(request: pytest.FixtureRequest) -> Path:
+    """Fixture for the test data directory."""
+    return request.path.parent / "data"
+
+
+def problem(*fixes: Mutation) -> Problem:
+    """Return a problem whose fix makes given changes."""
+
+    def fix(address_book: ContactEditor) -> None:
+        for mutation in fixes:
+            mutation.apply(address_book)
+
+    return Problem("MESSAGE", fix=fix)
+
+
+def test_merge_info_updates() -> None:
+    """Test updates of the same info being merged."""
+    plan = FixPlan()
+    plan.add(
+        problem(Mutation(Operation.UPDATE_INFO, "ID", "urls", "UID", (("a", "1"),)))
+    )
+    plan.add(
+        problem(Mutation(Operation.UPDATE_INFO, "ID", "urls", "UID", (("b", "2"),)))
+    )
+    assert plan.mutations() == [
+        Mutation(Operation.UPDATE_INFO, "ID", "urls", "UID", (("a", "1"), ("b", "2")))
+    ]
+
+
+def test_conflicting_updates() -> None:
+    """Test updates setting another value of an info keeping the first."""
+    plan = FixPlan()
+    first = Mutation(Operation.UPDATE_INFO, "ID", "phones", "UID", (("value", "1"),))
+    second = Mutation(Operation.UPDATE_INFO, "ID", "phones", "UID", (("value", "2"),))
+    plan.add(problem(first))
+    plan.add(problem(second))
+    plan.add(problem(first))
+    assert plan.mutations() == [first]
+    assert plan.conflicts() == [Conflict(first, second)]
+    assert len(plan.export().changes[0].problems) == 2
+
+
+def test_drop_updates_of_deleted() -> None:
+    """Test updates of deleted fields and infos being dropped."""
+    plan = FixPlan()
+    plan.add(
+        problem(Mutation(Operation.UPDATE_FIELD, "ID", "note", None, (("value", "X"),)))
+    )
+    plan.add(problem(Mutation(Operation.DELETE_FIELD, "ID", "note")))
+    plan.add(
+        problem(Mutation(Operation.UPDATE_INFO, "ID", "urls", "UID", (("a", "1"),)))
+    )
+    plan.add(problem(Mutation(Operation.DELETE_INFO, "ID", "urls", "UID")))
+    assert plan.mutations() == [
+        Mutation(Operation.DELETE_FIELD, "ID", "note"),
+        Mutation(Operation.DELETE_INFO, "ID", "urls", "UID"),
+    ]
+
+
+def test_deletes_last(data_path: Path) -> None:
+    """Test deletions being made last and batched per field."""
+    plan = FixPlan()
+    plan.add(problem(Mutation(Operation.DELETE_INFO, "ID", "urls", "U1")))
+    plan.add(problem(Mutation(Operation.ADD_INFO, "ID", "urls", None, (("a", "1"),))))
+    plan.add(problem(Mutation(Operation.DELETE_INFO, "ID", "urls", "U2")))
+    plan.add(problem(Mutation(Operation.ADD_INFO, "ID", "urls", None, (("a", "1"),))))
+    assert plan.proposed_calls == 4
+
+    mock = MockAddressBook(data_path)
+    assert plan.apply(mock) == 2
+    assert mock.adds == [("ID", "urls", {"a": "1"})]
+    assert mock.deletes == [("ID", "urls", "U1"), ("ID", "urls", "U2")]
+
+
+def test_contacts(data_path: Path) -> None:
+    """Test planning fixes for all problems of a contact."""
+    plan = FixPlan()
+    plan.add_contacts([Contact.load(data_path / "warnen.json")])
+    assert plan.problems
+    assert len(plan.mutations()) <= plan.proposed_calls
+
+
+def test_export() -> None:
+    """Test exported changes listing the problems they fix."""
+    plan = FixPlan()
+    plan.add(
+        problem(Mutation(Operation.UPDATE_INFO, "ID", "urls", "UID", (("a", "1"),)))
+    )
+    exported = plan.export()
+    assert [(x.problems, x.mutation()) for x in exported.changes] == [
+        (
+            ["MESSAGE"],
+            Mutation(Operation.UPDATE_INFO, "ID", "urls", "UID", (("a", "1"),)),
+        )
+    ]
+
+
+def test_apply_resumes(tmp_path: Path, data_path: Path) -> None:
+    """Test interrupted plan applies resuming after the last batch."""
+    plan = FixPlan()
+    for i in range(5):
+        plan.add(
+            problem(
+                Mutation(
+                    Operation.UPDATE_FIELD, f"ID{i}", "note", None, (("value", "X"),)
+                )
+            )
+        )
+    path = tmp_path / "plan.json"
+    plan.export().dump(path)
+
+    mock = MockAddressBook(data_path)
+    applying = apply_plan(path, mock, batch_size=2)
+    assert next(applying) == (0, 5)
+    assert next(applying) == (2, 5)
+    applying.close()
+    assert [x[0] for x in mock.updates] == ["ID0", "ID1"]
+
+    mock = MockAddressBook(data_path)
+    assert list(apply_plan(path, mock, batch_size=2)) == [(2, 5), (4, 5), (5, 5)]
+    assert [x[0] for x in mock.updates] == ["ID2", "ID3", "ID4"]
+
+
+def test_apply_resumes_batch(tmp_path: Path, data_path: Path) -> None:
+    """Test changes made before an interruption in a batch not being made again."""
+    plan = FixPlan()
+    for i in range(3):
+        plan.add(
+            problem(
+                Mutation(
+                    Operation.ADD_INFO, f"ID{i}", "emails", None, (("value", "a@b.c"),)
+                )
+            )
+        )
+    path = tmp_path / "plan.json"
+    plan.export().dump(path)
+
+    mock = MockAddressBook(data_path)
+    add_info = mock._add_info
+
+    def interrupted(contact_id: str, field: str, **values: str) -> None:
+        if contact_id == "ID1":
+            raise RuntimeError("interrupted")
+        add_info(contact_id, field, **values)
+
+    mock._add_info = interrupted  # type: ignore[method-assign]
+    with pytest.raises(RuntimeError):
+        list(apply_plan(path, mock))
+    assert [x[0] for x in mock.adds] == ["ID0"]
+
+    mock = MockAddressBook(data_path)
+    assert list(apply_plan(path, mock)) == [(1, 3), (3, 3)]
+    assert [x[0] for x in mock.adds] == ["ID1", "ID2"]
+
+
+def test_apply_other_plan(tmp_path: Path, data_path: Path) -> None:
+    """Test journals of another plan being rejected."""
+    path = tmp_path / "plan.json"
+    PlanFile().dump(path)
+    journal_path(path).write_text("OTHER\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="different plan"):
+        next(apply_plan(path, MockAddressBook(data_path)))
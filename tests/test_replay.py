@@ -0,0 +1,78 @@
+"""Unittests for replay."""
+
+import time
+from pathlib import Path
+
+import pytest
+
+from contacts.replay import (
+    RecorderAddressBook,
+    Recording,
+    ReplayAddressBook,
+    load_recording,
+)
+from tests.mock_address_book import MockAddressBook
+
+
+@pytest.fixture
+def mock_address_book(request: pytest.FixtureRequest) -> MockAddressBook:
+    """Fixture for mock address book."""
+    mock = MockAddressBook(request.path.parent / "data")
+    mock.provide("bob", "bobby", "errona")
+    return mock
+
+
+def record(mock_address_book: MockAddressBook, path: Path) -> None:
+    """Record calls to a mock address book."""
+    address_book = RecorderAddressBook(mock_address_book, Recording(path))
+    assert address_book.count(["Bob"]) == 3
+    batches = address_book.find_batches(["Bob"])
+    next(batches)
+    batches.close()
+    assert len(list(address_book.find(["Bob"]))) == 3
+    address_book.update_note("ID", "NOTE")
+    mock_address_book.error()
+    with pytest.raises(RuntimeError):
+        address_book.get("ID")
+
+
+def test_replay(mock_address_book: MockAddressBook, tmp_path: Path) -> None:
+    """Test serving recorded calls without the recorded address book."""
+    record(mock_address_book, tmp_path / "recording")
+    address_book = ReplayAddressBook(
+        load_recording(tmp_path / "recording"), "MockAddressBook"
+    )
+    assert address_book.identity() == "MockAddressBook"
+    assert address_book.count(["Bob"]) == 3
+    assert address_book.count(["Bob"]) == 3
+    assert [len(x) for x in address_book.find_batches(["Bob"])] == [3]
+    assert [x.name for x in address_book.find(["Bob"])] == [
+        "Bob Balloon",
+        "Bobby Balon",
+        "Errona Tragedia",
+    ]
+    address_book.update_note("ID", "NOTE")
+    with pytest.raises(RuntimeError):
+        address_book.get("ID")
+    with pytest.raises(RuntimeError, match="No recorded count call"):
+        address_book.count(["Alice"])
+    with pytest.raises(RuntimeError, match="No recorded count call"):
+        ReplayAddressBook(load_recording(tmp_path / "recording"), "Other").count(
+            ["Bob"]
+        )
+
+
+def test_latency(
+    mock_address_book: MockAddressBook,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test waiting for scaled recorded latencies."""
+    record(mock_address_book, tmp_path / "recording")
+    requests = load_recording(tmp_path / "recording")
+    recorded = requests['["MockAddressBook", "count", [["Bob"]]]'][0][0].seconds
+    slept: list[float] = []
+    monkeypatch.setattr(time, "sleep", slept.append)
+    address_book = ReplayAddressBook(requests, "MockAddressBook", latency=2)
+    address_book.count(["Bob"])
+    assert slept == [recorded * 2]
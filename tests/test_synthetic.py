@@ -0,0 +1,18 @@
+"""Unittests for synthetic."""
+
+from contacts import synthetic
+from contacts.checks import Checks
+from contacts.contact import Contact
+
+
+def test_mess() -> None:
+    """Test messy data being added to the same people at given ratios."""
+    clean = list(synthetic.generate(500))
+    messy = list(synthetic.generate(500, mess=synthetic.MESSY))
+    assert [x.first_name for x in clean] == [x.first_name for x in messy]
+    assert clean == list(synthetic.generate(500, mess=synthetic.Mess()))
+
+    Contact.check_all(messy, [x.value for x in Checks if not x.value.network])
+    problems = {x.message.split(" ")[0] for y in messy for x in y.problems}
+    assert {"Home", "Last", "Phone", "URL"} <= problems
+    assert any(not x.label for y in messy for x in y.phones)
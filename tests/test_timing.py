@@ -0,0 +1,60 @@
+"""Unittests for timing."""
+
+import pstats
+import threading
+from pathlib import Path
+
+from contacts import timing
+from contacts.checks import Checks
+from contacts.contact import Contact
+from contacts.executor import CheckExecutor
+
+
+def test_timed() -> None:
+    """Test recording durations of stages only while started."""
+    with timing.timed("stage"):
+        pass
+    timing.start()
+    for _ in range(3):
+        with timing.timed("stage"):
+            pass
+    assert [(x.name, x.calls) for x in timing.stop()] == [("stage", 3)]
+    assert timing.stop() == []
+
+
+def test_summarize() -> None:
+    """Test summarizing durations with percentiles."""
+    summary = timing.summarize("stage", [x / 100 for x in range(100, 0, -1)])
+    assert summary.calls == 100
+    assert round(summary.total, 2) == 50.5
+    assert round(summary.mean, 3) == 0.505
+    assert (summary.p50, summary.p95, summary.p99) == (0.5, 0.95, 0.99)
+    assert timing.summarize("stage", [2.0]).p99 == 2.0
+
+
+def test_dump(tmp_path: Path) -> None:
+    """Test profiling threads of timed work along with the run."""
+
+    def work() -> None:
+        with timing.timed("work"):
+            sum(range(1000))
+
+    timing.start(profile=True)
+    thread = threading.Thread(target=timing.threaded(work))
+    thread.start()
+    thread.join()
+    assert [x.name for x in timing.stop()] == ["work"]
+    timing.dump(tmp_path / "profile")
+    stats = pstats.Stats(str(tmp_path / "profile"))
+    assert any(name == "work" for _, _, name in stats.stats)  # type: ignore
+
+
+def test_checks_timed_by_name() -> None:
+    """Test checks of the same class being timed separately, by their names."""
+    checks = [Checks.FIRST_NAME_CASING_CHECK, Checks.LAST_NAME_CASING_CHECK]
+    timing.start()
+    Contact.check_all([Contact(id="1", name="bob")], [x.value for x in checks])
+    CheckExecutor([Checks.URL_REACHABILITY_CHECK.value]).run([Contact(id="2", name="")])
+    names = {x.name for x in timing.stop()}
+    assert type(checks[0].value) is type(checks[1].value)
+    assert {x.name for x in checks} | {"URL_REACHABILITY_CHECK"} <= names